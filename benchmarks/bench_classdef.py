@@ -0,0 +1,120 @@
+"""Benchmark: definition of `PropMixin` classes.
+
+Times the definition of a class whose attributes are all converted by
+`VarConf` and of a class that mixes them with explicit `Prop`
+definitions. The time includes running the class body (creating the
+`Prop` objects). Plain classes are shown for reference.
+
+To compare against another version of `ocd` (e.g the original
+implementation that converted the attributes one by one through
+`PropMeta.__setattr__`), pass the root of its source tree; the same
+cases are then timed in a subprocess importing that tree, interleaved
+with the local ones:
+
+    git worktree add /tmp/ocd-base <commit>
+    python benchmarks/bench_classdef.py /tmp/ocd-base
+
+Run with:
+
+    python benchmarks/bench_classdef.py [BASELINE_TREE]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+from ocd import defaults
+from ocd.prop import Prop, PropMeta
+from ocd.mixins import PropMixin
+
+
+N_ATTRS = 20
+NUMBER = 200
+
+
+def varconf_namespace():
+    ns = {'VarConf': defaults.VarConfAll}
+    for i in range(N_ATTRS):
+        ns['attr%d' % i] = i
+    return ns
+
+
+def mixed_namespace():
+    ns = {'VarConf': defaults.VarConfAll}
+    for i in range(N_ATTRS // 2):
+        ns['attr%d' % i] = i
+        ns['prop%d' % i] = Prop(i, readonly=Prop.RO_WEAK)
+    return ns
+
+
+SHAPES = (('VarConf', varconf_namespace), ('mixed', mixed_namespace))
+
+
+def define(namespace, **options):
+    return PropMeta('Plugin', (PropMixin,), namespace(), **options)
+
+
+def plain(namespace):
+    return type('Plugin', (object,), namespace())
+
+
+def measure(func, number=NUMBER):
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def measure_baseline(tree):
+    """Return `{shape: us/class}` for the `ocd` of the source tree
+    `tree`, timed in a subprocess.
+    """
+    env = dict(os.environ, PYTHONPATH=tree)
+    out = subprocess.check_output([sys.executable, __file__, '--child'],
+                                  env=env, cwd=tree)
+    return json.loads(out)
+
+
+def child():
+    # runs against the `ocd` of PYTHONPATH, only the options that
+    # every version has
+    json.dump(dict((shape, min(measure(lambda: define(namespace))
+                               for i in range(3)))
+                   for shape, namespace in SHAPES), sys.stdout)
+
+
+def main(baseline=None, repeat=10):
+    print('%d attributes per class' % (N_ATTRS,))
+    rows = []
+    for shape, namespace in SHAPES:
+        rows.extend([
+            ((shape, 'baseline'), None),
+            ((shape, 'single pass'), lambda ns=namespace: define(ns)),
+            ((shape, 'single pass (slots)'),
+             lambda ns=namespace: define(ns, slots=True)),
+            ((shape, 'plain class'), lambda ns=namespace: plain(ns)),
+        ])
+    best = dict((key, float('inf')) for key, func in rows)
+    # interleave the cases so that they see the same machine load
+    for i in range(repeat):
+        if baseline is not None:
+            for shape, t in measure_baseline(baseline).items():
+                key = (shape, 'baseline')
+                best[key] = min(best[key], t)
+        for key, func in rows:
+            if func is not None:
+                best[key] = min(best[key], measure(func))
+    print('%-40s %10s %8s' % ('case', 'us/class', 'speedup'))
+    for (shape, title), func in rows:
+        t = best[(shape, title)]
+        if t == float('inf'):
+            continue
+        base = best[(shape, 'baseline')]
+        speedup = '%8.2f' % (base / t,) if base != float('inf') else ''
+        print('%-40s %10.1f %s' % ('%s: %s' % (shape, title), t, speedup))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--child']:
+        child()
+    else:
+        main(*sys.argv[1:2])
@@ -0,0 +1,59 @@
+"""Benchmark: reading constants (strong readonly properties) of a
+`PropMixin` class.
+
+Compares reading the value through `Props.Defaults` and through an
+instance (the property descriptor) against `constants=True` classes,
+where the value is a plain class attribute. A plain class is shown for
+reference.
+
+Run with:
+
+    python benchmarks/bench_constants.py
+"""
+
+import timeit
+
+from ocd import defaults
+from ocd.mixins import PropMixin
+
+
+class Limits(PropMixin):
+    VarConf = defaults.VarConfAllUnro
+
+    MAX_SIZE = 1024
+
+
+class ConstLimits(PropMixin, constants=True):
+    VarConf = defaults.VarConfAllUnro
+
+    MAX_SIZE = 1024
+
+
+class PlainLimits(object):
+    MAX_SIZE = 1024
+
+
+def main(number=500000, repeat=7):
+    g = {'Limits': Limits, 'ConstLimits': ConstLimits,
+         'PlainLimits': PlainLimits, 'limits': Limits(),
+         'const_limits': ConstLimits()}
+    cases = [
+        ('Limits.Props.Defaults.MAX_SIZE', 'Limits.Props.Defaults.MAX_SIZE'),
+        ('Limits().MAX_SIZE (descriptor)', 'limits.MAX_SIZE'),
+        ('ConstLimits.MAX_SIZE', 'ConstLimits.MAX_SIZE'),
+        ('ConstLimits().MAX_SIZE', 'const_limits.MAX_SIZE'),
+        ('PlainLimits.MAX_SIZE', 'PlainLimits.MAX_SIZE'),
+    ]
+    best = [float('inf')] * len(cases)
+    # interleaved rounds, the best one counts
+    for _ in range(repeat):
+        for i, (title, stmt) in enumerate(cases):
+            t = timeit.timeit(stmt, globals=g, number=number) / number * 1e9
+            best[i] = min(best[i], t)
+    print('%-34s %8s' % ('case', 'ns'))
+    for (title, stmt), t in zip(cases, best):
+        print('%-34s %8.1f' % (title, t))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Microbenchmark: property access on `PropMixin` instances.
+
+Compares reading and writing a property implemented by the
+`ocd.descriptors` classes (what `PropMeta` creates) against a plain
+instance attribute and against the closure based `property()` objects
+built by `ocd.prop.make_fget`/`make_fset`. Both the closure based and
+the generated (`codegen=True`) accessors are measured, for dict and
+`__slots__` storage.
+
+Run with:
+
+    python benchmarks/bench_descriptors.py
+"""
+
+import timeit
+
+from ocd.prop import Prop, make_fget, make_fset
+from ocd.mixins import PropMixin
+
+
+class Plain():
+    def __init__(self):
+        self.a = 1
+
+
+class Closure():
+    a = property(fget=make_fget('a', '_a', 0), fset=make_fset('a', '_a'))
+
+    def __init__(self):
+        self._a = 1
+
+
+class Descriptor(PropMixin):
+    a = Prop(0)
+    r = Prop(1, readonly=True)
+    w = Prop(1, readonly=Prop.RO_WEAK)
+
+    def __init__(self):
+        self.a = 1
+
+
+class Generated(PropMixin, codegen=True):
+    a = Prop(0)
+
+    def __init__(self):
+        self.a = 1
+
+
+class Slots(PropMixin, slots=True):
+    a = Prop(0)
+
+    def __init__(self):
+        self.a = 1
+
+
+class GeneratedSlots(PropMixin, slots=True, codegen=True):
+    a = Prop(0)
+
+    def __init__(self):
+        self.a = 1
+
+
+def bench(stmt, obj, number):
+    t = min(timeit.repeat(stmt, globals={'o': obj}, number=number, repeat=5))
+    return t / number * 1e9
+
+
+def main(number=1000000):
+    rows = [
+        ('plain attribute read', 'o.a', Plain()),
+        ('closure property read', 'o.a', Closure()),
+        ('PropDescriptor read', 'o.a', Descriptor()),
+        ('ReadonlyPropDescriptor read', 'o.r', Descriptor()),
+        ('ReadonlyWeakPropDescriptor read (default)', 'o.w', Descriptor()),
+        ('SlotPropDescriptor read', 'o.a', Slots()),
+        ('SlotPropDescriptor read (codegen)', 'o.a', GeneratedSlots()),
+        ('plain attribute write', 'o.a = 2', Plain()),
+        ('closure property write', 'o.a = 2', Closure()),
+        ('PropDescriptor write', 'o.a = 2', Descriptor()),
+        ('PropDescriptor write (codegen)', 'o.a = 2', Generated()),
+        ('SlotPropDescriptor write', 'o.a = 2', Slots()),
+        ('SlotPropDescriptor write (codegen)', 'o.a = 2', GeneratedSlots()),
+    ]
+    base = bench('o.a', Plain(), number)
+    print('%-45s %10s %8s' % ('case', 'ns/op', 'x plain'))
+    for title, stmt, obj in rows:
+        t = bench(stmt, obj, number)
+        print('%-45s %10.1f %8.2f' % (title, t, t / base))
+
+
+if __name__ == '__main__':
+    main()
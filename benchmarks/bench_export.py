@@ -0,0 +1,80 @@
+"""Benchmark: exporting the properties of many `PropMixin` objects as
+columns.
+
+Compares building the columns by hand, reading each property of each
+object, against `ocd.table.export_columns`, which reads the internal
+variables a column at a time.
+
+Run with:
+
+    python benchmarks/bench_export.py
+"""
+
+import timeit
+from array import array
+
+from ocd import defaults
+from ocd.mixins import PropMixin
+from ocd.table import export_columns
+
+
+class Trade(PropMixin, init=True):
+    VarConf = defaults.VarConfAll
+
+    symbol = ''
+    price = 0.0
+    qty = 0
+    venue = ''
+
+
+class SlotTrade(PropMixin, init=True, slots=True):
+    VarConf = defaults.VarConfAll
+
+    symbol = ''
+    price = 0.0
+    qty = 0
+    venue = ''
+
+
+def by_hand(objs):
+    price = array('d')
+    qty = array('q')
+    symbol = []
+    venue = []
+    for o in objs:
+        price.append(o.price)
+        qty.append(o.qty)
+        symbol.append(o.symbol)
+        venue.append(o.venue)
+    return {'symbol': symbol, 'price': price, 'qty': qty, 'venue': venue}
+
+
+def bench(func, objs, repeat=7):
+    t = min(timeit.repeat(lambda: func(objs), number=1, repeat=repeat))
+    return t / len(objs) * 1e9
+
+
+def main(n=100000):
+    cases = []
+    for cls in (Trade, SlotTrade):
+        objs = [cls('s', i + 0.5, i, 'v') for i in range(n)]
+        cases.extend([
+            ('%s: by hand' % (cls.__name__,), by_hand, objs),
+            ('%s: export_columns' % (cls.__name__,),
+             lambda objs, cls=cls: export_columns(cls, objs), objs),
+            ('%s: export_columns (chunks)' % (cls.__name__,),
+             lambda objs, cls=cls: list(export_columns(cls, objs,
+                                                       chunk_size=10000)),
+             objs),
+        ])
+    print('%-34s %10s %8s' % ('case', 'ns/obj', 'speedup'))
+    base = None
+    for title, func, objs in cases:
+        t = bench(func, objs)
+        if func is by_hand:
+            base = t
+        print('%-34s %10.1f %8.2f' % (title, t, base / t))
+
+
+if __name__ == '__main__':
+    main()
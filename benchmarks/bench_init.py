@@ -0,0 +1,76 @@
+"""Benchmark: construction of `PropMixin` instances with property
+values.
+
+Compares calling the constructor and then assigning each property
+against the generated bulk `__init__` (`init=True`).
+
+Run with:
+
+    python benchmarks/bench_init.py
+"""
+
+import timeit
+
+from ocd import defaults
+from ocd.mixins import PropMixin
+
+
+class Record(PropMixin):
+    VarConf = defaults.VarConfAll
+
+    key = None
+    name = ''
+    value = 0
+    flags = 0
+
+
+class InitRecord(PropMixin, init=True):
+    VarConf = defaults.VarConfAll
+
+    key = None
+    name = ''
+    value = 0
+    flags = 0
+
+
+class InitSlotRecord(PropMixin, init=True, slots=True, codegen=True):
+    VarConf = defaults.VarConfAll
+
+    key = None
+    name = ''
+    value = 0
+    flags = 0
+
+
+SETTERS = '''
+o = Record()
+o.key = 1
+o.name = 'n'
+o.value = 2
+o.flags = 3
+'''
+
+
+def bench(stmt, number):
+    g = dict(globals())
+    t = min(timeit.repeat(stmt, globals=g, number=number, repeat=5))
+    return t / number * 1e9
+
+
+def main(number=200000):
+    rows = [
+        ('constructor + setters', SETTERS),
+        ('generated __init__ (keywords)',
+         "InitRecord(key=1, name='n', value=2, flags=3)"),
+        ('generated __init__ (positional)', "InitRecord(1, 'n', 2, 3)"),
+        ('generated __init__ (slots)', "InitSlotRecord(1, 'n', 2, 3)"),
+    ]
+    base = bench(SETTERS, number)
+    print('%-34s %10s %8s' % ('case', 'ns/obj', 'speedup'))
+    for title, stmt in rows:
+        t = bench(stmt, number)
+        print('%-34s %10.1f %8.2f' % (title, t, base / t))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark: interned `Prop` configurations and shared accessors.
+
+Reports the cost of creating a `Prop` configuration that is interned
+(no value) against one that is not (with a default value), and the
+memory allocated per `PropMixin` class, as measured by `tracemalloc`,
+for classes with the same property names.
+
+Run with:
+
+    python benchmarks/bench_intern.py
+"""
+
+import gc
+import timeit
+import tracemalloc
+
+from ocd import defaults
+from ocd.prop import Prop, PropMeta
+from ocd.mixins import PropMixin
+
+
+N_ATTRS = 20
+
+
+def namespace():
+    ns = {'VarConf': defaults.VarConfAll}
+    for i in range(N_ATTRS):
+        ns['attr%d' % i] = i
+    return ns
+
+
+def class_memory(n):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    classes = [PropMeta('Record', (PropMixin,), namespace())
+               for _ in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del classes
+    return (after - before) / n
+
+
+def main(number=50000, repeat=7):
+    cases = [
+        ('Prop()', lambda: Prop()),
+        ('Prop(readonly=True, undead=True)',
+         lambda: Prop(readonly=True, undead=True)),
+        ('Prop(0) (not interned)', lambda: Prop(0)),
+    ]
+    best = [float('inf')] * len(cases)
+    # interleaved rounds, the best one counts
+    for _ in range(repeat):
+        for i, (title, func) in enumerate(cases):
+            t = timeit.timeit(func, number=number) / number * 1e9
+            best[i] = min(best[i], t)
+    print('%-36s %10s' % ('case', 'ns'))
+    for (title, func), t in zip(cases, best):
+        print('%-36s %10.1f' % (title, t))
+    print('%d attributes per class: %.0f bytes/class'
+          % (N_ATTRS, class_memory(500),))
+
+
+if __name__ == '__main__':
+    main()
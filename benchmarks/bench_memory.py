@@ -0,0 +1,67 @@
+"""Memory benchmark: dict backed vs `__slots__` backed `PropMixin`
+instances.
+
+Creates many instances with every property set and reports the memory
+allocated per instance, as measured by `tracemalloc`.
+
+Run with:
+
+    python benchmarks/bench_memory.py
+"""
+
+import gc
+import tracemalloc
+
+from ocd import defaults
+from ocd.mixins import PropMixin
+
+
+class DictRecord(PropMixin):
+    VarConf = defaults.VarConfAll
+
+    key = None
+    name = ''
+    value = 0
+    flags = 0
+
+
+class SlotRecord(PropMixin, slots=True):
+    VarConf = defaults.VarConfAll
+
+    key = None
+    name = ''
+    value = 0
+    flags = 0
+
+
+def make(cls, i):
+    o = cls()
+    o.key = i
+    o.name = 'name'
+    o.value = i
+    o.flags = i
+    return o
+
+
+def measure(cls, n):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [make(cls, i + 1000) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return (after - before) / n
+
+
+def main(n=100000):
+    print('%-12s %14s' % ('class', 'bytes/object'))
+    results = {}
+    for cls in (DictRecord, SlotRecord):
+        results[cls] = measure(cls, n)
+        print('%-12s %14.1f' % (cls.__name__, results[cls]))
+    print('ratio: %.2fx' % (results[DictRecord] / results[SlotRecord],))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: development mode vs production mode (see `ocd.mode`).
+
+The mode is chosen at import time, thus each mode is measured in its
+own interpreter (with `OCD_PRODUCTION` set accordingly) and the runs
+are alternated so that both modes see the same machine load.
+
+Run with:
+
+    python benchmarks/bench_mode.py
+"""
+
+import os
+import subprocess
+import sys
+import timeit
+
+
+CASES = ['readonly property read', 'Unro set 5 attributes',
+         'ClassReadonly set + del', 'ReadonlyMap set 5 items']
+
+
+def measure(number=200000, repeat=5):
+    from ocd import unro
+    from ocd.prop import Prop
+    from ocd.mixins import PropMixin
+
+    class Record(PropMixin):
+        r = Prop(1, readonly=True)
+
+    class Store(unro.ClassReadonly):
+        pass
+
+    def fill_unro():
+        u = unro.Unro()
+        u.a = 1
+        u.b = 2
+        u.c = 3
+        u.d = 4
+        u.e = 5
+
+    def set_del_class():
+        Store.x = 1
+        del Store.x
+
+    def fill_map():
+        m = unro.ReadonlyMap()
+        m['a'] = 1
+        m['b'] = 2
+        m['c'] = 3
+        m['d'] = 4
+        m['e'] = 5
+
+    o = Record()
+    funcs = [lambda: o.r, fill_unro, set_del_class, fill_map]
+    result = []
+    for func in funcs:
+        n = number if func is funcs[0] else number // 10
+        best = min(timeit.repeat(func, number=n, repeat=repeat))
+        result.append(best / n * 1e9)
+    return result
+
+
+def run(production):
+    env = dict(os.environ)
+    env['OCD_PRODUCTION'] = '1' if production else '0'
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root, env.get('PYTHONPATH', '')])
+    out = subprocess.check_output([sys.executable, __file__, '--measure'],
+                                  env=env, universal_newlines=True)
+    return [float(v) for v in out.split()]
+
+
+def main(rounds=3):
+    best = {False: [float('inf')] * len(CASES),
+            True: [float('inf')] * len(CASES)}
+    for i in range(rounds):
+        for production in (False, True):
+            best[production] = [min(a, b) for a, b in
+                                zip(best[production], run(production))]
+    print('%-30s %12s %12s %8s' % ('case', 'dev ns', 'prod ns', 'speedup'))
+    for i, title in enumerate(CASES):
+        print('%-30s %12.1f %12.1f %8.2f' % (title, best[False][i],
+                                             best[True][i],
+                                             best[False][i] / best[True][i]))
+
+
+if __name__ == '__main__':
+    if '--measure' in sys.argv:
+        print(' '.join('%f' % v for v in measure()))
+    else:
+        main()
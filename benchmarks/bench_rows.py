@@ -0,0 +1,82 @@
+"""Benchmark: building `PropMixin` instances from rows (tuples or dicts,
+like the rows of a CSV file or a database cursor).
+
+Compares a loop calling the constructor and then assigning each
+property, the generated bulk `__init__` (`init=True`) and
+`from_rows`.
+
+Run with:
+
+    python benchmarks/bench_rows.py
+"""
+
+import timeit
+
+from ocd import defaults
+from ocd.mixins import PropMixin
+
+
+class Record(PropMixin, init=True):
+    VarConf = defaults.VarConfAll
+
+    key = None
+    name = ''
+    value = 0
+    flags = 0
+
+
+class SlotRecord(PropMixin, init=True, slots=True):
+    VarConf = defaults.VarConfAll
+
+    key = None
+    name = ''
+    value = 0
+    flags = 0
+
+
+def setters(rows):
+    objs = []
+    for key, name, value, flags in rows:
+        o = Record.__new__(Record)
+        o.key = key
+        o.name = name
+        o.value = value
+        o.flags = flags
+        objs.append(o)
+    return objs
+
+
+def bench(func, rows, repeat=7):
+    t = min(timeit.repeat(lambda: func(rows), number=1, repeat=repeat))
+    return t / len(rows) * 1e9
+
+
+def main(n=100000):
+    tuples = [(i, 'n', i * 2, 3) for i in range(n)]
+    dicts = [{'key': i, 'name': 'n', 'value': i * 2, 'flags': 3}
+             for i in range(n)]
+    cases = [
+        ('tuples: constructor + setters', setters, tuples),
+        ('tuples: generated __init__',
+         lambda rows: [Record(*row) for row in rows], tuples),
+        ('tuples: from_rows', lambda rows: list(Record.from_rows(rows)),
+         tuples),
+        ('tuples: from_rows (slots)',
+         lambda rows: list(SlotRecord.from_rows(rows)), tuples),
+        ('tuples: from_rows (chunks of 1000)',
+         lambda rows: [o for chunk in Record.from_rows(rows, chunk_size=1000)
+                       for o in chunk], tuples),
+        ('dicts: generated __init__',
+         lambda rows: [Record(**row) for row in rows], dicts),
+        ('dicts: from_rows', lambda rows: list(Record.from_rows(rows)),
+         dicts),
+    ]
+    base = bench(setters, tuples)
+    print('%-36s %10s %8s' % ('case', 'ns/row', 'speedup'))
+    for title, func, rows in cases:
+        t = bench(func, rows)
+        print('%-36s %10.1f %8.2f' % (title, t, base / t))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: runtime assignment of class attributes of `PropMixin`
+classes (feature flags, tuning knobs) through `PropMeta.__setattr__`.
+
+Reports the number of updates per second of a plain attribute (not a
+property), of a plain attribute of a class with many subclasses, of
+the default value of a property (whose `VarConf` makes every public
+attribute a property), of a property of a class with subclasses and
+of an internal (underscore) attribute. A plain class is
+shown for reference.
+
+Run with:
+
+    python benchmarks/bench_setattr.py
+"""
+
+import timeit
+
+from ocd import defaults
+from ocd.mixins import PropMixin
+
+
+class Flags(PropMixin):
+    VarConf = defaults.VarConfNone
+
+    debug = False
+
+
+class BaseFlags(PropMixin):
+    VarConf = defaults.VarConfNone
+
+    knob = 1
+
+
+class Knobs(PropMixin):
+    VarConf = defaults.VarConfAll
+
+    timeout = 1.0
+
+
+class BaseKnobs(PropMixin):
+    VarConf = defaults.VarConfAll
+
+    timeout = 1.0
+
+
+# kept referenced, `__subclasses__` holds weak references
+SUBCLASSES = [type(BaseKnobs)('Knobs%d' % (i,), (BaseKnobs,), {'extra': i})
+              for i in range(10)]
+SUBFLAGS = [type(BaseFlags)('Flags%d' % (i,), (BaseFlags,), {'extra': i})
+            for i in range(200)]
+
+
+class PlainFlags(object):
+    debug = False
+
+
+def main(number=20000, repeat=7):
+    g = {'Flags': Flags, 'BaseFlags': BaseFlags, 'Knobs': Knobs,
+         'BaseKnobs': BaseKnobs, 'PlainFlags': PlainFlags}
+    cases = [
+        ('plain attribute', 'Flags.debug = True'),
+        ('plain attribute, 200 subclasses', 'BaseFlags.knob = 2'),
+        ('property default', 'Knobs.timeout = 2.0'),
+        ('property default, 10 subclasses', 'BaseKnobs.timeout = 2.0'),
+        ('internal attribute', 'Flags._state = 1'),
+        ('plain class (reference)', 'PlainFlags.debug = True'),
+    ]
+    best = [float('inf')] * len(cases)
+    # interleaved rounds, the best one counts
+    for _ in range(repeat):
+        for i, (title, stmt) in enumerate(cases):
+            t = timeit.timeit(stmt, globals=g, number=number) / number
+            best[i] = min(best[i], t)
+    print('%-34s %10s %14s' % ('case', 'us/update', 'updates/s'))
+    for (title, stmt), t in zip(cases, best):
+        print('%-34s %10.2f %14.0f' % (title, t * 1e6, 1 / t))
+
+
+if __name__ == '__main__':
+    main()
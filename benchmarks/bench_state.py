@@ -0,0 +1,93 @@
+"""Pickle and copy benchmark: default state (the instance `__dict__` or
+slots) vs the positional state of `compact_state=True` classes.
+
+Reports the pickle size and the time per object of pickling,
+unpickling, copying and deep copying a list of objects that have set
+all their properties, then some of them (the others keep their default
+values).
+
+Run with:
+
+    python benchmarks/bench_state.py
+"""
+
+import copy
+import pickle
+import timeit
+
+from ocd import defaults
+from ocd.mixins import PropMixin
+
+
+class Record(PropMixin, init=True):
+    VarConf = defaults.VarConfAll
+
+    key = 0
+    name = ''
+    value = 0.0
+    parent = None
+    flags = 0
+    tags = ()
+
+
+class CompactRecord(Record, compact_state=True):
+    pass
+
+
+class SlotRecord(PropMixin, init=True, slots=True):
+    VarConf = defaults.VarConfAll
+
+    key = 0
+    name = ''
+    value = 0.0
+    parent = None
+    flags = 0
+    tags = ()
+
+
+class CompactSlotRecord(SlotRecord, compact_state=True, slots=True):
+    pass
+
+
+def make(cls, n, full):
+    if full:
+        return [cls(i, 'name', i + 0.5, None, 3, ['a', 'b'])
+                for i in range(n)]
+    return [cls(i, 'name', i + 0.5, tags=['a', 'b']) for i in range(n)]
+
+
+def run(n, rounds, full):
+    classes = (Record, CompactRecord, SlotRecord, CompactSlotRecord)
+    cases = {}
+    for cls in classes:
+        objs = make(cls, n, full)
+        data = pickle.dumps(objs, pickle.HIGHEST_PROTOCOL)
+        cases[cls] = (
+            len(pickle.dumps(objs[0], pickle.HIGHEST_PROTOCOL)),
+            (lambda objs=objs: pickle.dumps(objs, pickle.HIGHEST_PROTOCOL),
+             lambda data=data: pickle.loads(data),
+             lambda objs=objs: [copy.copy(o) for o in objs],
+             lambda objs=objs: copy.deepcopy(objs)))
+    best = dict((cls, [float('inf')] * 4) for cls in classes)
+    # interleaved rounds, the best one counts
+    for _ in range(rounds):
+        for cls in classes:
+            for i, case in enumerate(cases[cls][1]):
+                t = timeit.timeit(case, number=5) / 5 / n * 1e9
+                best[cls][i] = min(best[cls][i], t)
+    print('all properties set:' if full else 'some properties set:')
+    print('%-18s %6s %8s %8s %8s %9s' % ('class', 'bytes', 'dumps', 'loads',
+                                         'copy', 'deepcopy'))
+    for cls in classes:
+        print('%-18s %6d %8.0f %8.0f %8.0f %9.0f'
+              % ((cls.__name__, cases[cls][0]) + tuple(best[cls])))
+
+
+def main(n=1000, rounds=7):
+    run(n, rounds, True)
+    run(n, rounds, False)
+    print('(bytes: pickle of one object, times: ns per object)')
+
+
+if __name__ == '__main__':
+    main()
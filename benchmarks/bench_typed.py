@@ -0,0 +1,109 @@
+"""Typed properties benchmark: numeric properties stored as objects in
+the instance `__dict__` vs packed in a per instance buffer
+(`Prop(type=...)`).
+
+Creates many instances with every property set and reports the memory
+allocated per instance, as measured by `tracemalloc`, and the cost of
+reading and writing a property.
+
+Run with:
+
+    python benchmarks/bench_typed.py
+"""
+
+import gc
+import timeit
+import tracemalloc
+
+from ocd import defaults
+from ocd.prop import Prop
+from ocd.mixins import PropMixin
+
+
+NAMES = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
+
+
+class DictRecord(PropMixin):
+    VarConf = defaults.VarConfAll
+
+    a = 0
+    b = 0
+    c = 0
+    d = 0
+    e = 0.0
+    f = 0.0
+    g = 0.0
+    h = 0.0
+
+
+class TypedRecord(PropMixin):
+    a = Prop(type=int)
+    b = Prop(type=int)
+    c = Prop(type=int)
+    d = Prop(type=int)
+    e = Prop(type=float)
+    f = Prop(type=float)
+    g = Prop(type=float)
+    h = Prop(type=float)
+
+
+class TypedSlotRecord(PropMixin, slots=True):
+    a = Prop(type=int)
+    b = Prop(type=int)
+    c = Prop(type=int)
+    d = Prop(type=int)
+    e = Prop(type=float)
+    f = Prop(type=float)
+    g = Prop(type=float)
+    h = Prop(type=float)
+
+
+def make(cls, i):
+    o = cls()
+    # values that are not cached by the interpreter
+    o.a = i + 1000
+    o.b = i + 2000
+    o.c = i + 3000
+    o.d = i + 4000
+    o.e = i + 0.5
+    o.f = i + 1.5
+    o.g = i + 2.5
+    o.h = i + 3.5
+    return o
+
+
+def measure(cls, n):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [make(cls, i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return (after - before) / n
+
+
+def timing(stmt, obj, number=200000, repeat=5):
+    t = min(timeit.repeat(stmt, globals={'o': obj}, number=number,
+                          repeat=repeat))
+    return t / number * 1e9
+
+
+def main(n=100000):
+    classes = (DictRecord, TypedRecord, TypedSlotRecord)
+    print('%-16s %14s %10s %10s' % ('class', 'bytes/object', 'read ns',
+                                   'write ns'))
+    results = {}
+    for cls in classes:
+        results[cls] = measure(cls, n)
+        obj = make(cls, 1)
+        print('%-16s %14.1f %10.1f %10.1f'
+              % (cls.__name__, results[cls], timing('o.e', obj),
+                 timing('o.e = 1.5', obj)))
+    for cls in classes[1:]:
+        print('%s vs DictRecord: %.2fx less memory'
+              % (cls.__name__, results[DictRecord] / results[cls],))
+
+
+if __name__ == '__main__':
+    main()
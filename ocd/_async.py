@@ -0,0 +1,79 @@
+"""Tasks of the async computed properties (`Prop(async_compute=...)`).
+
+This module uses `async def` and imports `asyncio`, thus it is only
+imported by the descriptors of the classes that have async computed
+properties (see `descriptors.AsyncPropDescriptor`); the rest of the
+package works without it.
+"""
+
+import asyncio
+from weakref import WeakKeyDictionary
+
+try:
+    _get_loop = asyncio.get_running_loop
+except AttributeError: # Python < 3.7
+    _get_loop = asyncio.get_event_loop
+
+
+class _Ready(object):
+    """Awaitable that returns `value` without suspending."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __await__(self):
+        return self.value
+        yield
+
+
+class _AsyncFlight(object):
+    """Runs one task per (instance, internal variable) for the async
+    computed properties; concurrent readers share the task until it is
+    done.
+
+    The tasks are kept per event loop, thus readers in other loops do
+    not await a task of a foreign loop. A task keeps its instance
+    alive, thus the id of the instance is not reused while the task is
+    recorded.
+
+    The task stores the result in the internal variable (through
+    `store`). A failed task is forgotten, thus the next read starts a
+    new one.
+    """
+    __slots__ = ('_tasks',)
+
+    def __init__(self):
+        # {loop: {(id(obj), var_name): task}}
+        self._tasks = WeakKeyDictionary()
+
+    def get(self, obj, var_name, compute, store):
+        """Return an awaitable of the task computing the value for
+        `obj`, starting it in the current event loop if there is none.
+
+        Each reader gets its own `asyncio.shield` of the task, thus
+        cancelling a reader does not cancel the task the other readers
+        are waiting for.
+        """
+        loop = _get_loop()
+        tasks = self._tasks.get(loop)
+        if tasks is None:
+            tasks = self._tasks.setdefault(loop, {})
+        key = (id(obj), var_name)
+        task = tasks.get(key)
+        if task is None:
+            task = loop.create_task(self._run(tasks, key, obj, compute,
+                                              store))
+            tasks[key] = task
+        return asyncio.shield(task)
+
+    async def _run(self, tasks, key, obj, compute, store):
+        try:
+            value = await compute(obj)
+            store(obj, value)
+            return value
+        finally:
+            del tasks[key]
+
+
+_async_flight = _AsyncFlight()
@@ -21,8 +21,16 @@ class VarConf():
     to either return a `Prop` object for property conversion to happen
     for the corresponding attribute name or return `None` if no
     conversion is desired.
+
+    Set `name_only` to True if `get_conf` depends on the name only (not
+    on the value), thus `PropMeta` can remember its result per name
+    when class attributes are set at runtime. It is only taken into
+    account in the class that defines `get_conf`: a subclass that
+    overrides `get_conf` needs to set it again.
     """
 
+    name_only = False
+
     def get_conf(self, name, value):
         """This method will be called on each property to get the
         property configuration.
@@ -0,0 +1,706 @@
+"""Code generation for property accessors.
+
+Compiles specialized getter, setter and deleter functions for a
+property configuration, the way `dataclasses` generates methods: the
+property name and internal variable name are baked into the source as
+constants and every readonly/undead/storage decision is taken at
+generation time, leaving straight-line code like:
+
+```python
+def fset(self, value):
+    self._name = value
+```
+
+Compiled code is cached by the shape of the configuration (mode,
+storage, undead, whether there is a default value, a default factory
+or a compute function, property name and internal variable name), thus
+defining many classes with the same properties compiles each accessor
+just once. The default value (or default factory, or compute function)
+is not part of the source; it is bound when the cached factory is
+called. The accessors that do not use it (the setters, the deleters
+and most getters without a default value) are not created per property
+at all: the compiled functions are shared.
+
+It also generates the bulk `__init__` of `PropMixin` classes (see
+`make_init`), the `__eq__`/`__hash__` of frozen ones (see
+`make_eq_hash`), the pickle/copy state methods of `compact_state`
+ones (see `make_state`), the bulk getters and setters of `Props` (see
+`make_bulk_getter`) and the row builders of `from_rows` (see
+`make_row_builder`).
+"""
+
+__author__ = 'Md Jahidul Hamid <jahidulhamid@yahoo.com>'
+__copyright__ = 'Copyright © Md Jahidul Hamid <https://github.com/neurobin/>'
+__license__ = '[BSD](http://www.opensource.org/licenses/bsd-license.php)'
+__version__ = '0.0.1'
+
+
+import keyword
+from copyreg import __newobj__
+
+from ocd import Void
+
+
+# Property modes
+MODE_RW = 'rw'          # read-write
+MODE_WEAK = 'weak'      # weak readonly (Prop.RO_WEAK)
+MODE_CONST = 'const'    # strong readonly (Prop.RO_STRONG)
+
+# Internal variable storage
+STORAGE_DICT = 'dict'   # instance __dict__
+STORAGE_SLOT = 'slot'   # __slots__ member
+
+# Lazy default kinds
+LAZY_FACTORY = 'factory'    # default factory, called without arguments
+LAZY_COMPUTE = 'compute'    # compute function, called with the instance
+
+_factories = {}
+
+
+def can_generate(var_name):
+    """Whether accessors can be generated for the internal variable
+    name `var_name` i.e it is a valid identifier (or `None` for
+    properties without internal variable).
+    """
+    return var_name is None or (var_name.isidentifier()
+                                and not keyword.iskeyword(var_name))
+
+
+def _fget_source(mode, storage, name, var_name, has_default, lazy):
+    if mode == MODE_CONST:
+        if has_default:
+            return ['def fget(self):',
+                    '    return __default']
+        return ['def fget(self):',
+                '    raise AttributeError(%r %% (self,))'
+                % ("The value of property '%s' is non-existent for %%r. It "
+                   "can neither be read nor be written." % (name,),)]
+    if storage == STORAGE_DICT:
+        # `operator.attrgetter` is faster than any generated getter.
+        return []
+    if lazy:
+        # __default is the default factory (the compute function,
+        # called with the instance, for LAZY_COMPUTE)
+        miss = ['        __value = self.%s = __default(%s)'
+                % (var_name, 'self' if lazy == LAZY_COMPUTE else ''),
+                '        return __value']
+    elif has_default:
+        miss = ['        return __default']
+    else:
+        miss = ['        raise AttributeError(%r %% (self,)) from None'
+                % ("Property '%s' is not set yet for %%r" % (name,),)]
+    return ['def fget(self):',
+            '    try:',
+            '        return self.%s' % (var_name,),
+            '    except AttributeError:'] + miss
+
+
+def _fset_source(mode, storage, name, var_name):
+    if mode != MODE_RW:
+        return ['def fset(self, value):',
+                '    raise AttributeError(%r %% (self,))'
+                % ("'%s' is a readonly property for %%r" % (name,),)]
+    return ['def fset(self, value):',
+            '    self.%s = value' % (var_name,)]
+
+
+def _fdel_source(mode, storage, name, var_name, undead):
+    if undead:
+        return ['def fdel(self):',
+                '    raise AttributeError(%r %% (self,))'
+                % ("Property '%s' is not deletable by %%r" % (name,),)]
+    if mode == MODE_CONST:
+        return ['def fdel(self):',
+                '    raise AttributeError(%r %% (self,))'
+                % ("Constant readonly property '%s' can not be deleted by "
+                   "%%r" % (name,),)]
+    return ['def fdel(self):',
+            '    del self.%s' % (var_name,)]
+
+
+def _compile_factory(mode, storage, name, var_name, undead, has_default,
+                     lazy):
+    """Return `(create_fget, fget, fset, fdel)`: the functions that do
+    not use the default value are compiled once and shared, the getter
+    that does is created by `create_fget(default)` (`None` otherwise).
+    """
+    fget = _fget_source(mode, storage, name, var_name, has_default, lazy)
+    bound = any('__default' in line for line in fget)
+    lines = _fset_source(mode, storage, name, var_name) \
+        + _fdel_source(mode, storage, name, var_name, undead)
+    if bound:
+        lines.append('def __create_fget__(__default):')
+        lines.extend('    ' + line for line in fget)
+        lines.append('    return fget')
+    else:
+        lines.extend(fget)
+    ns = {}
+    exec('\n'.join(lines), {'__builtins__': __builtins__}, ns)
+    if bound:
+        return ns['__create_fget__'], None, ns['fset'], ns['fdel']
+    return None, ns.get('fget'), ns['fset'], ns['fdel']
+
+
+def make_accessors(mode, storage, name, var_name, default=Void,
+                   undead=False, factory=None, compute=None):
+    """Return the generated `(fget, fset, fdel)` functions for a
+    property.
+
+    `fget` is `None` when a generated getter would be slower than
+    the C level alternative (`operator.attrgetter`).
+
+    Args:
+        mode (str): One of `MODE_RW`, `MODE_WEAK` and `MODE_CONST`
+        storage (str): One of `STORAGE_DICT` and `STORAGE_SLOT`
+        name (str): name of the property
+        var_name (str): internal variable name (`None` for
+            `MODE_CONST`)
+        default (any, optional): Default value. Defaults to Void.
+        undead (bool, optional): Whether the property is undead for
+            instance objects. Defaults to False.
+        factory (callable, optional): Default factory. Its result is
+            stored in the internal variable the first time the
+            property is read. Defaults to None.
+        compute (callable, optional): Like `factory`, but called with
+            the instance. Takes precedence over `factory`. Defaults to
+            None.
+
+    Raises:
+        ValueError: when `var_name` is not a valid identifier.
+
+    Returns:
+        tuple: `(fget, fset, fdel)`
+    """
+    if not can_generate(var_name):
+        raise ValueError("Can not generate accessors for internal variable "
+                         "name %r" % (var_name,))
+    lazy = False
+    if mode != MODE_CONST:
+        if compute is not None:
+            lazy, factory = LAZY_COMPUTE, compute
+        elif factory is not None:
+            lazy = LAZY_FACTORY
+    key = (mode, storage, name, var_name, bool(undead), default is not Void,
+           lazy)
+    try:
+        create_fget, fget, fset, fdel = _factories[key]
+    except KeyError:
+        create_fget, fget, fset, fdel = _factories[key] = \
+            _compile_factory(*key)
+    if create_fget is not None:
+        fget = create_fget(factory if lazy else default)
+    return fget, fset, fdel
+
+
+def make_setter(var_name):
+    """Return the generated setter `fset(self, value)` of a read-write
+    property whose internal variable is `var_name` (in the instance
+    `__dict__` or a slot). It does not depend on the property, thus it
+    is compiled once per `var_name` and shared.
+
+    Raises:
+        ValueError: when `var_name` is not a valid identifier.
+    """
+    if var_name is None or not can_generate(var_name):
+        raise ValueError("Can not generate accessors for internal variable "
+                         "name %r" % (var_name,))
+    key = ('fset', var_name)
+    try:
+        return _factories[key]
+    except KeyError:
+        pass
+    ns = {}
+    exec('\n'.join(_fset_source(MODE_RW, STORAGE_DICT, var_name, var_name)),
+         {'__builtins__': __builtins__}, ns)
+    fset = _factories[key] = ns['fset']
+    return fset
+
+
+def is_parameter(name):
+    """Whether the property `name` can be a parameter of a generated
+    function, i.e it is a valid identifier that can not clash with the
+    internal names of the generated code (they start with `'__'`).
+    """
+    return (name.isidentifier() and not keyword.iskeyword(name)
+            and not name.startswith('__'))
+
+
+def init_parameters(fields):
+    """Return the `(property_name, internal_variable_name)` pairs of
+    `fields` that are parameters of the generated `__init__` (see
+    `make_init`), in order: the values of a row passed as positional
+    arguments go to these properties.
+    """
+    return [field for field in fields if is_parameter(field[0])]
+
+
+def _set_source(var_name, value):
+    if can_generate(var_name):
+        return '__ocd_self__.%s = %s' % (var_name, value)
+    return 'setattr(__ocd_self__, %r, %s)' % (var_name, value)
+
+
+def _compile_init(fields):
+    params = init_parameters(fields)
+    keywords = [field for field in fields if not is_parameter(field[0])]
+    args = ''.join(', %s=__Void' % (name,) for name, var_name in params)
+    if keywords:
+        args += ', **__ocd_kwargs__'
+    lines = ['def __create_init__(__Void):',
+             '    def __init__(__ocd_self__%s):' % (args,)]
+    for name, var_name in params:
+        lines.append('        if %s is not __Void:' % (name,))
+        lines.append('            %s' % (_set_source(var_name, name),))
+    if keywords:
+        # names that can not be parameters are passed in **kwargs
+        lines.append('        if __ocd_kwargs__:')
+        for name, var_name in keywords:
+            lines.append('            __value = __ocd_kwargs__.pop(%r, __Void)'
+                         % (name,))
+            lines.append('            if __value is not __Void:')
+            lines.append('                %s'
+                         % (_set_source(var_name, '__value'),))
+        lines.append('            if __ocd_kwargs__:')
+        lines.append('                raise TypeError("__init__() got an '
+                     'unexpected keyword argument %r"')
+        lines.append('                                % '
+                     '(next(iter(__ocd_kwargs__)),))')
+    if not fields:
+        lines.append('        pass')
+    lines.append('    return __init__')
+    ns = {}
+    exec('\n'.join(lines), {'__builtins__': __builtins__}, ns)
+    return ns['__create_init__']
+
+
+def make_init(fields, qualname='__init__'):
+    """Return a generated `__init__` that accepts the properties as
+    arguments (in the order of `fields`) and writes them to their
+    internal variables directly.
+
+    Arguments that are not passed are not written at all, thus the
+    property keeps its default value. The arguments can be passed by
+    keyword or by position; passing them by position is faster as
+    Python does not need to build a keyword dict when calling a
+    class. Properties whose names can not be parameters (see
+    `is_parameter`, e.g `'a-b'` or `'class'`) can only be passed by
+    keyword. Like other generated code, it is cached by `fields`.
+
+    Args:
+        fields (sequence): `(property_name, internal_variable_name)`
+            pairs.
+        qualname (str, optional): `__qualname__` of the function.
+
+    Returns:
+        function: the `__init__` function.
+    """
+    key = ('__init__', tuple(fields))
+    try:
+        factory = _factories[key]
+    except KeyError:
+        factory = _factories[key] = _compile_init(key[1])
+    init = factory(Void)
+    init.__qualname__ = qualname
+    return init
+
+
+def _value_source(obj, name):
+    if can_generate(name):
+        return '%s.%s' % (obj, name)
+    return 'getattr(%s, %r)' % (obj, name)
+
+
+def _compile_eq_hash(names, hash_var):
+    mine = ''.join('%s, ' % _value_source('self', n) for n in names)
+    other = ''.join('%s, ' % _value_source('other', n) for n in names)
+    lines = ['def __create_eq_hash__():',
+             '    def __eq__(self, other):',
+             '        if other.__class__ is self.__class__:',
+             '            return (%s) == (%s)' % (mine, other),
+             '        return NotImplemented',
+             '    def __hash__(self):',
+             '        try:',
+             '            return self.%s' % (hash_var,),
+             '        except AttributeError:',
+             '            pass',
+             '        __value = self.%s = hash((%s))' % (hash_var, mine),
+             '        return __value',
+             '    return __eq__, __hash__']
+    ns = {}
+    exec('\n'.join(lines), {'__builtins__': __builtins__}, ns)
+    return ns['__create_eq_hash__']
+
+
+def make_eq_hash(names, hash_var, qualname=''):
+    """Return a generated `(__eq__, __hash__)` pair that compare and
+    hash the values of the properties `names`.
+
+    Objects are equal when they are of the same class and the values
+    are equal. The hash is computed once and cached in the attribute
+    `hash_var` of the object, thus the values must not change after
+    hashing. Like other generated code, it is cached by `names`.
+
+    Args:
+        names (sequence): names of the properties.
+        hash_var (str): name of the attribute that caches the hash.
+        qualname (str, optional): `__qualname__` of the class.
+
+    Returns:
+        tuple: `(__eq__, __hash__)`
+    """
+    if not can_generate(hash_var):
+        raise ValueError("Can not generate code for attribute name %r"
+                         % (hash_var,))
+    key = ('__eq__', tuple(names), hash_var)
+    try:
+        factory = _factories[key]
+    except KeyError:
+        factory = _factories[key] = _compile_eq_hash(key[1], hash_var)
+    eq, hash_ = factory()
+    if qualname:
+        eq.__qualname__ = '%s.__eq__' % (qualname,)
+        hash_.__qualname__ = '%s.__hash__' % (qualname,)
+    return eq, hash_
+
+
+
+def _compile_state(fields, has_dict, hash_var, buf_var):
+    n_dict = sum(1 for name, slot in fields if not slot)
+    targets = ['self.%s' % (name,) if slot else 'd[%r]' % (name,)
+               for name, slot in fields]
+    values = ['bytes(%s)' % (t,) if name == buf_var else t
+              for (name, slot), t in zip(fields, targets)]
+    state = '(%s)' % (''.join('%s, ' % v for v in values),)
+
+    def getstate(ret):
+        # `ret` formats the returned state
+        if has_dict:
+            check = 'len(d) == %d' % (n_dict,)
+            if hash_var is not None:
+                check = '%s or len(d) == %d and %r in d' % (check, n_dict + 1,
+                                                            hash_var)
+            lines = ['        d = self.__dict__',
+                     # all the fields are set and there is nothing else
+                     '        if %s:' % (check,),
+                     '            try:',
+                     '                return %s' % (ret % (state,),),
+                     '            except (KeyError, AttributeError):',
+                     '                pass',
+                     '        n = 0']
+        else:
+            lines = ['        try:',
+                     '            return %s' % (ret % (state,),),
+                     '        except AttributeError:',
+                     '            pass']
+        lines.extend(['        values = []',
+                      '        append = values.append',
+                      '        mask = 0'])
+        for i, ((name, slot), value) in enumerate(zip(fields, values)):
+            if slot:
+                value = 'getattr(self, %r, __missing)' % (name,)
+                lines.append('        value = %s' % (value,))
+                if name == buf_var:
+                    value = 'bytes(value)'
+                else:
+                    value = 'value'
+                lines.extend(['        if value is not __missing:',
+                              '            append(%s)' % (value,),
+                              '            mask |= %d' % (1 << i,)])
+            else:
+                lines.extend(['        if %r in d:' % (name,),
+                              '            append(%s)' % (value,),
+                              '            mask |= %d' % (1 << i,),
+                              '            n += 1'])
+        if has_dict:
+            # other attributes in the instance __dict__
+            check = 'len(d) != n'
+            if hash_var is not None:
+                check = '%s and (len(d) != n + 1 or %r not in d)' % (check,
+                                                                     hash_var)
+            lines.extend(['        if %s:' % (check,),
+                          '            return %s'
+                          % (ret % ('__slow_get(self)',),)])
+        lines.append('        return %s' % (ret % ('[mask, tuple(values)]',),))
+        return lines
+
+    lines = ['def __create_state__(__newobj__, __slow_get, __slow_set):',
+             '    __missing = object()',
+             '    def __getstate__(self):']
+    lines.extend(getstate('%s'))
+    lines.append('    def __reduce_ex__(self, protocol):')
+    lines.extend(getstate('__newobj__, (self.__class__,), %s'))
+    lines.extend(['    def __setstate__(self, state):',
+                  '        if state.__class__ is tuple:'])
+    if n_dict:
+        lines.append('            d = self.__dict__')
+    for i, ((name, slot), target) in enumerate(zip(fields, targets)):
+        value = 'state[%d]' % (i,)
+        if name == buf_var:
+            value = 'bytearray(%s)' % (value,)
+        lines.append('            %s = %s' % (target, value))
+    lines.extend(['            return',
+                  '        if len(state) > 2:',
+                  '            return __slow_set(self, state)',
+                  '        mask = state[0]',
+                  '        values = iter(state[1])'])
+    if n_dict:
+        lines.append('        d = self.__dict__')
+    for i, ((name, slot), target) in enumerate(zip(fields, targets)):
+        value = 'next(values)'
+        if name == buf_var:
+            value = 'bytearray(%s)' % (value,)
+        lines.extend(['        if mask & %d:' % (1 << i,),
+                      '            %s = %s' % (target, value)])
+    lines.append('    return __getstate__, __setstate__, __reduce_ex__')
+    ns = {}
+    exec('\n'.join(lines), {'__builtins__': __builtins__}, ns)
+    return ns['__create_state__']
+
+
+def make_state(fields, has_dict, slow_get, slow_set, hash_var=None,
+               buf_var=None, qualname=''):
+    """Return a generated `(__getstate__, __setstate__, __reduce_ex__)`
+    triple for the attributes `fields`.
+
+    The state is the tuple of the values of the fields when they are
+    all set, otherwise `[mask, values]` where bit `i` of `mask` tells
+    whether field `i` is set and `values` is the tuple of the values of
+    the fields that are set. When the instance has other attributes in
+    its `__dict__` (except `hash_var`, which is not saved),
+    `slow_get(obj)` is called to build the state and
+    `slow_set(obj, state)` to restore it; its state must be a list of
+    3 items. `__reduce_ex__` creates the object with
+    `copyreg.__newobj__`, i.e without calling `__init__`. Like other
+    generated code, it is cached by the arguments.
+
+    Args:
+        fields (sequence): `(name, is_slot)` pairs: the attribute names
+            and whether they are `__slots__` members (or keys of the
+            instance `__dict__`).
+        has_dict (bool): Whether the instances have a `__dict__`.
+        slow_get (callable): the general `__getstate__`.
+        slow_set (callable): the general `__setstate__`.
+        hash_var (str, optional): attribute that may be in the
+            instance `__dict__` without being saved.
+        buf_var (str, optional): field whose `bytearray` value is saved
+            as `bytes`.
+        qualname (str, optional): `__qualname__` of the class.
+
+    Returns:
+        tuple: `(__getstate__, __setstate__, __reduce_ex__)`
+    """
+    for name, slot in fields:
+        if slot and not can_generate(name):
+            raise ValueError("Can not generate code for attribute name %r"
+                             % (name,))
+    key = ('__state__', tuple(fields), bool(has_dict), hash_var, buf_var)
+    try:
+        factory = _factories[key]
+    except KeyError:
+        factory = _factories[key] = _compile_state(*key[1:])
+    functions = factory(__newobj__, slow_get, slow_set)
+    if qualname:
+        for function in functions:
+            function.__qualname__ = '%s.%s' % (qualname, function.__name__,)
+    return functions
+
+
+def _compile_bulk_getter(fast, slow, checked):
+    def values(names):
+        if len(names) == 1:
+            return _value_source('obj', names[0])
+        return '(%s)' % (', '.join(_value_source('obj', n) for n in names),)
+    lines = ['def __create_getter__(__cls, __check):',
+             '    def getter(obj):']
+    if checked:
+        lines.extend(['        if obj.__class__ is not __cls \\',
+                      '                and not __check(obj.__class__):',
+                      '            return %s' % (values(slow),)])
+    if fast == slow:
+        lines.append('        return %s' % (values(fast),))
+    else:
+        lines.extend(['        try:',
+                      '            return %s' % (values(fast),),
+                      '        except AttributeError:',
+                      # e.g an empty slot, the properties know better
+                      '            return %s' % (values(slow),)])
+    lines.append('    return getter')
+    ns = {}
+    exec('\n'.join(lines), {'__builtins__': __builtins__}, ns)
+    return ns['__create_getter__']
+
+
+def make_bulk_getter(fast, slow=None, qualname='', cls=None, check=None):
+    """Return a generated `getter(obj)` that returns the values of the
+    attributes `fast` of `obj`, as a tuple (a single value for a single
+    attribute, like `operator.attrgetter`).
+
+    When reading an attribute raises `AttributeError`, the values are
+    read from the attributes `slow` instead (same length, e.g the
+    properties of the internal variables `fast`). Like other generated
+    code, it is cached by the attribute names.
+
+    Args:
+        fast (sequence): attribute names, usually internal variables.
+        slow (sequence, optional): fallback attribute names. Defaults
+            to `fast`, i.e no fallback.
+        qualname (str, optional): `__qualname__` of the getter.
+        cls (class, optional): the class of the objects `fast` is made
+            for. Objects of other classes are read with
+            `check(obj.__class__)`, which tells whether `fast` is valid
+            for them too (otherwise `slow` is read).
+        check (callable, optional): see `cls`.
+
+    Returns:
+        function: the getter.
+    """
+    fast = tuple(fast)
+    slow = fast if slow is None else tuple(slow)
+    if len(fast) != len(slow) or not fast:
+        raise ValueError("fast and slow need the same (non zero) number of "
+                         "attribute names")
+    checked = cls is not None and fast != slow
+    key = ('getter', fast, slow, checked)
+    try:
+        factory = _factories[key]
+    except KeyError:
+        factory = _factories[key] = _compile_bulk_getter(fast, slow, checked)
+    getter = factory(cls, check)
+    if qualname:
+        getter.__qualname__ = qualname
+    return getter
+
+
+def _compile_bulk_setter(names):
+    lines = ['def __create_setter__(__cls, __check):']
+    if len(names) == 1:
+        lines.extend(['    def setter(obj, value):',
+                      '        if obj.__class__ is not __cls:',
+                      '            __check(obj.__class__)'])
+        if can_generate(names[0]):
+            lines.append('        obj.%s = value' % (names[0],))
+        else:
+            lines.append('        setattr(obj, %r, value)' % (names[0],))
+    else:
+        lines.extend(['    def setter(obj, values):',
+                      '        if obj.__class__ is not __cls:',
+                      '            __check(obj.__class__)'])
+        if all(can_generate(n) for n in names):
+            lines.append('        %s = values'
+                         % (', '.join('obj.%s' % (n,) for n in names),))
+        else:
+            lines.append('        %s, = values'
+                         % (', '.join('__v%d' % (i,)
+                                      for i in range(len(names))),))
+            for i, n in enumerate(names):
+                lines.append('        setattr(obj, %r, __v%d)' % (n, i))
+    lines.append('    return setter')
+    ns = {}
+    exec('\n'.join(lines), {'__builtins__': __builtins__}, ns)
+    return ns['__create_setter__']
+
+
+def make_bulk_setter(names, cls, check, qualname=''):
+    """Return a generated `setter(obj, values)` that sets the
+    attributes `names` of `obj` to `values` (a sequence of the same
+    length; `setter(obj, value)` for a single attribute, the
+    counterpart of `make_bulk_getter`).
+
+    The attributes are set without any check: `check(klass)` is called
+    first when the class of `obj` is not `cls` and must raise if the
+    attributes can not be set that way for objects of `klass`. Like
+    other generated code, it is cached by the attribute names.
+
+    Args:
+        names (sequence): attribute names.
+        cls (class): the class the attributes are known to be settable
+            for.
+        check (callable): called with the class of any other object.
+        qualname (str, optional): `__qualname__` of the setter.
+
+    Returns:
+        function: the setter.
+    """
+    names = tuple(names)
+    if not names:
+        raise ValueError("No attribute name given")
+    key = ('setter', names)
+    try:
+        factory = _factories[key]
+    except KeyError:
+        factory = _factories[key] = _compile_bulk_setter(names)
+    setter = factory(cls, check)
+    if qualname:
+        setter.__qualname__ = qualname
+    return setter
+
+
+def _compile_row_builder(names, keyed):
+    keys = ''.join(', __k%d' % (i,) for i in range(len(names))) \
+        if keyed else ''
+    lines = ['def __create_builder__(__new, __missing%s):' % (keys,),
+             '    def build(row):',
+             '        obj = __new()']
+    if keyed:
+        for i, n in enumerate(names):
+            lines.extend(['        value = row.get(__k%d, __missing)' % (i,),
+                          '        if value is not __missing:'])
+            if can_generate(n):
+                lines.append('            obj.%s = value' % (n,))
+            else:
+                lines.append('            setattr(obj, %r, value)' % (n,))
+    elif names:
+        targets = []
+        for i, n in enumerate(names):
+            if n is None:
+                targets.append('_')
+            elif can_generate(n):
+                targets.append('obj.%s' % (n,))
+            else:
+                targets.append('__v%d' % (i,))
+        lines.append('        %s, = row' % (', '.join(targets),))
+        for i, n in enumerate(names):
+            if n is not None and not can_generate(n):
+                lines.append('        setattr(obj, %r, __v%d)' % (n, i))
+    lines.extend(['        return obj',
+                  '    return build'])
+    ns = {}
+    exec('\n'.join(lines), {'__builtins__': __builtins__}, ns)
+    return ns['__create_builder__']
+
+
+def make_row_builder(new, names, keys=None, qualname=''):
+    """Return a generated `build(row)` that creates an object by
+    calling `new()` and sets its attributes `names` from `row`.
+
+    Without `keys`, `row` is a sequence of exactly one value per name
+    (a `None` name skips the value). With `keys` (one per name), `row`
+    is a mapping and `names[i]` is set to `row[keys[i]]` when the key
+    is in the row. Like other generated code, it is cached by the
+    attribute names; the keys are bound, not compiled.
+
+    Args:
+        new (callable): creates an object, e.g a class whose
+            `__init__` does nothing without arguments.
+        names (sequence): attribute names, usually internal variables.
+        keys (sequence, optional): the keys of mapping rows.
+        qualname (str, optional): `__qualname__` of the function.
+
+    Returns:
+        function: the builder.
+    """
+    names = tuple(names)
+    keyed = keys is not None
+    if keyed:
+        keys = tuple(keys)
+        if len(keys) != len(names) or None in names:
+            raise ValueError("One attribute name is needed per key")
+    key = ('builder', names, keyed)
+    try:
+        factory = _factories[key]
+    except KeyError:
+        factory = _factories[key] = _compile_row_builder(names, keyed)
+    build = factory(new, object(), *(keys or ()))
+    if qualname:
+        build.__qualname__ = qualname
+    return build
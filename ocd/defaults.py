@@ -4,13 +4,22 @@
 __author__ = 'Md Jahidul Hamid <jahidulhamid@yahoo.com>'
 __copyright__ = 'Copyright © Md Jahidul Hamid <https://github.com/neurobin/>'
 __license__ = '[BSD](http://www.opensource.org/licenses/bsd-license.php)'
-__version__ = '0.0.5'
+__version__ = '0.0.6'
 
 
+import re
+
 from ocd import abc
 from ocd import prop
 
 
+# `Prop` objects are immutable, thus the `VarConf` classes below share
+# one for all the attributes instead of creating one per attribute
+# (these are interned anyway, see `prop._PropType.__call__`).
+_PROP_ALL = prop.Prop()
+_PROP_ALL_UNRO = prop.Prop(readonly=True, undead=True)
+
+
 def nomodify(value):
     """A modifier that does not modify the value."""
     return value
@@ -28,6 +37,8 @@ class VarConfNone(abc.VarConf):
     automatic property conversion.
     """
 
+    name_only = True
+
     def get_conf(self, name, value):
         """Return `None` i.e no property conversion will take place
         """
@@ -45,11 +56,13 @@ class VarConfAll(abc.VarConf):
     To see the defaults, see class `ocd.prop.Prop`
     """
 
+    name_only = True
+
     def get_conf(self, name, value):
         """Return `Prop()` i.e all public attributes will become
         properties.
         """
-        return prop.Prop()
+        return _PROP_ALL
 
 
 class VarConfAllUnro(abc.VarConf):
@@ -61,8 +74,133 @@ class VarConfAllUnro(abc.VarConf):
     or changed.
     """
 
+    name_only = True
+
     def get_conf(self, name, value):
         """Return `Prop(readonly=True, undead=True)` i.e all public
         attributes will become readonly, undead properties.
         """
-        return prop.Prop(readonly=True, undead=True)
+        return _PROP_ALL_UNRO
+
+
+class VarConfRules(abc.VarConf):
+    """A declarative `VarConf` class that decides the property
+    configuration from an ordered table of rules.
+
+    Each rule is a tuple `(kind, pattern, conf)` where `conf` is the
+    `Prop` object to return for the attributes matching the rule (or
+    `None` to leave them as they are) and `kind` is one of:
+
+    * `'prefix'`: the name starts with `pattern` (a string or a tuple
+      of strings).
+    * `'suffix'`: the name ends with `pattern` (a string or a tuple of
+      strings).
+    * `'regex'`: the whole name matches the regular expression
+      `pattern` (it must not use named groups).
+    * `'type'`: the value is an instance of `pattern` (a type or a
+      tuple of types).
+
+    The first matching rule wins; attributes that do not match any
+    rule get `default`. An example:
+
+    ```python
+    class MyClass(PropMixin):
+        class VarConf(defaults.VarConfRules):
+            rules = [
+                ('prefix', 'ro_', Prop(readonly=True)),
+                ('prefix', 'wro_', Prop(readonly=Prop.RO_WEAK)),
+                ('suffix', ('_nd', '_undead'), Prop(undead=True)),
+                ('regex', r'p_\\w+', Prop()),
+                ('type', (int, float), Prop()),
+            ]
+            default = None
+            ignore_case = True
+    ```
+
+    The name based rules are compiled into a single regular expression
+    the first time the class is used, and the decisions are memoized
+    by name (by name and type of the value if there are `'type'`
+    rules), thus a name is matched against the rules just once for all
+    the classes using this `VarConf`. The `Prop` objects in the table
+    are returned as they are (they are immutable). Changing `rules`
+    after the first use has no effect.
+    """
+
+    rules = ()
+    default = None
+    ignore_case = False
+
+    _kinds = ('prefix', 'suffix', 'regex', 'type')
+
+    def get_conf(self, name, value):
+        """Return the `conf` of the first rule that matches, `default`
+        if none does.
+        """
+        klass = type(self)
+        try:
+            match, type_rules, cache = klass.__dict__['_compiled']
+        except KeyError:
+            match, type_rules, cache = klass._compile()
+        key = (name, type(value)) if type_rules else name
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        m = match(name) if isinstance(name, str) else None
+        index = int(m.lastgroup[2:]) if m else len(klass.rules)
+        for i, types in type_rules:
+            if i > index:
+                break
+            if isinstance(value, types):
+                index = i
+                break
+        if index < len(klass.rules):
+            conf = klass.rules[index][2]
+        else:
+            conf = klass.default
+        cache[key] = conf
+        return conf
+
+    @classmethod
+    def _compile(cls):
+        """Validate `rules` and compile them into
+        `(match, type_rules, cache)` where `match` is the `fullmatch`
+        of the combined regular expression for the name based rules.
+        """
+        alternatives = []
+        type_rules = []
+        for i, rule in enumerate(cls.rules):
+            try:
+                kind, pattern, conf = rule
+            except (TypeError, ValueError):
+                raise ValueError("Invalid rule %r in %r. A rule must be a "
+                                 "(kind, pattern, conf) tuple."
+                                 % (rule, cls,)) from None
+            if kind not in cls._kinds:
+                raise ValueError("Invalid rule kind %r in %r. It must be one "
+                                 "of %r." % (kind, cls, cls._kinds,))
+            if conf is not None and not isinstance(conf, prop.Prop):
+                raise ValueError("The conf of rule %r in %r must be a `Prop` "
+                                 "object or `None`." % (rule, cls,))
+            if kind == 'type':
+                type_rules.append((i, pattern))
+                continue
+            if kind == 'regex':
+                regex = '(?:%s)' % (pattern,)
+            else:
+                if isinstance(pattern, str):
+                    pattern = (pattern,)
+                regex = '|'.join(re.escape(p) for p in pattern)
+                if kind == 'prefix':
+                    regex = '(?:%s).*' % (regex,)
+                else:
+                    regex = '.*(?:%s)' % (regex,)
+            alternatives.append('(?P<_r%d>%s)' % (i, regex))
+        if alternatives:
+            flags = re.DOTALL | (re.IGNORECASE if cls.ignore_case else 0)
+            match = re.compile('|'.join(alternatives), flags).fullmatch
+        else:
+            def match(name):
+                return None
+        cls._compiled = (match, tuple(type_rules), {})
+        return cls._compiled
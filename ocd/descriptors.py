@@ -0,0 +1,745 @@
+"""Property descriptors.
+
+Slot based data descriptors used by `PropMeta` to implement the
+properties defined through `Prop`. They do the same job as the
+`property()` objects built from the getter/setter functions in
+`ocd.prop`, but without a Python level getter on the common path:
+
+* `PropDescriptor`: read-write property. The value is stored in the
+  instance `__dict__` under the internal variable name and read back
+  with a C level `operator.attrgetter`. The default value is kept in
+  the owner class under the internal variable name, thus an instance
+  that has not set the property yet falls back to it without any
+  extra Python call (a default value that is itself a descriptor, e.g
+  a function, is wrapped in a `_Default` object so that it is not
+  bound to the instance).
+* `ReadonlyWeakPropDescriptor`: readonly property whose value can be
+  changed through its internal variable (`Prop.RO_WEAK`).
+* `ReadonlyPropDescriptor`: readonly property with a constant value and
+  no internal variable (`Prop.RO_STRONG`).
+* `SlotPropDescriptor` and `ReadonlyWeakSlotPropDescriptor`: same as
+  `PropDescriptor` and `ReadonlyWeakPropDescriptor` for classes that
+  keep the internal variable in a `__slots__` member instead of the
+  instance `__dict__`.
+* `AsyncPropDescriptor` and `AsyncSlotPropDescriptor`: weak readonly
+  properties whose value is computed by a coroutine function; reading
+  them returns an awaitable (see `Prop(async_compute=...)`).
+
+The internal variable of a typed property (`Prop(type=...)`) is a
+`_Packed` descriptor instead of a slot: the value is packed in a
+per instance buffer shared by all the typed properties of the object.
+It behaves like a slot member, thus the `Slot*` descriptors are used
+for typed properties.
+
+A property can have a default factory instead of a default value (see
+`Prop(default_factory=...)` and `Prop(copy_default=True)`). The factory
+is called the first time an instance reads the property and the result
+is stored in the internal variable of the instance (`_Lazy`). A
+computed property (`Prop(compute=...)`) works the same way, except
+that its function is called with the instance (`_Compute`). With
+`Prop(single_flight=True)` the first read is serialized per instance
+and property (`_SingleFlight`), thus the value is built just once even
+when several threads read it at the same time; reading a value that is
+built already does not take any lock.
+
+The descriptors are subclasses of `property`, thus they can be used
+wherever a `property` object is expected. Accessing them through the
+class returns the descriptor itself. The getter, setter and deleter
+functions are specialized once at construction time for the mode and
+storage of the property; pass `codegen=True` to use accessors compiled
+by `ocd.codegen` instead of closures. The accessors that only depend on
+the names of a property (e.g the setter of a `__dict__` property) are
+made once and shared by all the properties with the same names.
+"""
+
+__author__ = 'Md Jahidul Hamid <jahidulhamid@yahoo.com>'
+__copyright__ = 'Copyright © Md Jahidul Hamid <https://github.com/neurobin/>'
+__license__ = '[BSD](http://www.opensource.org/licenses/bsd-license.php)'
+__version__ = '0.0.3'
+
+
+from operator import attrgetter
+from struct import Struct
+from threading import Lock, RLock
+
+from ocd import Void
+from ocd import codegen as _codegen
+from ocd import observe as _observe
+
+
+class _Unset(object):
+    """Class level fallback for the internal variable of a property
+    without a default value.
+
+    It is a non-data descriptor, thus the instance `__dict__` takes
+    precedence over it. It is only reached when the internal variable
+    does not exist in the instance.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            raise AttributeError("Property '%s' does not have a default "
+                                 "value" % (self.name,))
+        raise AttributeError("Property '%s' is not set yet for %r"
+                             % (self.name, obj,))
+
+
+class _Default(object):
+    """Class level fallback for the internal variable of a property
+    whose default value is a descriptor (e.g a function or a
+    `property`): returns the value as it is, instead of letting the
+    class bind or call it.
+
+    It is a non-data descriptor, thus the instance `__dict__` takes
+    precedence over it.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __get__(self, obj, objtype=None):
+        return self.value
+
+
+class _SingleFlight(object):
+    """Serializes the building of lazy values per (instance, internal
+    variable), so that threads missing the same value at the same time
+    build it just once.
+
+    A lock is created for a key only while some thread is building its
+    value, and removed when the last waiting thread is done. The lock
+    is reentrant, thus building a value may read other lazy values of
+    the same instance.
+    """
+    __slots__ = ('_guard', '_calls')
+
+    def __init__(self):
+        self._guard = Lock()
+        self._calls = {}
+
+    def run(self, obj, var_name, get, build):
+        """Return `get(obj)` if the value is there already, otherwise
+        return `build(obj)` (which must store the value), with at most
+        one thread running `build` for the same `obj` and `var_name`.
+        """
+        key = (id(obj), var_name)
+        with self._guard:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = [RLock(), 0]
+            call[1] += 1
+        try:
+            with call[0]:
+                try:
+                    # built by another thread while waiting
+                    return get(obj)
+                except AttributeError:
+                    return build(obj)
+        finally:
+            with self._guard:
+                call[1] -= 1
+                if not call[1]:
+                    del self._calls[key]
+
+
+_single_flight = _SingleFlight()
+
+# Change tracking (`track_changes=True` classes): the instance attribute
+# that holds the bitmask of the properties set, and the class attribute
+# that maps the property names to their bits.
+_CHANGES_VAR = '_Props_changes_'
+_BITS_VAR = '_Props_bits_'
+
+# Typed properties: the instance attribute that holds the buffer of the
+# packed values and the class attribute that holds the packed default
+# values (the initial buffer).
+_BUF_VAR = '_Props_buf_'
+_BUF_INIT_VAR = '_Props_buf_init_'
+
+
+class _Packed(object):
+    """Data descriptor for the internal variable of a typed property:
+    the value is packed with the `struct` format `fmt` at `offset` in
+    the buffer of the instance (`_Props_buf_`).
+
+    Instances that have not set any typed property yet do not have a
+    buffer, they read the initial buffer of their class
+    (`_Props_buf_init_`); the first write copies it. Deleting the
+    value resets it to the default.
+    """
+    __slots__ = ('name', 'offset', 'default', 'size', 'unpack', 'pack')
+
+    def __init__(self, name, fmt, offset, default):
+        packer = Struct('<' + fmt)
+        self.name = name
+        self.offset = offset
+        self.default = default
+        self.size = packer.size
+        self.unpack = packer.unpack_from
+        self.pack = packer.pack_into
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            buf = obj._Props_buf_
+        except AttributeError:
+            buf = obj.__class__._Props_buf_init_
+        return self.unpack(buf, self.offset)[0]
+
+    def __set__(self, obj, value):
+        try:
+            buf = obj._Props_buf_
+        except AttributeError:
+            buf = obj._Props_buf_ = bytearray(obj.__class__._Props_buf_init_)
+        self.pack(buf, self.offset, value)
+
+    def __delete__(self, obj):
+        self.__set__(obj, self.default)
+
+    def make_fget(self):
+        """Return a getter for the property, same as `__get__` without
+        the descriptor call.
+        """
+        unpack, offset = self.unpack, self.offset
+        def fget(obj):
+            try:
+                buf = obj._Props_buf_
+            except AttributeError:
+                buf = obj.__class__._Props_buf_init_
+            return unpack(buf, offset)[0]
+        return fget
+
+
+class _PackedBytes(_Packed):
+    """`_Packed` for fixed size bytes: longer values are rejected
+    instead of being truncated (shorter ones are padded with zero
+    bytes).
+    """
+    __slots__ = ()
+
+    def __set__(self, obj, value):
+        if len(value) > self.size:
+            raise ValueError("Property '%s' takes at most %d bytes"
+                             % (self.name, self.size,))
+        _Packed.__set__(self, obj, value)
+
+
+class _Lazy(object):
+    """Class level fallback for the internal variable of a property
+    with a default factory.
+
+    It is a non-data descriptor, thus it is only reached when the
+    internal variable does not exist in the instance. It builds the
+    default value and stores it in the instance `__dict__`, thus the
+    following reads do not reach it anymore.
+    """
+    __slots__ = ('name', 'var_name', 'factory', 'single_flight')
+
+    def __init__(self, name, var_name, factory, single_flight=False):
+        self.name = name
+        self.var_name = var_name
+        self.factory = factory
+        self.single_flight = single_flight
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if self.single_flight:
+            return _single_flight.run(obj, self.var_name, self._get,
+                                      self._build)
+        return self._build(obj)
+
+    def _get(self, obj):
+        try:
+            return obj.__dict__[self.var_name]
+        except KeyError:
+            raise AttributeError(self.var_name) from None
+
+    def _build(self, obj):
+        value = obj.__dict__[self.var_name] = self.factory()
+        return value
+
+
+class _Compute(_Lazy):
+    """Class level fallback for the internal variable of a computed
+    property: like `_Lazy`, but the factory is called with the
+    instance.
+    """
+    __slots__ = ()
+
+    def _build(self, obj):
+        value = obj.__dict__[self.var_name] = self.factory(obj)
+        return value
+
+
+# accessors that do not depend on the value of a property, shared by
+# all the properties with the same names (see `_shared`)
+_accessors = {}
+
+
+def _shared(make, *names):
+    """Return `make(*names)`, made once per `make` and `names`."""
+    key = (make, names)
+    try:
+        return _accessors[key]
+    except KeyError:
+        func = _accessors[key] = make(*names)
+        return func
+
+
+def _make_dict_fset(var_name):
+    if _codegen.can_generate(var_name):
+        # a plain attribute store, faster than any closure
+        return _codegen.make_setter(var_name)
+    def fset(obj, value):
+        setattr(obj, var_name, value)
+    return fset
+
+
+def _make_dict_fdel(var_name):
+    def fdel(obj):
+        try:
+            del obj.__dict__[var_name]
+        except KeyError:
+            raise AttributeError("%r object has no attribute '%s'"
+                                 % (obj.__class__.__name__,
+                                    var_name,)) from None
+    return fdel
+
+
+def _make_nofset(name):
+    def fset(obj, value):
+        raise AttributeError("'%s' is a readonly property for %r"
+                             % (name, obj,))
+    return fset
+
+
+def _make_nofdel(name):
+    def fdel(obj):
+        raise AttributeError("Property '%s' is not deletable by %r"
+                             % (name, obj,))
+    return fdel
+
+
+def _make_const_fdel(name):
+    def fdel(obj):
+        raise AttributeError("Constant readonly property '%s' can not be "
+                             "deleted by %r" % (name, obj,))
+    return fdel
+
+
+class PropDescriptor(property):
+    # Data descriptor for a read-write property.
+    #
+    # Reading goes through `property.__get__` and a C level
+    # `attrgetter` of the internal variable name, without any Python
+    # level call; it is still a few times slower than reading a plain
+    # attribute (see `benchmarks/bench_descriptors.py`). The default
+    # value (or an `_Unset` object when there isn't one, a `_Default`
+    # object when it is a descriptor, a `_Lazy` object when there is a
+    # default factory, or a `_Compute` object for a computed property)
+    # is stored in the owner class under the internal variable name by
+    # `__set_name__`, unless the owner class defines that name itself.
+    # The object stored is kept in `fallback` (Void if none).
+    #
+    # Note: `__doc__` is a slot here (property subclasses store their
+    # doc on the instance), thus this class can not have a docstring.
+    __slots__ = ('__doc__', 'name', 'var_name', 'default', 'undead',
+                 'factory', 'compute', 'single_flight', 'fallback')
+    _mode = _codegen.MODE_RW
+    _storage = _codegen.STORAGE_DICT
+    _codegen_fget = True
+    # the accessors depend on the names only (and `undead`) when there
+    # is no factory or compute function, thus they are shared by the
+    # properties with the same names
+    _names_only = True
+
+    def __init__(self, name, var_name, default=Void, undead=False, doc='',
+                 codegen=False, factory=None, compute=None,
+                 single_flight=False, observe=False, track=False):
+        """Args:
+            name (str): name of the property
+            var_name (str): internal variable name
+            default (any, optional): Default value. Defaults to Void.
+            undead (bool, optional): Whether the property is undead
+                (non deletable) for instance objects. Defaults to
+                False.
+            doc (str, optional): docstring of the property.
+            codegen (bool, optional): Use generated accessors (see
+                `ocd.codegen`). Defaults to False.
+            factory (callable, optional): Called without arguments to
+                build the default value of an instance the first time
+                it reads the property. Takes precedence over
+                `default`. Defaults to None.
+            compute (callable, optional): Called with the instance to
+                compute the value the first time it reads the
+                property. Takes precedence over `factory`. Defaults
+                to None.
+            single_flight (bool, optional): Build the value of
+                `factory` or `compute` just once per instance when
+                several threads read it at the same time. Defaults to
+                False.
+            observe (bool, optional): Notify the hooks of
+                `ocd.observe` when the property is set. Defaults to
+                False.
+            track (bool, optional): Record in the instance that the
+                property is set (see `ocd.prop.changed`). Defaults to
+                False.
+        """
+        self.name = name
+        self.var_name = var_name
+        self.default = default
+        self.undead = undead
+        self.factory = factory
+        self.compute = compute
+        self.single_flight = single_flight
+        self.fallback = Void
+        if codegen and _codegen.can_generate(var_name):
+            fget, fset, fdel = _codegen.make_accessors(self._mode,
+                                                       self._storage,
+                                                       name, var_name,
+                                                       default, undead,
+                                                       factory, compute)
+            if fget is None or single_flight or not self._codegen_fget:
+                # the generated getters do not serialize the miss path
+                fget = self._make_fget()
+        elif factory is None and compute is None and self._names_only:
+            key = (self.__class__, name, var_name, undead)
+            try:
+                fget, fset, fdel = _accessors[key]
+            except KeyError:
+                fget, fset, fdel = _accessors[key] = (self._make_fget(),
+                                                      self._make_fset(),
+                                                      self._make_fdel())
+        else:
+            fget = self._make_fget()
+            fset = self._make_fset()
+            fdel = self._make_fdel()
+        if track and self._mode == _codegen.MODE_RW:
+            fset = self._make_tracked_fset(fset)
+        if observe and self._mode == _codegen.MODE_RW:
+            fset = self._make_observed_fset(fset)
+        property.__init__(self, fget, fset, fdel, doc)
+
+    def __repr__(self):
+        return '<%s %r>' % (self.__class__.__name__, self.name)
+
+    def __set_name__(self, owner, name, old=None):
+        """Store the default value in `owner` class as the fallback
+        for the internal variable, unless `owner` has an attribute with
+        that name already that is not the fallback of `old` (the
+        descriptor being replaced, if any).
+        """
+        fallback = self._fallback()
+        if fallback is Void:
+            return
+        current = owner.__dict__.get(self.var_name, Void)
+        if current is not Void and current is not self.fallback \
+                and (not isinstance(old, PropDescriptor)
+                     or old.var_name != self.var_name
+                     or current is not old.fallback):
+            # defined by the class itself, it takes precedence (like
+            # the internal variable of an instance)
+            return
+        self.fallback = fallback
+        type.__setattr__(owner, self.var_name, fallback)
+
+    def _fallback(self):
+        """Return the object to store in the owner class under the
+        internal variable name (Void for nothing).
+        """
+        if self.compute is not None:
+            return _Compute(self.name, self.var_name, self.compute,
+                            self.single_flight)
+        if self.factory is not None:
+            return _Lazy(self.name, self.var_name, self.factory,
+                         self.single_flight)
+        elif self.default is Void:
+            return _Unset(self.name)
+        elif hasattr(type(self.default), '__get__'):
+            return _Default(self.default)
+        return self.default
+
+    def _make_fget(self):
+        return _shared(attrgetter, self.var_name)
+
+    def _make_fset(self):
+        return _shared(_make_dict_fset, self.var_name)
+
+    def _make_fdel(self):
+        if self.undead:
+            return self._make_nofdel()
+        return _shared(_make_dict_fdel, self.var_name)
+
+    def _make_tracked_fset(self, fset):
+        name = self.name
+        def tracked_fset(obj, value):
+            fset(obj, value)
+            # the bits are per class (see `PropMeta._track_bits`)
+            bit = obj.__class__._Props_bits_[name]
+            try:
+                obj._Props_changes_ |= bit
+            except AttributeError:
+                obj._Props_changes_ = bit
+        return tracked_fset
+
+    def _make_observed_fset(self, fset):
+        name, notify = self.name, _observe.notify
+        def observed_fset(obj, value):
+            fset(obj, value)
+            notify(obj, name, value)
+        return observed_fset
+
+    def _make_nofset(self):
+        return _shared(_make_nofset, self.name)
+
+    def _make_nofdel(self):
+        return _shared(_make_nofdel, self.name)
+
+
+class ReadonlyWeakPropDescriptor(PropDescriptor):
+    # Data descriptor for a weak readonly property (`Prop.RO_WEAK`).
+    #
+    # The value can not be set through the property, but can be
+    # changed through the internal variable.
+    __slots__ = ()
+    _mode = _codegen.MODE_WEAK
+
+    def _make_fset(self):
+        return self._make_nofset()
+
+
+class ReadonlyPropDescriptor(ReadonlyWeakPropDescriptor):
+    # Data descriptor for a strong readonly property
+    # (`Prop.RO_STRONG`).
+    #
+    # The value is a constant; there is no internal variable.
+    __slots__ = ()
+    _mode = _codegen.MODE_CONST
+    _names_only = False
+
+    def __init__(self, name, default=Void, undead=False, doc='',
+                 codegen=False):
+        """Args:
+            name (str): name of the property
+            default (any, optional): The constant value. Defaults to
+                Void.
+            undead (bool, optional): Whether the property is undead
+                (non deletable) for instance objects. Defaults to
+                False.
+            doc (str, optional): docstring of the property.
+            codegen (bool, optional): Use generated accessors (see
+                `ocd.codegen`). Defaults to False.
+        """
+        super(ReadonlyPropDescriptor, self).__init__(name, None, default,
+                                                     undead, doc, codegen)
+
+    def __set_name__(self, owner, name, old=None):
+        """No internal variable, nothing to store in `owner`."""
+        pass
+
+    def _fallback(self):
+        return Void
+
+    def _make_fget(self):
+        name, v = self.name, self.default
+        if v is Void:
+            def fget(obj):
+                raise AttributeError("The value of property '%s' is "
+                                     "non-existent for %r. It can neither be "
+                                     "read nor be written." % (name, obj,))
+        else:
+            def fget(obj):
+                return v
+        return fget
+
+    def _make_fdel(self):
+        if self.undead:
+            return self._make_nofdel()
+        return _shared(_make_const_fdel, self.name)
+
+
+class SlotPropDescriptor(PropDescriptor):
+    # Data descriptor for a read-write property whose internal
+    # variable is a `__slots__` member of the owner class.
+    #
+    # The slot member descriptor occupies the internal variable name in
+    # the owner class, thus the default value is kept by the getter
+    # instead.
+    __slots__ = ('member',)
+    _storage = _codegen.STORAGE_SLOT
+    _names_only = False
+
+    def __init__(self, name, var_name, member, default=Void, undead=False,
+                 doc='', codegen=False, factory=None, compute=None,
+                 single_flight=False, observe=False, track=False):
+        """Args:
+            name (str): name of the property
+            var_name (str): internal variable name
+            member (member_descriptor): the `__slots__` member
+                descriptor for `var_name`
+            default (any, optional): Default value. Defaults to Void.
+            undead (bool, optional): Whether the property is undead
+                (non deletable) for instance objects. Defaults to
+                False.
+            doc (str, optional): docstring of the property.
+            codegen (bool, optional): Use generated accessors (see
+                `ocd.codegen`). Defaults to False.
+            factory (callable, optional): Called without arguments to
+                build the default value of an instance the first time
+                it reads the property. Defaults to None.
+            compute (callable, optional): Called with the instance to
+                compute the value the first time it reads the
+                property. Defaults to None.
+            single_flight (bool, optional): Build the value of
+                `factory` or `compute` just once per instance when
+                several threads read it at the same time. Defaults to
+                False.
+            observe (bool, optional): Notify the hooks of
+                `ocd.observe` when the property is set. Defaults to
+                False.
+            track (bool, optional): Record in the instance that the
+                property is set (see `ocd.prop.changed`). Defaults to
+                False.
+        """
+        self.member = member
+        super(SlotPropDescriptor, self).__init__(name, var_name, default,
+                                                 undead, doc, codegen,
+                                                 factory, compute,
+                                                 single_flight, observe,
+                                                 track)
+
+    def __set_name__(self, owner, name, old=None):
+        """The internal variable is a slot, nothing to store in
+        `owner`.
+        """
+        pass
+
+    def _fallback(self):
+        return Void
+
+    def _make_fget(self):
+        if isinstance(self.member, _Packed):
+            # typed property, no default factory
+            return self.member.make_fget()
+        name, default, factory = self.name, self.default, self.factory
+        if self.compute is None and factory is None and default is Void:
+            # the slot member raises AttributeError when it is empty
+            return _shared(attrgetter, self.var_name)
+        if not self.single_flight and _codegen.can_generate(self.var_name):
+            # the generated getter reads the slot without Python calls
+            return _codegen.make_accessors(self._mode, self._storage, name,
+                                           self.var_name, default,
+                                           factory=factory,
+                                           compute=self.compute)[0]
+        member_get = self.member.__get__
+        if self.compute is not None or factory is not None:
+            member_set = self.member.__set__
+            if self.compute is not None:
+                compute = self.compute
+            else:
+                def compute(obj):
+                    return factory()
+            def build(obj):
+                value = compute(obj)
+                member_set(obj, value)
+                return value
+            if self.single_flight:
+                var_name, run = self.var_name, _single_flight.run
+                def fget(obj):
+                    try:
+                        return member_get(obj)
+                    except AttributeError:
+                        return run(obj, var_name, member_get, build)
+                return fget
+            def fget(obj):
+                try:
+                    return member_get(obj)
+                except AttributeError:
+                    return build(obj)
+            return fget
+        def fget(obj):
+            try:
+                return member_get(obj)
+            except AttributeError:
+                if default is Void:
+                    raise AttributeError("Property '%s' is not set yet for %r"
+                                         % (name, obj,)) from None
+                return default
+        return fget
+
+    def _make_fset(self):
+        return self.member.__set__
+
+    def _make_fdel(self):
+        if self.undead:
+            return self._make_nofdel()
+        return self.member.__delete__
+
+
+class ReadonlyWeakSlotPropDescriptor(ReadonlyWeakPropDescriptor,
+                                     SlotPropDescriptor):
+    # Data descriptor for a weak readonly property (`Prop.RO_WEAK`)
+    # whose internal variable is a `__slots__` member of the owner
+    # class.
+    __slots__ = ()
+
+
+class AsyncPropDescriptor(ReadonlyWeakPropDescriptor):
+    # Data descriptor for a property computed by a coroutine function
+    # (`Prop(async_compute=...)`).
+    #
+    # Reading it returns an awaitable: the value of the internal
+    # variable once computed, otherwise a shield of the task computing
+    # it (shared by concurrent readers, see `_async._AsyncFlight`). The
+    # coroutine function is kept in `compute`. It is always weak
+    # readonly, thus the computed value can not be replaced through the
+    # property.
+    __slots__ = ()
+    _codegen_fget = False
+    _names_only = False
+
+    def _fallback(self):
+        return _Unset(self.name)
+
+    def _make_fget(self):
+        # asyncio (and async def) only for the classes that need it
+        from ocd._async import _async_flight, _Ready
+        var_name, compute = self.var_name, self.compute
+        get = _async_flight.get
+        def store(obj, value):
+            obj.__dict__[var_name] = value
+        def fget(obj):
+            try:
+                return _Ready(obj.__dict__[var_name])
+            except KeyError:
+                return get(obj, var_name, compute, store)
+        return fget
+
+
+class AsyncSlotPropDescriptor(AsyncPropDescriptor,
+                              ReadonlyWeakSlotPropDescriptor):
+    # Same as `AsyncPropDescriptor` for classes that keep the internal
+    # variable in a `__slots__` member.
+    __slots__ = ()
+
+    def _fallback(self):
+        return Void
+
+    def _make_fget(self):
+        from ocd._async import _async_flight, _Ready
+        var_name, compute = self.var_name, self.compute
+        get = _async_flight.get
+        member_get, store = self.member.__get__, self.member.__set__
+        def fget(obj):
+            try:
+                return _Ready(member_get(obj))
+            except AttributeError:
+                return get(obj, var_name, compute, store)
+        return fget
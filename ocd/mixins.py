@@ -118,6 +118,20 @@ class PropMixin(metaclass=PropMeta):
         p_etc = 'etc...'
     ```
 
+    The same `VarConf` can be written declaratively (and evaluated
+    faster) with `defaults.VarConfRules`:
+
+    ```python
+    class VarConf(defaults.VarConfRules):
+        rules = [
+            ('prefix', 'ro_', Prop(readonly=True)),
+            ('prefix', 'wro_', Prop(readonly=Prop.RO_WEAK)),
+            ('prefix', 'ndel_', Prop(undead=True)),
+            ('prefix', 'p_', Prop()),
+        ]
+        ignore_case = True
+    ```
+
 
     A special class attribute `Props`
     =================================
@@ -139,6 +153,356 @@ class PropMixin(metaclass=PropMeta):
                             return '_author_name' (internal variable \
                             name)
 
+    The information is kept in a single table of `PropRecord` objects
+    (`key`, `default`, `conf`, `var_name`) per class. The records can
+    be iterated over, in definition order, and looked up by name:
+
+    ```python
+    for record in MyClass.Props:
+        print(record.key, record.default)
+
+    MyClass.Props.get('author_name').conf
+    list(MyClass.Props.Keys) # the names of the properties
+    ```
+
+    Fields a property does not have (the default value when
+    `store_default=False`, the internal variable of a readonly
+    property) are `Void` in the record and missing in the views.
+
+    `Props` only has the properties defined in the class itself.
+    `Props.All` has the same API for all the properties of the class,
+    inherited ones included, as an index merged along the MRO when the
+    class is created (the nearest definition wins):
+
+    ```python
+    class Child(MyClass):
+        extra = Prop(0)
+
+    Child.Props.All.Conf.author_name # defined in MyClass
+    list(Child.Props.All.Keys) # all the property names
+    ```
+
+    To move several properties at once (e.g in ETL loops), build a
+    getter and a setter once and reuse them:
+
+    ```python
+    get = Child.Props.getter('author_name', 'extra')
+    put = Child.Props.setter('author_name', 'extra')
+    put(dst, get(src)) # reads and writes the internal variables
+    ```
+
+    They are generated for the properties (like
+    `operator.attrgetter`, a single name gives a single value) and the
+    readonly rules are checked when they are created, not per
+    attribute.
+
+    To build many objects from rows (tuples or dicts, e.g from a CSV
+    file or a database cursor), use `from_rows`, which writes the
+    values to the internal variables directly and yields the objects
+    lazily (or in lists of `chunk_size` objects):
+
+    ```python
+    for obj in Child.from_rows(rows, ('author_name', None, 'extra')):
+        ...
+    ```
+
+    `__slots__` storage
+    ===================
+
+    By default the internal variables are stored in the instance
+    `__dict__`. Pass `slots=True` as a class keyword to store them in
+    `__slots__` instead:
+
+    ```python
+    class Record(PropMixin, slots=True, weakref=True):
+        VarConf = defaults.VarConfAll
+
+        key = None
+        value = 0
+    ```
+
+    `__slots__` is generated for the internal variables of the
+    properties defined in the class (`Record.Props.Ivan`). Pass
+    `weakref=True` to add a `__weakref__` slot too. Instances of such
+    class do not have a `__dict__` (unless some base class provides
+    one), thus attributes that are not properties can not be set on
+    them. Like `__slots__` itself, this option is not inherited by
+    subclasses.
+
+    Generated accessors
+    ===================
+
+    Pass `codegen=True` as a class keyword to use property accessors
+    compiled from specialized source code (see `ocd.codegen`) instead
+    of closures. The option is inherited by subclasses.
+
+    ```python
+    class Record(PropMixin, codegen=True):
+        VarConf = defaults.VarConfAll
+
+        key = None
+    ```
+
+    Generated `__init__`
+    ====================
+
+    Pass `init=True` as a class keyword to get an `__init__` that
+    takes the property values as arguments and writes them to the
+    internal variables in one go:
+
+    ```python
+    class Record(PropMixin, init=True):
+        VarConf = defaults.VarConfAll
+
+        key = None
+        value = 0
+
+    r = Record(key='k', value=3)
+    r = Record('k', 3) # faster, no keyword dict is built
+    ```
+
+    The arguments follow the order of the properties, inherited ones
+    first. Properties that are not passed keep their default value.
+    Strong readonly properties do not have internal variables, thus
+    they are not accepted; weak readonly properties are. The option is
+    inherited by subclasses (the generated `__init__` of a subclass
+    covers the inherited properties too), unless a class defines its
+    own `__init__`.
+
+    Frozen instances
+    ================
+
+    Pass `frozen=True` as a class keyword to make the instances
+    immutable values that can be used as dict keys:
+
+    ```python
+    class Key(PropMixin, frozen=True, init=True):
+        VarConf = defaults.VarConfAll
+
+        host = ''
+        port = 0
+
+    cache = {Key('localhost', 80): 'up'}
+    cache[Key('localhost', 80)] # 'up'
+    ```
+
+    The properties become readonly and undead for the instances (their
+    internal variables can still be set, e.g by `__init__`), and
+    `__eq__`/`__hash__` are generated over the values of the
+    properties that have internal variables (strong readonly
+    properties are constants of the class). The hash is computed the
+    first time it is needed and cached in the instance, thus the
+    internal variables must not be changed after that. Methods defined
+    in the class take precedence over the generated ones. The option
+    is inherited by subclasses.
+
+    Change notifications
+    ====================
+
+    Pass `observable=True` as a class keyword to have the property
+    setters notify the hooks registered with `ocd.observe` (per
+    property, per class or global), synchronously or through a queue,
+    and `ocd.observe.batch()` to coalesce several changes into one
+    notification per object:
+
+    ```python
+    class Point(PropMixin, observable=True):
+        x = Prop(0)
+        y = Prop(0)
+
+    observe.subscribe(lambda obj, changes: print(changes), Point)
+    with observe.batch():
+        p.x = 1
+        p.y = 2
+    # prints {'x': 1, 'y': 2}
+    ```
+
+    The setters of other classes do not change. The option is
+    inherited by subclasses.
+
+    Change tracking
+    ===============
+
+    Pass `track_changes=True` as a class keyword to have the property
+    setters record which properties are set, e.g to write back only
+    the changed fields of a record:
+
+    ```python
+    from ocd.prop import changed, clear_changes, snapshot, diff_since
+
+    class Row(PropMixin, track_changes=True, init=True):
+        VarConf = defaults.VarConfAll
+
+        id = 0
+        name = ''
+
+    row = Row(1, 'a') # __init__ is not a change
+    saved = snapshot(row)
+    row.name = 'b'
+    changed(row)           # ['name']
+    diff_since(row, saved) # {'name': 'b'}
+    clear_changes(row)
+    ```
+
+    The changes are kept as a bitmask in the instance (an extra slot
+    with `slots=True`), one bit per property in `Props.All` order.
+    Writes to the internal variables are not recorded, neither are
+    the setters of properties defined in base classes created without
+    the option. The option is inherited by subclasses.
+
+    Compact pickle and copy state
+    =============================
+
+    Pass `compact_state=True` as a class keyword to generate
+    `__getstate__`, `__setstate__`, `__reduce_ex__`, `__copy__` and
+    `__deepcopy__` from the properties of the class:
+
+    ```python
+    class Record(PropMixin, compact_state=True, init=True):
+        VarConf = defaults.VarConfAll
+
+        key = None
+        value = 0
+
+    Record('k', 1).__getstate__() # ('k', 1)
+    ```
+
+    The state is positional (no attribute names): the tuple of the
+    internal variables when they are all set, otherwise a bitmask of
+    the ones that are set and their values; properties at their
+    default value are left out and `__deepcopy__` does not copy them.
+    The state is restored directly into the internal variables, without
+    calling `__init__` or the setters. Since it is positional, it must
+    be loaded by the same class definition. Methods defined in the
+    class take precedence over the generated ones. The option is
+    inherited by subclasses.
+
+    Class constants
+    ===============
+
+    Reading a property on the class returns the property object, not
+    its value. Pass `constants=True` as a class keyword to store the
+    values of the strong readonly properties (with a value) as plain
+    class attributes instead:
+
+    ```python
+    class Limits(PropMixin, constants=True):
+        VarConf = defaults.VarConfAllUnro
+
+        MAX_SIZE = 1024
+
+    Limits.MAX_SIZE # 1024, as fast as any class attribute
+    Limits.MAX_SIZE = 1 # AttributeError
+    ```
+
+    `PropMeta` still refuses to set or delete them on the class (as
+    configured by `readonly` and `undead`) and they are still recorded
+    in `Props`. Instances without a `__dict__` (`slots=True`) can not
+    set them either, but since there is no descriptor, an instance
+    that has a `__dict__` can shadow them with its own attribute. The
+    option is inherited by subclasses.
+
+    Typed properties
+    ================
+
+    Pass `type` (`int`, `float`, `bool` or `bytes`) to `Prop` to pack
+    the value in a compact per instance buffer instead of storing it
+    as an object:
+
+    ```python
+    class Sample(PropMixin, slots=True, init=True):
+        t = Prop(type=int)
+        value = Prop(0.0, type=float)
+        valid = Prop(True, type=bool)
+        tag = Prop(b'    ', type=bytes) # 4 bytes
+
+    s = Sample(1, 0.5)
+    s._value # 0.5, read from the buffer
+    ```
+
+    All the typed properties of an object share one `bytearray`
+    (`_Props_buf_`), created the first time one of them is set; the
+    internal variables (`s._value`) read and write the buffer, thus the
+    generated `__init__`, frozen classes etc. work as usual. `int` is a
+    64 bit signed integer and `bytes` has the size of the default
+    value (shorter values are padded with zero bytes). Reading and
+    writing a typed property costs more than reading an object, in
+    exchange for a much smaller instance (see
+    `benchmarks/bench_typed.py`).
+
+    The buffer of a subclass extends the one of its base class; a
+    class can not inherit typed properties from two unrelated base
+    classes, and typed properties can not be added to a class after it
+    is created.
+
+    Per instance defaults
+    =====================
+
+    The default value of a property is deep copied once at class
+    creation and shared by all the instances that have not set the
+    property, thus changing a mutable default inplace changes it for
+    all of them. Use `default_factory` or `copy_default` to give each
+    instance its own default value instead:
+
+    ```python
+    class Record(PropMixin):
+        items = Prop(default_factory=list)
+        tags = Prop(['new'], copy_default=True)
+    ```
+
+    The default value is built the first time an instance reads the
+    property and stored in its internal variable; instances that never
+    read the property (or set it first) never pay for it.
+
+    Computed properties
+    ===================
+
+    Use `compute` for values derived from the instance that are
+    expensive to build:
+
+    ```python
+    from ocd.prop import Prop, invalidate
+
+    class Pattern(PropMixin, init=True):
+        source = Prop('')
+        regex = Prop(compute=lambda self: re.compile(self.source),
+                     readonly=True)
+
+    p = Pattern('a+')
+    p.regex # compiled now and stored in p._regex
+    p._source = 'b+'
+    invalidate(p, 'regex') # compiled again on the next read
+    ```
+
+    The function is called with the instance the first time the
+    property is read; later reads cost the same as any other property.
+    Computed properties can be readonly (weak) and undead like the
+    others; `invalidate` deletes the internal variables regardless.
+
+    Pass `single_flight=True` (with `compute`, `default_factory` or
+    `copy_default`) when several threads may read the property of the
+    same instance for the first time at once: one of them builds the
+    value while the others wait for it. The lock is only taken when
+    the value is missing, reading a value that is built already costs
+    the same as without the option.
+
+    For values built by coroutines, use `async_compute`; reading the
+    property returns an awaitable:
+
+    ```python
+    class Client(PropMixin):
+        session = Prop(async_compute=open_session, undead=True)
+
+    async def handler(client):
+        session = await client.session
+    ```
+
+    Concurrent readers await the same task and the result is stored
+    in the internal variable (`client._session`). A failure is not
+    stored, the next read tries again. Such properties are always weak
+    readonly, thus the stored value can not be replaced through the
+    property.
+
     Note
     ====
 
@@ -148,4 +512,5 @@ class PropMixin(metaclass=PropMeta):
       without getting converted to property.
 
     """
+    __slots__ = ()
     VarConf = defaults.VarConfNone
@@ -0,0 +1,74 @@
+"""Process wide mode of the package.
+
+In development mode (the default) the readonly and undead restrictions
+of `PropMixin` classes and of the `ocd.unro` containers are enforced
+everywhere. In production mode the code is trusted not to break them,
+thus the checks are compiled away:
+
+* The `ocd.unro` containers and their metaclasses do not override
+  `__setattr__`/`__delattr__`, i.e. they become plain attribute
+  storages.
+* Strong readonly properties become plain class attributes holding
+  their values and the other properties do not check whether they are
+  undead.
+* `PropMeta` does not check whether a property is readonly or undead
+  for the class.
+
+`Prop` objects are `ocd.unro.Unro` objects, thus they are not
+immutable in production mode either.
+
+The mode is chosen once: either set the environment variable
+`OCD_PRODUCTION` (to `1`, `true`, `yes` or `on`) or call
+`set_production()` before importing `ocd.unro`, `ocd.prop` or
+`ocd.mixins`:
+
+```python
+from ocd import mode
+mode.set_production()
+
+from ocd.mixins import PropMixin
+```
+"""
+
+__author__ = 'Md Jahidul Hamid <jahidulhamid@yahoo.com>'
+__copyright__ = 'Copyright © Md Jahidul Hamid <https://github.com/neurobin/>'
+__license__ = '[BSD](http://www.opensource.org/licenses/bsd-license.php)'
+__version__ = '0.0.1'
+
+
+import os
+
+
+ENV_VAR = 'OCD_PRODUCTION'
+
+_TRUE = ('1', 'true', 'yes', 'on')
+
+_production = os.environ.get(ENV_VAR, '').strip().lower() in _TRUE
+_locked = False
+
+
+def set_production(enabled=True):
+    """Choose production mode (or development mode if `enabled` is
+    False) for the process.
+
+    Raises:
+        RuntimeError: if the mode is in use already (some module that
+            depends on it has been imported).
+    """
+    global _production
+    if _locked and bool(enabled) != _production:
+        raise RuntimeError("The mode of 'ocd' can not be changed after it "
+                           "has been used. Call `set_production()` before "
+                           "importing 'ocd.unro', 'ocd.prop' or "
+                           "'ocd.mixins'.")
+    _production = bool(enabled)
+
+
+def is_production():
+    """Return whether production mode is on.
+
+    The mode can not be changed after this is called.
+    """
+    global _locked
+    _locked = True
+    return _production
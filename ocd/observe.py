@@ -0,0 +1,166 @@
+"""Change notifications for the properties of `PropMixin` classes.
+
+Classes created with the `observable=True` class keyword notify the
+hooks subscribed here when a property is set through its setter:
+
+```python
+from ocd import observe
+
+class Point(PropMixin, observable=True):
+    x = Prop(0)
+    y = Prop(0)
+
+def on_change(obj, changes):
+    print(obj, changes) # changes: {property_name: new_value}
+
+observe.subscribe(on_change, Point, 'x')  # property hook
+observe.subscribe(on_change, Point)       # class hook (and subclasses)
+observe.subscribe(on_change)              # global hook
+
+p = Point()
+p.x = 1 # on_change(p, {'x': 1}) once for each hook
+
+with observe.batch():
+    p.x = 2
+    p.y = 3
+    p.x = 4
+# on_change(p, {'x': 4, 'y': 3}) once for each hook
+```
+
+A hook is called once per notification even if it is subscribed
+several times for it. Other classes are not affected: their setters do
+not check for hooks at all.
+
+Notifications are delivered synchronously by default. Call
+`set_queue(queue)` to put them on a queue (anything with `put_nowait`,
+`get_nowait` and `empty`, e.g `queue.Queue` or `asyncio.Queue`) as
+`(hook, obj, changes)` items instead, and `drain(queue)` to deliver the
+pending ones.
+"""
+
+__author__ = 'Md Jahidul Hamid <jahidulhamid@yahoo.com>'
+__copyright__ = 'Copyright © Md Jahidul Hamid <https://github.com/neurobin/>'
+__license__ = '[BSD](http://www.opensource.org/licenses/bsd-license.php)'
+__version__ = '0.0.1'
+
+
+import threading
+from contextlib import contextmanager
+
+
+class _Local(threading.local):
+    # changes collected by `batch` in the current thread:
+    # {id(obj): (obj, {name: value})}
+    pending = None
+
+
+# {None: global hooks, class: class hooks, (class, name): property hooks}
+_hooks = {}
+_queue = None
+_local = _Local()
+
+
+def subscribe(hook, cls=None, name=None):
+    """Call `hook(obj, changes)` when properties are set.
+
+    Args:
+        hook (callable): called with the object and a dict of the
+            changed properties and their new values.
+        cls (class, optional): only for instances of this class (and
+            its subclasses). Defaults to None i.e for all observable
+            classes.
+        name (str, optional): only when this property (of `cls`) is
+            set. Defaults to None i.e for all properties.
+
+    Raises:
+        ValueError: when `name` is given without `cls`.
+    """
+    if name is not None and cls is None:
+        raise ValueError("A property hook needs a class")
+    key = cls if name is None else (cls, name)
+    _hooks.setdefault(key, []).append(hook)
+
+
+def unsubscribe(hook, cls=None, name=None):
+    """Remove a hook added by `subscribe` with the same arguments.
+
+    Raises:
+        ValueError: when the hook is not subscribed.
+    """
+    key = cls if name is None else (cls, name)
+    hooks = _hooks.get(key, [])
+    hooks.remove(hook)
+    if not hooks:
+        del _hooks[key]
+
+
+def set_queue(queue=None):
+    """Put the notifications on `queue` instead of delivering them
+    (`None` to deliver them synchronously again).
+    """
+    global _queue
+    _queue = queue
+
+
+def drain(queue):
+    """Deliver the notifications pending in `queue`. Return how many
+    were delivered.
+    """
+    count = 0
+    while not queue.empty():
+        hook, obj, changes = queue.get_nowait()
+        hook(obj, changes)
+        count += 1
+    return count
+
+
+@contextmanager
+def batch():
+    """Context manager that collects the changes made inside it (in
+    the current thread) and sends one notification per object when the
+    outermost `batch` exits, with the last value set for each property.
+    """
+    if _local.pending is not None:
+        # nested, the outermost batch sends the notifications
+        yield
+        return
+    pending = _local.pending = {}
+    try:
+        yield
+    finally:
+        _local.pending = None
+        for obj, changes in pending.values():
+            _dispatch(obj, changes)
+
+
+def notify(obj, name, value):
+    """Notify the hooks that the property `name` of `obj` is set to
+    `value`. Called by the setters of observable classes.
+    """
+    pending = _local.pending
+    if pending is not None:
+        try:
+            pending[id(obj)][1][name] = value
+        except KeyError:
+            pending[id(obj)] = (obj, {name: value})
+        return
+    if _hooks:
+        _dispatch(obj, {name: value})
+
+
+def _dispatch(obj, changes):
+    hooks = []
+    for klass in type(obj).__mro__:
+        hooks.extend(_hooks.get(klass, ()))
+        for name in changes:
+            hooks.extend(_hooks.get((klass, name), ()))
+    hooks.extend(_hooks.get(None, ()))
+    seen = set()
+    for hook in hooks:
+        if hook in seen:
+            continue
+        seen.add(hook)
+        if _queue is not None:
+            _queue.put_nowait((hook, obj, changes))
+        else:
+            hook(obj, changes)
@@ -13,12 +13,69 @@ __version__ = '0.0.4'
 
 
 from abc import ABCMeta
+from collections import namedtuple
+from collections.abc import Mapping
 from copy import deepcopy
+from copyreg import _slotnames
+from functools import partial
+from itertools import chain, islice, starmap
+from struct import error as StructError, pack
+from types import MemberDescriptorType
+from weakref import WeakKeyDictionary, WeakSet
 
 from ocd import Void
-from ocd.unro import ClassReadonly, Unro
+from ocd.unro import Unro
 from ocd import abc
-
+from ocd import mode
+from ocd import codegen as _codegen
+from ocd.descriptors import (PropDescriptor, ReadonlyWeakPropDescriptor,
+                             ReadonlyPropDescriptor, SlotPropDescriptor,
+                             ReadonlyWeakSlotPropDescriptor,
+                             AsyncPropDescriptor, AsyncSlotPropDescriptor,
+                             _Packed, _PackedBytes, _Default, _Lazy, _Unset,
+                             _CHANGES_VAR, _BITS_VAR, _BUF_VAR,
+                             _BUF_INIT_VAR)
+
+
+# readonly/undead checks are compiled away in production mode (see
+# `ocd.mode`)
+_PRODUCTION = mode.is_production()
+
+# attribute that caches the hash of the instances of frozen classes
+_HASH_VAR = '_Props_hash_'
+
+# class attribute that holds the generated `__eq__`/`__hash__` of frozen
+# classes (see `PropMeta._make_eq_hash`)
+_EQ_VAR = '_Props_eq_'
+
+# {PropMixin class: (fields, row class)} of `ocd.table`, dropped when
+# the properties of the class change
+_layouts = WeakKeyDictionary()
+
+# class attribute that holds the layout of the state of the instances
+# of `compact_state` classes (see `PropMeta._make_state`)
+_STATE_VAR = '_Props_state_'
+
+# Types whose values do not need to be copied (see `_copy_default`)
+_ATOMIC_TYPES = frozenset((type(None), type(Void), bool, int, float, complex,
+                           str, bytes, range, type, type(Ellipsis)))
+
+# `struct` formats of the typed properties (`Prop(type=...)`), `bytes`
+# is sized by the default value
+_STRUCT_FORMATS = {
+    int: 'q',
+    float: 'd',
+    bool: '?',
+}
+
+
+def _copy_default(value):
+    """Return a deep copy of the default value `value`, skipping
+    `deepcopy` for atomic values.
+    """
+    if type(value) in _ATOMIC_TYPES:
+        return value
+    return deepcopy(value)
 
 def make_fget(name, var_name, default=Void):
     """Return a function compatible with `property()` function `fget`
@@ -135,8 +192,79 @@ def make_nofdel(name):
     return fdel
 
 
-class Prop(Unro):
-    """A class that stores configuration for a specific property"""
+# The options of the `Prop` configurations that do not depend on a
+# value: such configurations are interned (see `_PropType`)
+_INTERNED_OPTIONS = frozenset(('readonly', 'undead', 'var_name_prefix',
+                               'var_name_suffix', 'store_default'))
+
+# {keyword arguments as passed: Prop object}
+_interned = {}
+
+# {keyword arguments in name order: Prop object}
+_interned_by_value = {}
+
+# ids of the interned Prop objects (they are never released)
+_interned_ids = set()
+
+
+class _PropType(type(Unro)):
+    """Metaclass of `Prop` that interns the configurations without
+    value. A configuration with a default value and interned options
+    is a copy of the interned one with the value, thus the options are
+    not validated again.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if cls is not Prop or len(args) > 1:
+            return super(_PropType, cls).__call__(*args, **kwargs)
+        if args:
+            value = args[0]
+            if 'value' in kwargs:
+                return super(_PropType, cls).__call__(*args, **kwargs)
+        elif 'value' in kwargs:
+            kwargs = dict(kwargs)
+            value = kwargs.pop('value')
+        else:
+            value = Void
+        if not kwargs:
+            key = ()
+        elif kwargs.keys() <= _INTERNED_OPTIONS:
+            # True and 1 are different options
+            key = (tuple(kwargs.items()), tuple(map(type, kwargs.values())))
+        else:
+            return super(_PropType, cls).__call__(value, **kwargs)
+        try:
+            prop = _interned[key]
+        except KeyError:
+            # validated before it is interned
+            prop = super(_PropType, cls).__call__(**kwargs)
+            by_value = tuple(sorted((name, type(v), v)
+                                    for name, v in kwargs.items()))
+            prop = _interned[key] = _interned_by_value.setdefault(by_value,
+                                                                  prop)
+            _interned_ids.add(id(prop))
+        except TypeError:
+            # unhashable, not a valid option anyway
+            return super(_PropType, cls).__call__(value, **kwargs)
+        if value is Void:
+            return prop
+        # the options are validated already
+        copy = cls.__new__(cls)
+        copy.__dict__.update(prop.__dict__)
+        copy.__dict__['value'] = value
+        return copy
+
+
+class Prop(Unro, metaclass=_PropType):
+    """A class that stores configuration for a specific property
+
+    `Prop` objects are immutable, thus the configurations that do not
+    depend on a value (no default value, factory, compute function or
+    type, only the readonly, undead, var_name_prefix, var_name_suffix
+    and store_default keyword arguments) are interned: `Prop(...)`
+    returns the same object for the same options, e.g all the
+    `Prop(readonly=True)` of all the classes are one object.
+    """
     # readonly options
     RO_FALSE        = 0x0000000
     RO_WEAK         = 0x0000001
@@ -153,7 +281,13 @@ class Prop(Unro):
                  store_default=True,
                  var_name_prefix='_',
                  var_name_suffix='',
-                 undead=False):     # True = UD_CLASS | UD_INSTANCE
+                 undead=False,      # True = UD_CLASS | UD_INSTANCE
+                 default_factory=None,
+                 copy_default=False,
+                 compute=None,
+                 single_flight=False,
+                 async_compute=None,
+                 type=None):
         """Prop constructor that creates property config.
 
         Args:
@@ -184,80 +318,494 @@ class Prop(Unro):
                 UD_INSTANCE: undead for instance object of the class.
                 True: Equvalent to UD_CLASS | UD_INSTANCE
                 False: not undead i.e deletable.
+            default_factory (callable, optional): Called without
+                arguments to build the default value for an instance
+                the first time the instance reads the property. The
+                result is stored in the internal variable of the
+                instance. Can not be used with a default value.
+                Defaults to None.
+            copy_default (bool, optional): Give each instance its own
+                deep copy of the default value, made the first time
+                the instance reads the property (instances that set the
+                property first never pay for the copy). Defaults to
+                False i.e all instances share one copy of the default
+                value made at class creation.
+            compute (callable, optional): Called with the instance to
+                compute the value of the property the first time the
+                instance reads it. The result is stored in the
+                internal variable, thus the next reads cost the same as
+                reading any other property; delete the internal
+                variable (see `invalidate`) to compute it again. Can
+                not be used with a default value, `default_factory` or
+                `copy_default`. A computed property always has an
+                internal variable, thus `readonly=True` makes it weak
+                readonly (and readonly for the class). Defaults to
+                None.
+            single_flight (bool, optional): Make the first read of a
+                `compute`, `default_factory` or `copy_default`
+                property thread safe: when several threads read it at
+                the same time, one of them builds the value and the
+                others wait for it. Only the first read of an instance
+                takes a lock. Defaults to False.
+            async_compute (callable, optional): A coroutine function,
+                called with the instance to compute the value of the
+                property. Reading the property returns an awaitable:
+                the first read starts a task (concurrent readers await
+                the same task) that stores the result in the internal
+                variable, the next reads return the stored value. A
+                failure is not stored, the next read tries again.
+                Requires a running event loop. The property is weak
+                readonly (`readonly=True` adds `RO_CLASS`) and can not
+                be used with a default value, `default_factory`,
+                `copy_default` or `compute`. Defaults to None.
+            type (type, optional): One of `int` (64 bit signed),
+                `float` (double), `bool` and `bytes` (fixed size: the
+                length of the default value). The value is packed in a
+                compact per instance buffer shared by the typed
+                properties of the object instead of being stored as an
+                object. The default value defaults to 0, 0.0 or False
+                (`bytes` requires one). Values that can not be packed
+                raise `struct.error` when set. Can not be used with
+                RO_STRONG, `default_factory`, `copy_default`, `compute`
+                or `async_compute`. Defaults to None.
 
         Raises:
             ValueError: When an argument fails validation check.
         """
-
-        def check_opt(total, opt):
-            return (total & opt) != 0
-
-        self.value = value      # Temporary attribute
+        # Options are validated in local variables and saved all at
+        # once at the end; every attribute assignment goes through
+        # `Unro.__setattr__` otherwise.
         if readonly is True:
-            self.readonly = Prop.RO_STRONG | Prop.RO_CLASS
+            if compute is not None or async_compute is not None:
+                readonly = Prop.RO_WEAK | Prop.RO_CLASS
+            else:
+                readonly = Prop.RO_STRONG | Prop.RO_CLASS
         elif readonly is False:
-            self.readonly = Prop.RO_FALSE
-        elif isinstance(readonly, int):
-            self.readonly = readonly
-        else:
+            readonly = Prop.RO_FALSE
+        elif not isinstance(readonly, int):
             raise ValueError("Invalid value for parameter 'readonly'. "
                              "Check class `Prop` for assistance.")
         if undead is True:
-            self.undead = Prop.UD_CLASS | Prop.UD_INSTANCE
+            undead = Prop.UD_CLASS | Prop.UD_INSTANCE
         elif undead is False:
-            self.undead = Prop.UD_FALSE
-        elif isinstance(undead, int):
-            self.undead = undead
-        else:
+            undead = Prop.UD_FALSE
+        elif not isinstance(undead, int):
             raise ValueError("Invalid value for parameter 'undead'. "
                              "Check class `Prop` for assistance.")
-        self.var_name_prefix = var_name_prefix
-        self.var_name_suffix = var_name_suffix
-        self.store_default = store_default
 
-        if not isinstance(self.var_name_prefix, str) \
-                or not self.var_name_prefix:
+        if not isinstance(var_name_prefix, str) or not var_name_prefix:
             raise ValueError("var_name_prefix needs to be a non empty string")
-        elif self.var_name_prefix.startswith('__'):
+        elif var_name_prefix.startswith('__'):
             raise ValueError("Leading double underscore is not allowed in "
                              "var_name_prefix")
-        elif not self.var_name_prefix.startswith('_'):
+        elif not var_name_prefix.startswith('_'):
             raise ValueError("var_name_prefix must start with a single "
                              "underscore")
 
-        if not isinstance(self.var_name_suffix, str):
+        if not isinstance(var_name_suffix, str):
             raise ValueError("var_name_suffix needs to be a string")
-        elif self.var_name_suffix.endswith('__'):
+        elif var_name_suffix.endswith('__'):
             raise ValueError("Trailing double underscore is not allowed in "
                              "var_name_suffix")
 
-        self.is_readonly = check_opt(self.readonly, Prop.RO_STRONG)
-        self.is_readonly_weak = check_opt(self.readonly, Prop.RO_WEAK)
-        self.is_readonly_for_class = check_opt(self.readonly, Prop.RO_CLASS)
-        self.is_undead_for_instance = check_opt(self.undead, Prop.UD_INSTANCE)
-        self.is_undead_for_class = check_opt(self.undead, Prop.UD_CLASS)
-
-        if self.is_readonly_weak and self.is_readonly:
+        is_readonly = (readonly & Prop.RO_STRONG) != 0
+        is_readonly_weak = (readonly & Prop.RO_WEAK) != 0
+        if is_readonly_weak and is_readonly:
             raise ValueError("RO_WEAK and RO_STRONG can not be True at the "
                              "same time. It's either weak or strong not both")
 
+        copy_default = bool(copy_default)
+        if default_factory is not None:
+            if not callable(default_factory):
+                raise ValueError("default_factory needs to be a callable")
+            if value is not Void:
+                raise ValueError("default_factory can not be used with a "
+                                 "default value")
+            if copy_default:
+                raise ValueError("default_factory and copy_default can not "
+                                 "be used together")
+        if (default_factory is not None or copy_default) and is_readonly:
+            raise ValueError("default_factory and copy_default require an "
+                             "internal variable, they can not be used with "
+                             "RO_STRONG")
+        if compute is not None:
+            if not callable(compute):
+                raise ValueError("compute needs to be a callable")
+            if value is not Void or default_factory is not None \
+                    or copy_default:
+                raise ValueError("compute can not be used with a default "
+                                 "value, default_factory or copy_default")
+            if is_readonly:
+                raise ValueError("compute requires an internal variable, it "
+                                 "can not be used with RO_STRONG")
+        if async_compute is not None:
+            if not callable(async_compute):
+                raise ValueError("async_compute needs to be a callable")
+            if value is not Void or default_factory is not None \
+                    or copy_default or compute is not None:
+                raise ValueError("async_compute can not be used with a "
+                                 "default value, default_factory, "
+                                 "copy_default or compute")
+            if is_readonly:
+                raise ValueError("async_compute requires an internal "
+                                 "variable, it can not be used with "
+                                 "RO_STRONG")
+            # the awaited value can only be set through the internal
+            # variable
+            readonly |= Prop.RO_WEAK
+            is_readonly_weak = True
+        struct_format = None
+        if type is not None:
+            if type not in _STRUCT_FORMATS and type is not bytes:
+                raise ValueError("type needs to be int, float, bool or "
+                                 "bytes")
+            if is_readonly or default_factory is not None or copy_default \
+                    or compute is not None or async_compute is not None:
+                raise ValueError("type can not be used with RO_STRONG, "
+                                 "default_factory, copy_default, compute or "
+                                 "async_compute")
+            if type is bytes:
+                if not isinstance(value, bytes):
+                    raise ValueError("type bytes needs a bytes default "
+                                     "value, its length is the size of the "
+                                     "property")
+                struct_format = '%ds' % (len(value),)
+            else:
+                struct_format = _STRUCT_FORMATS[type]
+                if value is Void:
+                    value = type()
+            try:
+                pack('<' + struct_format, value)
+            except StructError as e:
+                raise ValueError("Invalid default value for type %s: %s"
+                                 % (type.__name__, e,)) from None
+        single_flight = bool(single_flight)
+        if single_flight and compute is None and default_factory is None \
+                and not copy_default:
+            raise ValueError("single_flight requires compute, "
+                             "default_factory or copy_default")
+
+        self.__dict__.update({
+            'value': value,     # Temporary attribute
+            'readonly': readonly,
+            'undead': undead,
+            'var_name_prefix': var_name_prefix,
+            'var_name_suffix': var_name_suffix,
+            'store_default': store_default,
+            'is_readonly': is_readonly,
+            'is_readonly_weak': is_readonly_weak,
+            'is_readonly_for_class': (readonly & Prop.RO_CLASS) != 0,
+            'is_undead_for_instance': (undead & Prop.UD_INSTANCE) != 0,
+            'is_undead_for_class': (undead & Prop.UD_CLASS) != 0,
+            'default_factory': default_factory,
+            'copy_default': copy_default,
+            'compute': compute,
+            'single_flight': single_flight,
+            'async_compute': async_compute,
+            'type': type,
+            'struct_format': struct_format,
+        })
+
+    # Interned `Prop` objects are shared by all the classes that use
+    # their configuration, thus they can not be changed at all: unlike
+    # `Unro`, not even a new attribute can be set. These checks are
+    # kept in production mode (see `ocd.unro._strip_checks`).
+    def __setattr__(self, name, value):
+        if id(self) in _interned_ids:
+            raise AttributeError("Interned %r objects are immutable, "
+                                 "attribute '%s' can not be set"
+                                 % (self.__class__, name,))
+        super(Prop, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if id(self) in _interned_ids:
+            raise AttributeError("Interned %r objects are immutable, "
+                                 "attribute '%s' can not be deleted"
+                                 % (self.__class__, name,))
+        super(Prop, self).__delattr__(name)
+
+
+PropRecord = namedtuple('PropRecord', ('key', 'default', 'conf', 'var_name'))
+PropRecord.__doc__ = """Metadata of a property in `Props`.
+
+`key` is the name of the property, `default` its default value, `conf`
+its `Prop` object and `var_name` its internal variable name. A field
+the property does not have (`default` when `Prop.store_default` is
+False, `var_name` when there is no internal variable) is `Void`.
+"""
+
+
+def _is_name_only(var_conf_class):
+    """Tell whether the `get_conf` method of the `VarConf` class
+    `var_conf_class` depends on the name only, i.e the class that
+    defines `get_conf` sets `name_only` (see `ocd.abc.VarConf`).
+    """
+    for klass in var_conf_class.__mro__:
+        if 'get_conf' in klass.__dict__:
+            return klass.__dict__.get('name_only', False) is True
+    return False
+
+
+def _make_record(name, p, val, var_name):
+    """Return the `PropRecord` of the property `name` with the
+    configuration `p`, the default value `val` and the internal
+    variable name `var_name` (`None` if there is none).
+    """
+    return PropRecord(name, val if p.store_default else Void, p,
+                      Void if var_name is None else var_name)
+
+
+class _PropsView(object):
+    """Readonly view of one field of the `Props` table, with the
+    property names as attributes (e.g `Props.Keys`).
+
+    It is iterable (the property names) and sized.
+    """
+    __slots__ = ('_table', '_field', '_title')
+
+    def __init__(self, table, field, title):
+        object.__setattr__(self, '_table', table)
+        # index of the field in `PropRecord`
+        object.__setattr__(self, '_field', PropRecord._fields.index(field))
+        object.__setattr__(self, '_title', title)
+
+    def __repr__(self):
+        return '<Props.%s %r>' % (self._title, list(self))
+
+    def __getattr__(self, name):
+        try:
+            value = self._table[name][self._field]
+        except KeyError:
+            value = Void
+        if value is Void:
+            raise AttributeError("'%s' has no property '%s'"
+                                 % (self._title, name,))
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'%s' is readonly, property '%s' can not be set"
+                             % (self._title, name,))
+
+    def __delattr__(self, name):
+        raise AttributeError("'%s' is readonly, property '%s' can not be "
+                             "deleted" % (self._title, name,))
+
+    def __iter__(self):
+        field = self._field
+        return (k for k, record in self._table.items()
+                if record[field] is not Void)
+
+    def __len__(self):
+        return sum(1 for k in self)
+
+    def __contains__(self, name):
+        record = self._table.get(name)
+        return record is not None and record[self._field] is not Void
+
+    def __dir__(self):
+        return list(self)
+
+
+class _PropsRawView(_PropsView):
+    """Writable view of one field of the `Props` table (e.g
+    `Props._Keys`).
+
+    A field can be set just once (unless deleted); it is not meant to
+    be used outside of `PropMeta`.
+    """
+    __slots__ = ()
+
+    def _replace(self, record, value):
+        return record._replace(**{PropRecord._fields[self._field]: value})
+
+    def __setattr__(self, name, value):
+        record = self._table.get(name, PropRecord(Void, Void, Void, Void))
+        if record[self._field] is not Void:
+            raise AttributeError("'%s' allows setting one attribute just "
+                                 "once." % (self._title,))
+        self._table[name] = self._replace(record, value)
+
+    def __delattr__(self, name):
+        record = self._table.get(name)
+        if record is None or record[self._field] is Void:
+            raise AttributeError(name)
+        record = self._replace(record, Void)
+        if record == (Void, Void, Void, Void):
+            del self._table[name]
+        else:
+            self._table[name] = record
+
+
+class _View(object):
+    """Non-data descriptor that creates a view of a `_Props` object
+    on first access and stores it in the object.
+    """
+    __slots__ = ('attr', 'view_class', 'field', 'title')
+
+    def __init__(self, attr, view_class, field, title):
+        self.attr = attr
+        self.view_class = view_class
+        self.field = field
+        self.title = title
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        view = self.view_class(obj._table, self.field, self.title)
+        obj.__dict__[self.attr] = view
+        return view
+
 
 class _Props():
-    """Store information of class properties"""
-
-    def __init__(self):
-        class Keys(ClassReadonly): pass
-        class Defaults(ClassReadonly): pass
-        class Conf(ClassReadonly): pass
-        class Ivan(ClassReadonly): pass
-        self._Keys_Internal_Var = Keys()
-        self._Defaults_Internal_Var = Defaults()
-        self._Conf_Internal_Var = Conf()
-        self._Ivan_Internal_Var = Ivan()
-        self._Keys = Keys
-        self._Defaults = Defaults
-        self._Conf = Conf
-        self._Ivan = Ivan
+    """Store information of class properties.
+
+    The information is kept in a single table: a dict that maps the
+    property names to `PropRecord` objects, in definition order.
+    `Keys`, `Defaults`, `Conf` and `Ivan` are views of a field of the
+    table, created on first access. Iterating over a `_Props` object
+    gives the records.
+
+    `All` is a `_Props` object for the merged index of the properties
+    of the class and its bases (see `PropMeta._merge_index`).
+
+    `getter` and `setter` return functions that read or write several
+    properties of an instance at once.
+    """
+
+    def __init__(self, options=None, table=None, index=None, owner=None):
+        """Args:
+            options (dict, optional): class options (see
+                `PropMeta.__new__`).
+            table (dict, optional): `{name: PropRecord}` for the
+                properties of the class. The dict is used as it is.
+            index (dict, optional): `{name: PropRecord}` for all the
+                properties of the class, inherited ones included. If
+                not given, `table` is the index itself.
+            owner (class, optional): the class.
+        """
+        options = dict(options or ())
+        # set all at once, `__setattr__` allows setting them just once
+        # anyway
+        self.__dict__.update({
+            '_options': options,
+            '_table': {} if table is None else table,
+            '_All_Internal_Var': (self if index is None
+                                  else _Props(options, index, owner=owner)),
+            '_owner': owner,
+            # names in the index of any subclass of the owner (see
+            # `PropMeta._publish_index`)
+            '_sub_names': set(),
+            # (VarConf class, VarConf object, memo) of
+            # `PropMeta._runtime_conf`
+            '_var_conf': None,
+        })
+
+    def __iter__(self):
+        return iter(self._table.values())
+
+    def __len__(self):
+        return len(self._table)
+
+    def __contains__(self, name):
+        return name in self._table
+
+    def get(self, name, default=None):
+        """Return the `PropRecord` of the property `name` (`default` if
+        there is no such property).
+        """
+        return self._table.get(name, default)
+
+    def getter(self, *names):
+        """Return a function that reads the properties `names` (of the
+        class, inherited ones included) of an instance at once, like
+        `operator.attrgetter`:
+
+        ```python
+        get = MyClass.Props.getter('a', 'b', 'c')
+        a, b, c = get(obj)
+        ```
+
+        The values are read from the internal variables directly; if
+        one is missing (e.g an empty slot) they are all read through
+        the properties instead, thus the result is the same. Objects of
+        a subclass that reads the properties from other internal
+        variables (e.g it overrides them) are read through the
+        properties too (checked once per subclass).
+
+        Raises:
+            AttributeError: if a name is not a property of the class.
+        """
+        owner = self._owner
+        fast = _bulk_getter_attrs(self.All, names)
+        if owner is None:
+            return _codegen.make_bulk_getter(fast, names)
+        direct = WeakKeyDictionary()
+        def check(klass):
+            try:
+                return direct[klass]
+            except KeyError:
+                pass
+            try:
+                same = _bulk_getter_attrs(klass.Props.All, names) == fast
+            except AttributeError:
+                # not a property of `klass` anymore
+                same = False
+            direct[klass] = same
+            return same
+        return _codegen.make_bulk_getter(
+            fast, names, '%s.Props.getter' % (owner.__qualname__,),
+            owner, check)
+
+    def setter(self, *names):
+        """Return a function that sets the properties `names` (of the
+        class, inherited ones included) of an instance at once, the
+        counterpart of `getter`:
+
+        ```python
+        set_abc = MyClass.Props.setter('a', 'b', 'c')
+        set_abc(obj, (1, 2, 3))
+        set_abc(dst, get_abc(src))
+        ```
+
+        The readonly rules are checked once, when the setter is
+        created (and once per subclass whose objects it sets). The
+        values are written to the internal variables directly, except
+        in `observable` and `track_changes` classes where they go
+        through the property setters.
+
+        Raises:
+            AttributeError: if a name is not a property of the class or
+                the property is readonly.
+        """
+        owner = self._owner
+        attrs = _bulk_setter_attrs(owner, names)
+        checked = WeakSet()
+        def check(klass):
+            if klass in checked:
+                return
+            if not issubclass(klass, owner) \
+                    or _bulk_setter_attrs(klass, names) != attrs:
+                raise TypeError("This setter of %r can not set the "
+                                "properties of %r objects, use "
+                                "`%s.Props.setter`"
+                                % (owner, klass, klass.__name__,))
+            checked.add(klass)
+        return _codegen.make_bulk_setter(
+            attrs, owner, check,
+            qualname='%s.Props.setter' % (owner.__qualname__,))
+
+    _Keys = _View('_Keys', _PropsRawView, 'key', 'Keys')
+    _Defaults = _View('_Defaults', _PropsRawView, 'default', 'Defaults')
+    _Conf = _View('_Conf', _PropsRawView, 'conf', 'Conf')
+    _Ivan = _View('_Ivan', _PropsRawView, 'var_name', 'Ivan')
+    _Keys_Internal_Var = _View('_Keys_Internal_Var', _PropsView, 'key',
+                               'Keys')
+    _Defaults_Internal_Var = _View('_Defaults_Internal_Var', _PropsView,
+                                   'default', 'Defaults')
+    _Conf_Internal_Var = _View('_Conf_Internal_Var', _PropsView, 'conf',
+                               'Conf')
+    _Ivan_Internal_Var = _View('_Ivan_Internal_Var', _PropsView, 'var_name',
+                               'Ivan')
 
     def __setattr__(self, name, value):
         # print("\nsetattr %r, %s" % (self, name,))
@@ -265,10 +813,11 @@ class _Props():
         # variable), it would be possible to change it.
         ks = ['_Keys', '_Defaults', '_Conf', '_Ivan', '_Keys_Internal_Var',
               '_Defaults_Internal_Var', '_Conf_Internal_Var',
-              '_Ivan_Internal_Var']
+              '_Ivan_Internal_Var', '_All_Internal_Var', '_options',
+              '_table', '_owner']
         if name in ks:
-            # make singleton
-            if name in self.__dict__:
+            # make singleton (views are always set)
+            if name in self.__dict__ or name in _Props.__dict__:
                 raise AttributeError("Attribute '%s' is reserved by %r. "
                                      "It can not be set."
                                      % (name, self.__class__,))
@@ -282,7 +831,8 @@ class _Props():
         # variable), it would be possible to change it.
         ks = ['_Keys', '_Defaults', '_Conf', '_Ivan', '_Keys_Internal_Var',
               '_Defaults_Internal_Var', '_Conf_Internal_Var',
-              '_Ivan_Internal_Var']
+              '_Ivan_Internal_Var', '_All_Internal_Var', '_options',
+              '_table', '_owner']
         if name in ks:
             raise AttributeError("Attribute '%s' is reserved by %r. It can "
                                  "not be deleted." % (name, self.__class__,))
@@ -316,6 +866,13 @@ class _Props():
                         ' accessible by attribute with same name. See details'
                         ' in doc for `Props`.')
 
+    All = property(fget=make_fget('All', '_All_Internal_Var'),
+                   fset=make_nofset('All'),
+                   fdel=make_nofdel('All'),
+                   doc='Stores the information of all the properties of the '
+                       'class, inherited ones included. See details in doc '
+                       'for `Props`.')
+
     # Convenience aliases
     K = Keys
     D = Defaults
@@ -372,8 +929,122 @@ class PropMeta(ABCMeta):
 
                      `Props.Ivan.author_name` will return the name of the
                      internal variable for `author_name` property as `str`.
+
+                     Records
+                     =======
+                     The information is stored in a single table of
+                     `PropRecord` objects. Iterating over `Props` gives the
+                     records of the properties defined in the class (in
+                     definition order) and `Props.get('author_name')` returns
+                     one. `Keys`, `Defaults`, `Conf` and `Ivan` are views of
+                     the table: iterating over them gives the names of the
+                     properties that have the corresponding field.
+
+                     All
+                     ===
+                     The same information for all the properties of the
+                     class, inherited ones included (the nearest definition
+                     wins). `Props.All.Conf.author_name` returns the `Prop`
+                     object of `author_name` whichever base class defines
+                     it. The index is merged at class creation and kept up
+                     to date when properties are added or deleted later.
                      """)
 
+    def from_rows(self, rows, columns=None, chunk_size=None):
+        """Return an iterator of objects of the class built from `rows`
+        (tuples or dicts, e.g CSV, JSON lines or database rows), one
+        object per row, lazily:
+
+        ```python
+        for trade in Trade.from_rows(csv.reader(f), ('symbol', 'price')):
+            ...
+        for batch in Trade.from_rows(cursor, chunk_size=1000):
+            session.add_all(batch)
+        ```
+
+        The objects are created without the arguments of `__init__` (a
+        user defined `__init__` is not called) and the values are
+        written to the internal variables directly, like the generated
+        `__init__` does: the setters are not called (no validation,
+        notification or change tracking) and the properties that are
+        not in a row keep their default values.
+
+        Args:
+            rows (iterable): tuples (or any sequence) or dicts (any
+                mapping), all of the same kind.
+            columns (sequence or mapping, optional): for tuple rows, the
+                property names of the values of a row, in order (`None`
+                skips a value); for dict rows, `{key: property_name}`
+                (other keys are ignored). Defaults to the properties
+                with internal variables (`Props.All` order) for tuple
+                rows, which then have one value per property, and to
+                the property names themselves for dict rows.
+            chunk_size (int, optional): yield lists of (at most)
+                `chunk_size` objects instead of single objects.
+
+        Raises:
+            AttributeError: if a column is not a property of the class
+                or the property does not have an internal variable.
+            ValueError: if `chunk_size` is not positive.
+
+        A tuple row that does not have one value per column raises
+        `ValueError` when its object is built (with the default columns
+        and a generated `__init__`, the row is passed as its positional
+        arguments: too many values raise `TypeError` and missing ones
+        keep their default values).
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be positive, got %r"
+                             % (chunk_size,))
+        rows = iter(rows)
+        if columns is None:
+            first = next(rows, _MISSING)
+            if first is _MISSING:
+                return iter(())
+            rows = chain((first,), rows)
+            fields = self._init_fields()
+            names = [var_name for k, var_name in fields]
+            keys = ([k for k, var_name in fields]
+                    if isinstance(first, Mapping) else None)
+        else:
+            if isinstance(columns, Mapping):
+                keys = list(columns)
+                columns = list(columns.values())
+            else:
+                keys = None
+            index = self.Props.All
+            names = []
+            for column in columns:
+                if column is None and keys is None:
+                    names.append(None)
+                    continue
+                record = _bulk_records(index, (column,))[0]
+                if record.var_name is Void:
+                    raise AttributeError("Property '%s' of %r does not have "
+                                         "an internal variable"
+                                         % (column, self,))
+                names.append(record.var_name)
+        generated = self.Props._options.get('init')
+        if generated and keys is None and names == [
+                var_name for k, var_name
+                in _codegen.init_parameters(self._init_fields())]:
+            # the values are the positional arguments of the generated
+            # `__init__`
+            objects = starmap(self, rows)
+        else:
+            if generated or self.__init__ is object.__init__:
+                # calling the class is faster than `__new__` and such
+                # `__init__` does nothing without arguments
+                new = self
+            else:
+                new = partial(self.__new__, self)
+            build = _codegen.make_row_builder(
+                new, names, keys, '%s.from_rows' % (self.__qualname__,))
+            objects = map(build, rows)
+        if chunk_size is None:
+            return objects
+        return _chunks(objects, chunk_size)
+
     def __delattr__(self, name):
         # if we keep this name in a single place (somewhere in some
         # variable), it would be possible to change it.
@@ -381,168 +1052,314 @@ class PropMeta(ABCMeta):
             raise AttributeError("'%s' is reserved by %r as an internal "
                                  "variable name. It can not be deleted."
                                  % (name, self.__class__,))
-        try:
-            isProp = getattr(self.Props.Conf, name)
-            # ^returns None or Prop()
-            # if None, then it's not a property
-        except:
-            isProp = None
-        if isProp:
-            if isProp.is_undead_for_class:
+        record = self.Props.get(name)
+        if record is not None and record.conf:
+            if record.conf.is_undead_for_class and not _PRODUCTION:
                 raise AttributeError("Property '%s' is not deletable by %r"
                                      % (name, self,))
-            delattr(self.Props._Keys, name)
-            delattr(self.Props._Conf, name)
-            if hasattr(self.Props._Defaults, name):
-                delattr(self.Props._Defaults, name)
-            # unlike others internal variable is not always available:
-            if hasattr(self.Props._Ivan, name):
-                delattr(self.Props._Ivan, name)
+            self._drop_fallback(self.__dict__.get(name))
+            del self.Props._table[name]
         super(PropMeta, self).__delattr__(name)
+        if not name.startswith('_'):
+            self._refresh_index()
 
     def __setattr__(self, name, value):
-        # if we keep this name in a single place (somewhere in some
-        # variable), it would be possible to change it.
-        if name == '_Props_':
-            if name in self.__dict__:
+        if name.startswith('_'):
+            # if we keep this name in a single place (somewhere in some
+            # variable), it would be possible to change it.
+            if name == '_Props_' and name in self.__dict__:
                 raise AttributeError("'%s' is reserved by %r as an internal "
                                      "variable name."
                                      % (name, self.__class__,))
-            else:
-                super(PropMeta, self).__setattr__(name, value)
-        else:
-            reserved = ['VarConf',]
-            if name in reserved:
-                raise AttributeError("Attribute name '%s' is reserved by %r."
-                                     % (name, self.__class__,))
-            if not name.startswith('_'):
-                try:
-                    prop = getattr(self.Props.Conf, name, None)
-                except:
-                    prop = None
-                if isinstance(prop, Prop):
-                    # trying to overwrite a Prop() definition itself.
-                    # should we allow it?
-                    # ...
-                    # !!?
-                    # give option: check whether it should be allowed
-                    # or not
-                    if prop.is_readonly_for_class:
-                        raise AttributeError("Property '%s' is readonly for "
-                                             "%r" % (name, self,))
-
-                if not isinstance(value, Prop):
-                    val = value
-                    p = self._get_var_conf(name, value)
-                    if p:
-                        # returned a Prop, this one needs to be
-                        # converted to property
-                        value = p
-                else:
-                    # value is Prop
-                    val = value.value
-
-                # now value is OK for final processing
-                if isinstance(value, Prop):
-                    # print("Creating property '%s' for class '%r'"
-                    #       % (name, self))
-                    (This_Prop,
-                     Defaults_Prop,
-                     Keys_Prop,
-                     Ivan_Prop,
-                     Conf_Prop) = self._makePropProperties(name, value, val)
-                    super(PropMeta, self).__setattr__(name, This_Prop)
-                    setattr(self.Props._Conf, name, Conf_Prop)
-                    setattr(self.Props._Keys, name, Keys_Prop)
-                    if Defaults_Prop:
-                        setattr(self.Props._Defaults, name, Defaults_Prop)
-                    # unlike others internal variable is not always
-                    # available:
-                    if Ivan_Prop:
-                        setattr(self.Props._Ivan, name, Ivan_Prop)
-                else:
-                    super(PropMeta, self).__setattr__(name, value)
-            else:
-                super(PropMeta, self).__setattr__(name, value)
-
-
-    def _makePropProperties(self, n, p, val):
-        """Return a tuple of all property objects"""
-        var_name = ''.join([p.var_name_prefix, n, p.var_name_suffix])
-
-        nofset = make_nofset(n)
-
-        if not p.is_undead_for_instance:
-            # name nfdel comes from fdel only on name (n)
-            nfdel = make_fdel(n)
-            main_property_fdel = make_fdel(n, var_name)
-        else:
-            nfdel = make_nofdel(n)
-            main_property_fdel = nfdel
-
-        dfget = make_fget_const(n, val) # used more than once
-        Conf_Prop = property(fget=make_fget_const(n, p), fset=nofset,
-                             fdel=nfdel)
-        Keys_Prop = property(fget=make_fget_const(n, n), fset=nofset,
-                             fdel=nfdel)
-        if p.store_default:
-            Defaults_Prop = property(fget=dfget, fset=nofset, fdel=nfdel)
+            super(PropMeta, self).__setattr__(name, value)
+            return
+        if name == 'VarConf':
+            raise AttributeError("Attribute name '%s' is reserved by %r."
+                                 % (name, self.__class__,))
+        props = self.Props
+        record = props._table.get(name)
+        if record is not None and record.conf.is_readonly_for_class \
+                and not _PRODUCTION:
+            # trying to overwrite a Prop() definition itself.
+            raise AttributeError("Property '%s' is readonly for %r"
+                                 % (name, self,))
+        if isinstance(value, Prop):
+            p, val = value, value.value
         else:
-            Defaults_Prop = None
-        Ivan_Prop = None
-        # default value is always readonly ^:
-        # it does not make sense to change default value later as it
-        # will have no effect because value will act on its own
-        # deepcopy version.
-
+            p, val = self._runtime_conf(props, name, value), value
+        if p is None:
+            if record is not None:
+                self._drop_fallback(self.__dict__.get(name))
+            super(PropMeta, self).__setattr__(name, value)
+            # a plain attribute only changes the index when it
+            # overrides a property
+            if record is not None or name in props.All._table \
+                    or name in props._sub_names:
+                self._refresh_index()
+            return
+        if p.type is not None:
+            # existing instances have their buffers already
+            raise TypeError("Typed property '%s' can not be added "
+                            "to %r after the class is created"
+                            % (name, self,))
+        if record is not None and record.conf is p \
+                and self._update_default(record, val):
+            return
+        options = props._options
+        if not options.get('frozen') and not p.is_readonly:
+            frozen = self._frozen_subclass()
+            if frozen is not None:
+                raise TypeError("Property '%s' of %r would be a writable "
+                                "property of frozen class %r"
+                                % (name, self, frozen,))
+        This_Prop, var_name = self._make_descriptor(
+            name, p, val, options.get('codegen', False),
+            frozen=options.get('frozen', False),
+            observable=options.get('observable', False),
+            track=options.get('track_changes', False),
+            constants=options.get('constants', False))
+        old = self.__dict__.get(name)
+        super(PropMeta, self).__setattr__(name, This_Prop)
+        if var_name is not None:
+            This_Prop.__set_name__(self, name, old)
+        props._table[name] = _make_record(name, p, val, var_name)
+        self._refresh_index()
+
+    def _drop_fallback(self, descriptor):
+        """Remove the class level fallback of the internal variable of
+        `descriptor` (a property being removed), if it is still there:
+        an attribute the class defines itself is kept.
+        """
+        fallback = getattr(descriptor, 'fallback', Void)
+        if fallback is not Void \
+                and self.__dict__.get(descriptor.var_name) is fallback:
+            type.__delattr__(self, descriptor.var_name)
+
+    def _runtime_conf(self, props, name, value):
+        """Return the `Prop` configuration of the class attribute
+        `name` set to `value` at runtime, or `None` for a plain
+        attribute. `props` is the `Props` object of the class.
+
+        The `VarConf` object is kept in `props` (until `VarConf`
+        changes) and, if its `get_conf` depends on the name only (see
+        `ocd.abc.VarConf.name_only`), so are the results per name.
+        """
+        VarConf = self.VarConf
+        cached = props._var_conf
+        if cached is None or cached[0] is not VarConf:
+            var_conf = PropMeta._new_var_conf(VarConf)
+            cached = (VarConf, var_conf,
+                      {} if _is_name_only(type(var_conf)) else None)
+            props.__dict__['_var_conf'] = cached
+        memo = cached[2]
+        if memo is None:
+            return PropMeta._call_var_conf(cached[1], name, value)
+        try:
+            return memo[name]
+        except KeyError:
+            p = memo[name] = PropMeta._call_var_conf(cached[1], name, value)
+            return p
+
+    def _frozen_subclass(self):
+        """Return a frozen subclass of the class (`None` if there is
+        none).
+        """
+        stack = type.__subclasses__(self)
+        while stack:
+            klass = stack.pop()
+            props = klass.__dict__.get('_Props_')
+            if isinstance(props, _Props) and props._options.get('frozen'):
+                return klass
+            stack.extend(type.__subclasses__(klass))
+        return None
+
+    def _publish_index(self):
+        """Add the names of the index of the class to the `_sub_names`
+        of its base classes, thus a base class can tell whether a
+        plain attribute assigned to it may change the index of a
+        subclass without walking them. The names are never removed;
+        a stale name only costs an unneeded refresh.
+        """
+        names = self.Props.All._table.keys()
+        for klass in self.__mro__[1:]:
+            props = klass.__dict__.get('_Props_')
+            if isinstance(props, _Props):
+                props._sub_names.update(names)
+
+    def _update_default(self, record, val):
+        """Change the default value of the existing property of
+        `record` to `val` in place: the descriptor keeps its accessors
+        and only the records of the index are replaced. Return False
+        (nothing done) if the descriptor can not be updated this way,
+        i.e the default is baked in its accessors (slots, constants),
+        built per instance (factory, compute) or removed, or the class
+        defines the internal variable itself.
+        """
+        name = record.key
+        descriptor = self.__dict__.get(name)
+        if type(descriptor) not in (PropDescriptor,
+                                    ReadonlyWeakPropDescriptor) \
+                or val is Void or descriptor.factory is not None \
+                or descriptor.compute is not None:
+            return False
+        p = record.conf
+        if p.copy_default:
+            # the descriptor would be built with a factory
+            return False
+        var_name = descriptor.var_name
+        if self.__dict__.get(var_name) is not descriptor.fallback:
+            # the class defines the internal variable itself
+            return False
+        descriptor.default = _copy_default(val)
+        descriptor.fallback = fallback = descriptor._fallback()
+        type.__setattr__(self, var_name, fallback)
+        new = _make_record(name, p, val, var_name)
+        self.Props._table[name] = new
+        stack = [self]
+        while stack:
+            klass = stack.pop()
+            stack.extend(type.__subclasses__(klass))
+            props = klass.__dict__.get('_Props_')
+            if isinstance(props, _Props):
+                index = props.All._table
+                if index.get(name) is record:
+                    index[name] = new
+        return True
+
+    def _make_descriptor(self, n, p, val, codegen=False, slotted=True,
+                         frozen=False, observable=False, track=False,
+                         constants=False):
+        """Return the descriptor of the property `n` and its internal
+        variable name (`None` if there is no internal variable).
+
+        `codegen` is the class option and `slotted` tells whether any
+        class in the MRO has `__slots__` (no need to look for a slot
+        member otherwise).
+
+        In a `frozen` class the properties are weak readonly and undead
+        for instance objects (only their internal variables can be
+        set). In an `observable` class the setters notify the hooks of
+        `ocd.observe`, with `track` they record the change (see
+        `changed`).
+
+        In production mode, or with `constants`, a strong readonly
+        property with a value is returned as the value itself (a plain
+        class attribute). In production mode the properties are not
+        undead either.
+        """
+        undead = (p.is_undead_for_instance or frozen) and not _PRODUCTION
         # main property configuration
         if p.is_readonly:
+            if (_PRODUCTION or constants) and val is not Void:
+                return val, None
             # constant value, no internal vars
-            fset = nofset
-            fget = dfget
-            fdel = nfdel
-        elif p.is_readonly_weak:
-            # value can not be set through property but internal var
-            # thus value is not constant.
-            fset = nofset
-            fget = make_fget(n, var_name, deepcopy(val))
-            fdel = main_property_fdel
-            # save the internal var name in Ivan
-            Ivan_Prop = property(fget=make_fget_const(n, var_name),
-                                 fset=nofset, fdel=nfdel)
-        else:
-            fset = make_fset(n, var_name)
-            fget = make_fget(n, var_name, deepcopy(val))
-            fdel = main_property_fdel
-            # save the internal var name in Ivan
-            Ivan_Prop = property(fget=make_fget_const(n, var_name),
-                                 fset=nofset, fdel=nfdel)
+            This_Prop = ReadonlyPropDescriptor(n, val, undead,
+                                               codegen=codegen)
+            return This_Prop, None
 
-        This_Prop = property(fget=fget, fset=fset, fdel=fdel)
-        return This_Prop, Defaults_Prop, Keys_Prop, Ivan_Prop, Conf_Prop
+        # value can not be set through property for weak readonly
+        # but internal var, thus value is not constant.
+        var_name = ''.join([p.var_name_prefix, n, p.var_name_suffix])
+        factory = p.default_factory
+        if factory is None and p.copy_default and val is not Void:
+            factory = partial(deepcopy, val)
+        # with a factory, the default is built per instance when needed
+        default = val if factory is not None else _copy_default(val)
+        compute = p.compute
+        # the internal variable of a typed property is a `_Packed`
+        # descriptor (see `_make_packed`)
+        member = (self._find_slot(var_name)
+                  if slotted or p.type is not None else None)
+        if p.async_compute is not None:
+            compute = p.async_compute
+        if p.type is not None:
+            # the packed accessors are not generated
+            codegen = False
+        elif isinstance(member, _Packed):
+            if var_name in self.__dict__:
+                # the packed value and its default would not follow `p`
+                raise TypeError("Typed property '%s' of %r can not be "
+                                "redefined without its type"
+                                % (n, self,))
+            # a subclass shadows the inherited packed value with its
+            # own internal variable (see `PropDescriptor.__set_name__`)
+            member = None
+        if member is not None:
+            if p.async_compute is not None:
+                descriptor_class = AsyncSlotPropDescriptor
+            elif p.is_readonly_weak or frozen:
+                descriptor_class = ReadonlyWeakSlotPropDescriptor
+            else:
+                descriptor_class = SlotPropDescriptor
+            This_Prop = descriptor_class(n, var_name, member, default,
+                                         undead, codegen=codegen,
+                                         factory=factory, compute=compute,
+                                         single_flight=p.single_flight,
+                                         observe=observable, track=track)
+        else:
+            if p.async_compute is not None:
+                descriptor_class = AsyncPropDescriptor
+            elif p.is_readonly_weak or frozen:
+                descriptor_class = ReadonlyWeakPropDescriptor
+            else:
+                descriptor_class = PropDescriptor
+            This_Prop = descriptor_class(n, var_name, default,
+                                         undead, codegen=codegen,
+                                         factory=factory, compute=compute,
+                                         single_flight=p.single_flight,
+                                         observe=observable, track=track)
+        return This_Prop, var_name
+
+    def _find_slot(self, var_name):
+        """Return the `__slots__` member descriptor (or `_Packed`
+        descriptor) for `var_name` or `None` if the internal variable
+        is not a slot.
+        """
+        for klass in self.__mro__:
+            if var_name in klass.__dict__:
+                member = klass.__dict__[var_name]
+                if isinstance(member, (MemberDescriptorType, _Packed)):
+                    return member
+                return None
+        return None
 
     def _get_var_conf(self, name, value):
+        """Either return Prop object or None"""
+        return PropMeta._query_var_conf(self.VarConf, name, value)
+
+    @staticmethod
+    def _query_var_conf(VarConf, name, value):
         """Either return Prop object or None"""
         # print("\nchecking var_conf for "+name)
+        return PropMeta._call_var_conf(PropMeta._new_var_conf(VarConf),
+                                       name, value)
+
+    @staticmethod
+    def _new_var_conf(VarConf):
+        """Return a `VarConf` object for the `VarConf` class"""
         try:
-            var_conf = self.VarConf()
+            var_conf = VarConf()
         except:
             raise TypeError("'VarConf' is a reserved attribute name. It must "
                             "be a class that inherits and implements "
                             "`ocd.abc.VarConf`.")
-        if isinstance(var_conf, abc.VarConf): # must do this check
+        if not isinstance(var_conf, abc.VarConf): # must do this check
             # because if some other class implementation provide
             # get_conf method with name/value arg,
             # we do not want to accept unknown entities.
-            try:
-                p = var_conf.get_conf(name, value)
-            except:
-                raise TypeError("Bad implementation of `VarConf` class. See "
-                                "`ocd.abc.VarConf`")
-        else:
             raise TypeError("'VarConf' is a reserved attribute name. It must "
                             "be a class that inherits and implements "
                             "`ocd.abc.VarConf`.")
+        return var_conf
+
+    @staticmethod
+    def _call_var_conf(var_conf, name, value):
+        """Either return Prop object or None"""
+        try:
+            p = var_conf.get_conf(name, value)
+        except:
+            raise TypeError("Bad implementation of `VarConf` class. See "
+                            "`ocd.abc.VarConf`")
         assert p is None or isinstance(p, Prop), "return value from "\
                                                  "'get_conf' in class "\
                                                  "'VarConf' inside class "\
@@ -550,28 +1367,741 @@ class PropMeta(ABCMeta):
                                                  "return `None` or a `Prop`"\
                                                  " object. See example in "\
                                                  "`ocd.abc.VarConf`"\
-                                                 % (self.__class__,)
+                                                 % (PropMeta,)
         return p
 
+    @staticmethod
+    def _find_attr(bases, attrs, name):
+        """Return the attribute `name` of a class that is not created
+        yet (or `None` if not found).
+        """
+        if name in attrs:
+            return attrs[name]
+        for base in bases:
+            for klass in base.__mro__:
+                if name in klass.__dict__:
+                    return klass.__dict__[name]
+        return None
+
+    @staticmethod
+    def _classify(VarConf, attrs):
+        """Return `(name, prop, value)` for each attribute in `attrs`
+        that needs to be converted to property, in definition order.
+
+        Only one `VarConf` object is created for all the attributes
+        (and none if there is no attribute to ask it for).
+        """
+        var_conf = None
+        props = []
+        for k, v in attrs.items():
+            if k.startswith('_') or k == 'VarConf':
+                continue
+            if isinstance(v, Prop):
+                props.append((k, v, v.value))
+                continue
+            if var_conf is None:
+                var_conf = PropMeta._new_var_conf(VarConf)
+            p = PropMeta._call_var_conf(var_conf, k, v)
+            if p is not None:
+                props.append((k, p, v))
+        return props
+
+    @staticmethod
+    def _make_slots(bases, attrs, props, weakref, extra=()):
+        """Return the `__slots__` for a new class: the internal
+        variable names of the properties `props` (see `_classify`)
+        defined in `attrs` and the `extra` names (and `__weakref__` if
+        `weakref` is True) that are not provided by `bases` yet.
+        """
+        slots = list(attrs.get('__slots__', ()))
+        for name in extra:
+            if not isinstance(PropMeta._find_attr(bases, attrs, name),
+                              MemberDescriptorType):
+                slots.append(name)
+        for k, p, val in props:
+            if p.is_readonly or p.type is not None:
+                # there is no internal variable (or it is packed)
+                continue
+            var_name = ''.join([p.var_name_prefix, k, p.var_name_suffix])
+            if var_name in attrs or var_name in slots \
+                    or isinstance(PropMeta._find_attr(bases, attrs, var_name),
+                                  MemberDescriptorType):
+                continue
+            slots.append(var_name)
+        if weakref and '__weakref__' not in slots \
+                and not any(base.__weakrefoffset__ for base in bases):
+            slots.append('__weakref__')
+        return tuple(slots)
+
     # def __init__(cls, name, bases, attrs):
     #     super(PropMeta, cls).__init__(name, bases, attrs)
 
-    def __new__(mcs, class_name, bases, attrs):
+    @staticmethod
+    def _inherit_options(bases, **options):
+        """Return `options` where the ones that are `None` are
+        replaced by the options of the nearest `PropMeta` base class
+        (`False` if there is none).
+        """
+        inherited = {}
+        for base in reversed(bases):
+            if isinstance(base, PropMeta):
+                inherited.update(base.Props._options)
+        return dict((k, inherited.get(k, False) if v is None else v)
+                    for k, v in options.items())
+
+    @staticmethod
+    def _check_frozen_bases(class_name, bases):
+        """Raise `TypeError` if a base class of the frozen class
+        `class_name` is not frozen and has properties with internal
+        variables: they would stay writable, yet be part of the
+        cached hash.
+        """
+        for base in bases:
+            if isinstance(base, PropMeta) \
+                    and not base.Props._options.get('frozen') \
+                    and any(record.var_name is not Void
+                            for record in base.Props.All):
+                raise TypeError("Frozen class '%s' can not inherit the "
+                                "writable properties of non frozen class "
+                                "%r" % (class_name, base,))
+
+    def _init_fields(self):
+        """Return `(property_name, internal_variable_name)` pairs of
+        all the properties of the class (including inherited ones) that
+        have an internal variable.
+        """
+        return [(record.key, record.var_name)
+                for record in self.Props.All
+                if record.var_name is not Void]
+
+    def _merge_index(self):
+        """Return `{name: PropRecord}` for all the properties of the
+        class, inherited ones included, in the order they were first
+        defined along the MRO (bases first).
+
+        The nearest definition of a name wins, thus a property that is
+        overridden by a plain attribute is not in the index.
+        """
+        bases = self.__bases__
+        if len(bases) == 1 and isinstance(bases[0], PropMeta):
+            # single inheritance: the MRO is the class followed by the
+            # MRO of the base, thus the index of the base is merged
+            # already.
+            index = dict(bases[0].Props.All._table)
+            mro = (self,)
+        else:
+            index = {}
+            mro = reversed(self.__mro__)
+        for klass in mro:
+            attrs = klass.__dict__
+            props = attrs.get('_Props_')
+            table = props._table if isinstance(props, _Props) else {}
+            if index:
+                for name in index.keys() & attrs.keys():
+                    if name not in table:
+                        del index[name]
+            index.update(table)
+        return index
+
+    def _refresh_index(self):
+        """Merge the index of the class and its subclasses again (after
+        a runtime change of the class attributes).
+        """
+        stack = [self]
+        while stack:
+            klass = stack.pop()
+            stack.extend(type.__subclasses__(klass))
+            props = klass.__dict__.get('_Props_')
+            if isinstance(props, _Props):
+                index = props.All._table
+                index.clear()
+                index.update(klass._merge_index())
+                klass._publish_index()
+                _layouts.pop(klass, None)
+                if props._options.get('track_changes'):
+                    type.__setattr__(klass, _BITS_VAR, klass._track_bits())
+                if props._options.get('frozen'):
+                    klass._make_eq_hash()
+                if props._options.get('compact_state'):
+                    klass._make_state()
+
+    def _make_eq_hash(self, attrs=None):
+        """Install the `__eq__`/`__hash__` of a `frozen` class over the
+        properties that have internal variables, again when the
+        properties change. Methods defined in `attrs` (the class body)
+        or replaced since they were installed are not overridden.
+
+        Async computed properties are left out: reading them returns a
+        new awaitable each time, not their value.
+        """
+        names = [record.key for record in self.Props.All
+                 if record.var_name is not Void
+                 and getattr(record.conf, 'async_compute', None) is None]
+        eq, hash_ = _codegen.make_eq_hash(names, _HASH_VAR,
+                                          self.__qualname__)
+        methods = {'__eq__': eq, '__hash__': hash_}
+        old = self.__dict__.get(_EQ_VAR)
+        set_attr = super(PropMeta, self).__setattr__
+        for name, method in methods.items():
+            if attrs is not None:
+                if name in attrs:
+                    continue
+            elif old is None or self.__dict__.get(name) is not old[name]:
+                continue
+            set_attr(name, method)
+        set_attr(_EQ_VAR, methods)
+
+    def _make_state(self, attrs=None):
+        """Install the pickle/copy methods of a `compact_state` class
+        and the layout of the state (`_Props_state_`), again when the
+        properties change. Methods defined in `attrs` (the class body)
+        or replaced since they were installed are not overridden.
+        """
+        fields, buf_index = self._state_layout()
+        getstate, setstate, reduce_ex = _codegen.make_state(
+            [(name, member is not None) for name, member in fields],
+            self.__dictoffset__ != 0, _getstate, _setstate,
+            hash_var=_HASH_VAR if self.Props._options['frozen'] else None,
+            buf_var=_BUF_VAR, qualname=self.__qualname__)
+        methods = {
+            '__getstate__': getstate,
+            '__setstate__': setstate,
+            '__reduce_ex__': reduce_ex,
+            '__copy__': _copy,
+            '__deepcopy__': _deepcopy,
+        }
+        old = self.__dict__.get(_STATE_VAR)
+        set_attr = super(PropMeta, self).__setattr__
+        for name, method in methods.items():
+            if attrs is not None:
+                if name in attrs:
+                    continue
+            elif old is None or self.__dict__.get(name) is not old[2][name]:
+                continue
+            set_attr(name, method)
+        set_attr(_STATE_VAR, (fields, buf_index, methods))
+
+    def _state_layout(self):
+        """Return `(fields, buf_index)` for the state of the instances
+        (see `_getstate`): `fields` is a list of `(name, member)` for
+        the internal variables of the properties (inherited ones
+        included, except the packed ones of typed properties) followed
+        by the other `__slots__` of the class and the buffer of the
+        typed properties and the change mask, `member` being the slot
+        member descriptor or `None` for the instance `__dict__`.
+        `buf_index` is the position of the buffer of the typed
+        properties in `fields` (`None` if there is none).
+        """
+        fields = []
+        seen = set()
+        for k, var_name in self._init_fields():
+            member = self._find_slot(var_name)
+            if not isinstance(member, _Packed):
+                fields.append((var_name, member))
+                seen.add(var_name)
+        skip = seen | {'__dict__', '__weakref__', _HASH_VAR}
+        for klass in reversed(self.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            for name in ((slots,) if isinstance(slots, str) else slots):
+                if name.startswith('__') and not name.endswith('__'):
+                    name = '_%s%s' % (klass.__name__.lstrip('_'), name,)
+                if name not in skip:
+                    skip.add(name)
+                    fields.append((name, klass.__dict__[name]))
+        # the other internal attributes, in the instance __dict__ unless
+        # they are slots
+        if hasattr(self, _BUF_INIT_VAR) and _BUF_VAR not in skip:
+            fields.append((_BUF_VAR, None))
+        if hasattr(self, _BITS_VAR) and _CHANGES_VAR not in skip:
+            fields.append((_CHANGES_VAR, None))
+        buf_index = None
+        for i, (name, member) in enumerate(fields):
+            if name == _BUF_VAR:
+                buf_index = i
+        return fields, buf_index
+
+    def _make_packed(self, props):
+        """Install the `_Packed` internal variables of the typed
+        properties in `props` (see `_classify`) and the initial buffer
+        of the class: the one of the base class (if any) followed by
+        the default values of the typed properties of the class.
+
+        Raises:
+            TypeError: when more than one base class has typed
+                properties (their buffers would overlap).
+        """
+        owners = []
+        for klass in self.__mro__[1:]:
+            if _BUF_INIT_VAR in klass.__dict__ \
+                    and not any(issubclass(owner, klass) for owner in owners):
+                owners.append(klass)
+        if len(owners) > 1:
+            raise TypeError("%r can not inherit typed properties from more "
+                            "than one base class: %s"
+                            % (self, ', '.join(o.__name__ for o in owners),))
+        typed = [(k, p, val) for k, p, val in props if p.type is not None]
+        if not typed:
+            return
+        init = bytearray(owners[0].__dict__[_BUF_INIT_VAR] if owners else b'')
+        set_attr = super(PropMeta, self).__setattr__
+        for k, p, val in typed:
+            packed_class = _PackedBytes if p.type is bytes else _Packed
+            var_name = ''.join([p.var_name_prefix, k, p.var_name_suffix])
+            set_attr(var_name, packed_class(k, p.struct_format, len(init),
+                                            val))
+            init += pack('<' + p.struct_format, val)
+        set_attr(_BUF_INIT_VAR, bytes(init))
+
+    def _track_bits(self):
+        """Return `{property_name: bit}` for the change tracking
+        bitmask of the instances: the bit of a property is its position
+        in `Props.All`. Bits already assigned to the class are kept,
+        thus the masks of existing instances stay valid.
+        """
+        bits = dict(self.__dict__.get(_BITS_VAR, ()))
+        for name in self.Props.All._table:
+            if name not in bits:
+                bits[name] = 1 << len(bits)
+        return bits
+
+    def __new__(mcs, class_name, bases, attrs, slots=False, weakref=False,
+                codegen=None, init=None, frozen=None, observable=None,
+                track_changes=None, compact_state=None, constants=None,
+                **kwargs):
+        """Create a new class.
+
+        Args:
+            slots (bool, optional): Generate `__slots__` for the
+                internal variables of the properties defined in the
+                class, so that the instances do not need a `__dict__`
+                for them. Defaults to False.
+            weakref (bool, optional): Add a `__weakref__` slot when
+                `slots` is True. Defaults to False.
+            codegen (bool, optional): Use accessors generated by
+                `ocd.codegen` for the properties. Inherited from base
+                classes when not given.
+            init (bool, optional): Generate an `__init__` that accepts
+                the properties (that have internal variables) as
+                arguments, unless the class defines its own
+                `__init__`. Inherited from base classes when not
+                given.
+            frozen (bool, optional): Make the properties readonly and
+                undead for instance objects (they can be set through
+                their internal variables, e.g by the generated
+                `__init__`) and generate `__eq__` and `__hash__` (with
+                cached hash) over the values of the properties that
+                have internal variables (async computed ones excepted),
+                unless the class defines them. A frozen class can not
+                inherit properties with internal variables from a non
+                frozen class (`TypeError`). Inherited from base classes
+                when not given.
+            observable (bool, optional): Make the property setters
+                notify the hooks of `ocd.observe`. Inherited from base
+                classes when not given.
+            track_changes (bool, optional): Make the property setters
+                record which properties are set in a per instance
+                bitmask (see `changed`). Inherited from base classes
+                when not given.
+            compact_state (bool, optional): Generate `__reduce_ex__`,
+                `__getstate__`, `__setstate__`, `__copy__` and
+                `__deepcopy__` that work on a positional state of the
+                internal variables that are set, unless the class
+                defines them. Inherited from base classes when not
+                given.
+            constants (bool, optional): Store the values of the strong
+                readonly properties that have a value as plain class
+                attributes instead of descriptors, thus reading them
+                on the class returns the value. They stay readonly and
+                undead for the class; instances can only set them if
+                they have a `__dict__`. Inherited from base classes
+                when not given.
+            kwargs: passed to `__init_subclass__`.
+        """
         rserved_attrs = ['Props', '_Props_']
         for K in rserved_attrs:
             if K in attrs:
                 raise AttributeError("'%s' is a reserved attribute for class"
                                      "'%s' defined in '%r'. Please do not "
                                      "redefine it." % (K, class_name, mcs,))
-        cls = super(PropMeta, mcs).__new__(mcs, class_name, bases, attrs)
-        cls._Props_ = _Props()
-        # prop_candidates = {}
-        non_candidates = ['VarConf']
-        for k in attrs:
-            if k.startswith('_') or k in non_candidates:
-                pass
-            else:
-                # print("\n" + k)
-                setattr(cls, k, attrs[k])
-
+        if weakref and not slots:
+            raise TypeError("'weakref' requires 'slots' to be True")
+        options = mcs._inherit_options(bases, codegen=codegen, init=init,
+                                       frozen=frozen, observable=observable,
+                                       track_changes=track_changes,
+                                       compact_state=compact_state,
+                                       constants=constants)
+        if options['frozen']:
+            mcs._check_frozen_bases(class_name, bases)
+        if slots:
+            # __slots__ needs to be known before the class is created
+            props = mcs._classify(mcs._find_attr(bases, attrs, 'VarConf'),
+                                  attrs)
+            attrs = dict(attrs)
+            extra = []
+            if options['frozen']:
+                extra.append(_HASH_VAR)
+            if options['track_changes']:
+                extra.append(_CHANGES_VAR)
+            if any(p.type is not None for k, p, val in props):
+                extra.append(_BUF_VAR)
+            attrs['__slots__'] = mcs._make_slots(bases, attrs, props,
+                                                 weakref, extra)
+        cls = super(PropMeta, mcs).__new__(mcs, class_name, bases, attrs,
+                                           **kwargs)
+        if not slots:
+            props = mcs._classify(cls.VarConf, attrs)
+        if '__init__' in attrs:
+            # user defined __init__ takes precedence
+            options['init'] = False
+        # Single pass: the properties are installed directly and
+        # recorded in the `Props` table instead of going through
+        # `__setattr__` for each of them.
+        table = {}
+        index = {}
+        cls._Props_ = _Props(options, table, index, owner=cls)
+        codegen = options['codegen']
+        frozen = options['frozen']
+        observable = options['observable']
+        track = options['track_changes']
+        constants = options['constants']
+        slotted = any(klass.__dict__.get('__slots__')
+                      for klass in cls.__mro__)
+        set_attr = super(PropMeta, cls).__setattr__
+        cls._make_packed(props)
+        for k, p, val in props:
+            This_Prop, var_name = cls._make_descriptor(k, p, val, codegen,
+                                                       slotted, frozen,
+                                                       observable, track,
+                                                       constants)
+            set_attr(k, This_Prop)
+            if var_name is not None:
+                This_Prop.__set_name__(cls, k)
+            table[k] = _make_record(k, p, val, var_name)
+        index.update(cls._merge_index())
+        cls._publish_index()
+        if track:
+            set_attr(_BITS_VAR, cls._track_bits())
+
+        if options['init']:
+            cls.__init__ = _codegen.make_init(cls._init_fields(),
+                                              '%s.__init__'
+                                              % (cls.__qualname__,))
+        if frozen:
+            cls._make_eq_hash(attrs)
+            if not options['compact_state'] and '__getstate__' not in attrs:
+                # the cached hash is left out of the default state
+                set_attr('__getstate__', _frozen_getstate)
+        if options['compact_state']:
+            cls._make_state(attrs)
         return cls
+
+
+_MISSING = object()
+
+
+def _getstate(self):
+    """General `__getstate__` of `compact_state` classes (see
+    `ocd.codegen.make_state` for the common case).
+
+    The state is `[mask, values]`, or `[mask, values, extra]` when the
+    instance `__dict__` has other attributes: bit `i` of `mask` is set
+    when the field `i` of the layout of the class (see
+    `PropMeta._state_layout`) has a value, and `values` has the values
+    of those fields in order. Properties that are not set (i.e at
+    their default value) are left out, so is the cached hash of frozen
+    instances.
+    """
+    fields, buf_index, methods = type(self)._Props_state_
+    d = getattr(self, '__dict__', None)
+    mask = 0
+    values = []
+    for i, (name, member) in enumerate(fields):
+        if member is None:
+            if d is None:
+                continue
+            value = d.get(name, _MISSING)
+            if value is _MISSING:
+                continue
+        else:
+            try:
+                value = member.__get__(self)
+            except AttributeError:
+                # empty slot
+                continue
+        if i == buf_index:
+            # immutable copy of the buffer of the typed properties
+            value = bytes(value)
+        mask |= 1 << i
+        values.append(value)
+    if d:
+        known = set(name for name, member in fields)
+        extra = dict((k, v) for k, v in d.items()
+                     if k not in known and k != _HASH_VAR)
+        if extra:
+            return [mask, tuple(values), extra]
+    return [mask, tuple(values)]
+
+
+def _setstate(self, state):
+    """General `__setstate__` of `compact_state` classes: writes the
+    state of `_getstate` to the internal variables directly (not
+    through the property setters).
+    """
+    fields, buf_index, methods = type(self)._Props_state_
+    mask, values = state[0], state[1]
+    d = getattr(self, '__dict__', None)
+    values = iter(values)
+    for i, (name, member) in enumerate(fields):
+        if not mask >> i & 1:
+            continue
+        value = next(values)
+        if i == buf_index:
+            value = bytearray(value)
+        if member is None:
+            d[name] = value
+        else:
+            member.__set__(self, value)
+    if len(state) > 2:
+        d.update(state[2])
+
+
+def _copy(self):
+    """`__copy__` of `compact_state` classes."""
+    cls = type(self)
+    new = cls.__new__(cls)
+    new.__setstate__(self.__getstate__())
+    return new
+
+
+def _deepcopy(self, memo):
+    """`__deepcopy__` of `compact_state` classes: only the values
+    that are set are copied (atomic values are not), the defaults stay
+    shared with the class.
+    """
+    cls = type(self)
+    new = cls.__new__(cls)
+    memo[id(self)] = new
+    state = self.__getstate__()
+    if state.__class__ is tuple:
+        state = tuple(value if type(value) in _ATOMIC_TYPES
+                      else deepcopy(value, memo) for value in state)
+    else:
+        state[1] = tuple(value if type(value) in _ATOMIC_TYPES
+                         else deepcopy(value, memo) for value in state[1])
+        if len(state) > 2:
+            state[2] = deepcopy(state[2], memo)
+    new.__setstate__(state)
+    return new
+
+
+def _frozen_getstate(self):
+    """`__getstate__` of frozen classes (without `compact_state`): the
+    default state, without the cached hash. Str hashes are randomized
+    per process, thus the hash must be computed again by the process
+    that loads the object.
+    """
+    d = getattr(self, '__dict__', None)
+    if d is not None and _HASH_VAR in d:
+        d = dict(d)
+        del d[_HASH_VAR]
+    slots = {}
+    for name in _slotnames(type(self)):
+        if name == _HASH_VAR:
+            continue
+        try:
+            slots[name] = getattr(self, name)
+        except AttributeError:
+            # empty slot
+            pass
+    if slots:
+        return d or None, slots
+    return d or None
+
+
+def _bulk_records(index, names):
+    """Return the records of the properties `names` in `index`."""
+    if not names:
+        raise ValueError("No property name given")
+    records = []
+    for name in names:
+        record = index.get(name)
+        if record is None:
+            raise AttributeError("'%s' is not a property of %r"
+                                 % (name, index._owner,))
+        records.append(record)
+    return records
+
+
+def _chunks(iterator, size):
+    """Yield lists of (at most) `size` items of `iterator`."""
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bulk_getter_attrs(index, names):
+    """Return the attribute names a bulk getter of the properties
+    `names` in `index` reads (see `_Props.getter`).
+
+    Raises:
+        AttributeError: if a name is not a property in `index`.
+    """
+    attrs = []
+    for record in _bulk_records(index, names):
+        if record.var_name is Void \
+                or getattr(record.conf, 'async_compute', None) is not None:
+            # constant, or the property returns an awaitable
+            attrs.append(record.key)
+        else:
+            attrs.append(record.var_name)
+    return attrs
+
+
+def _bulk_setter_attrs(cls, names):
+    """Return the attribute names a bulk setter of the properties
+    `names` of `cls` writes (see `_Props.setter`).
+
+    Raises:
+        AttributeError: if a name is not a property of `cls` or the
+            property is readonly for instances.
+    """
+    options = cls.Props._options
+    frozen = options.get('frozen', False)
+    direct = not (options.get('observable', False)
+                  or options.get('track_changes', False))
+    attrs = []
+    for record in _bulk_records(cls.Props.All, names):
+        conf = record.conf
+        if conf.is_readonly or conf.is_readonly_weak or frozen:
+            raise AttributeError("'%s' is a readonly property for %r "
+                                 "objects" % (record.key, cls,))
+        attrs.append(record.var_name if direct else record.key)
+    return attrs
+
+
+def _is_computed(conf):
+    return getattr(conf, 'compute', None) is not None \
+        or getattr(conf, 'async_compute', None) is not None
+
+
+def invalidate(obj, *names):
+    """Forget the values of the computed properties `names` of `obj`
+    (see `Prop(compute=...)` and `Prop(async_compute=...)`), thus they
+    are computed again the next time they are read.
+
+    The internal variables are deleted directly, thus it works for
+    undead and readonly computed properties too. Without `names`, all
+    the computed properties of `obj` are invalidated.
+
+    Raises:
+        ValueError: if a name is not a computed property of `obj`.
+    """
+    index = type(obj).Props.All
+    if not names:
+        names = [record.key for record in index
+                 if _is_computed(record.conf)]
+    for name in names:
+        record = index.get(name)
+        if record is None or not _is_computed(record.conf):
+            raise ValueError("'%s' is not a computed property of %r"
+                             % (name, type(obj),))
+        try:
+            object.__delattr__(obj, record.var_name)
+        except AttributeError:
+            # not computed yet
+            pass
+
+
+def changed(obj):
+    """Return the names of the properties of `obj` set through their
+    setters since the object was created or `clear_changes` was called
+    (for classes created with `track_changes=True`), in the order of
+    `Props.All`.
+    """
+    mask = getattr(obj, _CHANGES_VAR, 0)
+    if not mask:
+        return []
+    return [name for name, bit in getattr(type(obj), _BITS_VAR, {}).items()
+            if mask & bit]
+
+
+def clear_changes(obj):
+    """Forget the changes recorded for `obj` (see `changed`)."""
+    try:
+        object.__delattr__(obj, _CHANGES_VAR)
+    except AttributeError:
+        # nothing recorded
+        pass
+
+
+def snapshot(obj):
+    """Return `{property_name: value}` for the properties of `obj` that
+    have internal variables, to be compared later by `diff_since`.
+
+    Values that are not built yet (`compute`, `default_factory`) are
+    not included and are not built either.
+    """
+    cls = type(obj)
+    values = {}
+    for record in cls.Props.All:
+        if record.var_name is Void:
+            continue
+        value = _stored_value(obj, cls, record)
+        if value is not _MISSING:
+            values[record.key] = value
+    return values
+
+
+def _stored_value(obj, cls, record):
+    """Return the value of the internal variable of the property of
+    `record` for `obj` (of class `cls`), or the default value if it is
+    not set, without building it: `_MISSING` if there is none or it is
+    built per instance.
+
+    The internal variable is read from the instance `__dict__` or the
+    slot member, not through the class level fallbacks that build the
+    values (see `ocd.descriptors`).
+    """
+    var_name = record.var_name
+    member = cls._find_slot(var_name)
+    if member is not None:
+        try:
+            return member.__get__(obj, cls)
+        except AttributeError:
+            # empty slot
+            pass
+    else:
+        d = getattr(obj, '__dict__', None)
+        if d is not None and var_name in d:
+            return d[var_name]
+        for klass in cls.__mro__:
+            if var_name in klass.__dict__:
+                fallback = klass.__dict__[var_name]
+                if isinstance(fallback, _Default):
+                    return fallback.value
+                if isinstance(fallback, (_Lazy, _Unset)):
+                    return _MISSING
+                return fallback
+        return _MISSING
+    conf = record.conf
+    if conf.default_factory is not None or conf.copy_default \
+            or _is_computed(conf) or record.default is Void:
+        return _MISSING
+    return record.default
+
+
+def diff_since(obj, snapshot):
+    """Return `{property_name: value}` for the properties of `obj`
+    whose value is not the one in `snapshot` (see `snapshot`).
+
+    Only the properties recorded by `changed` are compared, thus
+    `clear_changes` must not be called after the snapshot is taken.
+    """
+    diff = {}
+    for name in changed(obj):
+        value = getattr(obj, name)
+        if name not in snapshot or snapshot[name] != value:
+            diff[name] = value
+    return diff
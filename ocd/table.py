@@ -0,0 +1,557 @@
+"""Columnar storage for the records of a `PropMixin` class.
+
+A `PropTable` keeps the values of many records of a class as one
+column per property instead of one object per record:
+
+```python
+from ocd.table import PropTable
+
+class Trade(PropMixin):
+    VarConf = defaults.VarConfAll
+
+    symbol = ''
+    price = 0.0
+    qty = 0
+
+trades = PropTable(Trade)
+trades.append(symbol='X', price=1.5, qty=10)
+trades.extend(Trade() for _ in range(3)) # objects or dicts
+
+trades[0].price             # row view
+trades.column('qty')        # array('q', [10, 0, 0, 0])
+big = trades.filter(lambda row: row.qty > 5)
+```
+
+The columns of `int` and `float` properties (according to their
+default values) are `array.array` objects, the others are lists. With
+`backend='numpy'` the numeric columns are NumPy arrays instead, thus
+`column()` returns arrays that can be used in vectorized expressions
+and `filter()` accepts boolean arrays.
+
+`export_columns` builds the same columns from a sequence of objects of
+the class, reading the internal variables directly, one column at a
+time:
+
+```python
+columns = export_columns(Trade, trades, ['price', 'qty'])
+memoryview(columns['qty'])  # format 'q', no copy
+for chunk in export_columns(Trade, stream, chunk_size=10000):
+    ...                     # {name: column} for 10000 objects
+```
+
+Only the properties with internal variables are stored; strong readonly
+properties are constants of the class and computed properties are
+derived from an object, thus they are left out (rows read the
+constants from the class). Row views follow the rules of the
+properties: readonly ones can not be set, undead ones can not be
+deleted and deleting the others resets them to their default value.
+"""
+
+__author__ = 'Md Jahidul Hamid <jahidulhamid@yahoo.com>'
+__copyright__ = 'Copyright © Md Jahidul Hamid <https://github.com/neurobin/>'
+__license__ = '[BSD](http://www.opensource.org/licenses/bsd-license.php)'
+__version__ = '0.0.1'
+
+
+from array import array
+from collections.abc import Sequence
+from copy import deepcopy
+from itertools import compress, islice
+from operator import attrgetter
+
+from ocd import Void
+from ocd.prop import _is_computed, _bulk_records, _layouts
+
+
+# typecodes of the numeric columns of the 'array' backend
+_TYPECODES = {
+    int: 'q',
+    float: 'd',
+}
+
+# dtypes of the numeric columns of the 'numpy' backend
+_DTYPES = {
+    'q': 'int64',
+    'd': 'float64',
+}
+
+
+class _Field(object):
+    """A column (or class constant) of a table."""
+    __slots__ = ('name', 'default', 'conf', 'typecode', 'stored',
+                 'readonly', 'undead')
+
+    def __init__(self, record, frozen):
+        conf = record.conf
+        self.name = record.key
+        self.default = record.default
+        self.conf = conf
+        self.stored = record.var_name is not Void
+        self.typecode = _TYPECODES.get(type(record.default))
+        self.readonly = frozen or conf.is_readonly or conf.is_readonly_weak
+        self.undead = frozen or conf.is_undead_for_instance
+
+    @property
+    def has_default(self):
+        return self.conf.default_factory is not None \
+            or self.default is not Void
+
+    def make_default(self):
+        conf = self.conf
+        if conf.default_factory is not None:
+            return conf.default_factory()
+        if self.default is Void:
+            raise ValueError("Property '%s' does not have a default value"
+                             % (self.name,))
+        if conf.copy_default:
+            return deepcopy(self.default)
+        return self.default
+
+
+def _make_row_property(field, index):
+    name = field.name
+    if not field.stored:
+        value = field.default
+        def fget(row):
+            return value
+        def fset(row, value):
+            raise AttributeError("'%s' is a readonly property for %r"
+                                 % (name, row,))
+        def fdel(row):
+            raise AttributeError("Constant readonly property '%s' can not "
+                                 "be deleted by %r" % (name, row,))
+        return property(fget, fset, fdel)
+
+    def fget(row):
+        return row._table._columns[index][row._index]
+    if field.readonly:
+        def fset(row, value):
+            raise AttributeError("'%s' is a readonly property for %r"
+                                 % (name, row,))
+    elif field.typecode is not None:
+        typecode = field.typecode
+        def fset(row, value):
+            # checked like an array item, NumPy would truncate a float
+            # for an int column
+            row._table._columns[index][row._index] = _numeric(typecode,
+                                                              value)
+    else:
+        def fset(row, value):
+            row._table._columns[index][row._index] = value
+    if field.undead:
+        def fdel(row):
+            raise AttributeError("Property '%s' is not deletable by %r"
+                                 % (name, row,))
+    elif not field.has_default:
+        def fdel(row):
+            raise AttributeError("Property '%s' does not have a default "
+                                 "value to reset %r to" % (name, row,))
+    else:
+        def fdel(row):
+            row._table._columns[index][row._index] = field.make_default()
+    return property(fget, fset, fdel)
+
+
+def _layout(cls):
+    """Return `(fields, row_class)` for the `PropMixin` class `cls`:
+    the stored fields (in `Props.All` order) and the class of the row
+    views, built once per class (again when its properties change, see
+    `PropMeta._refresh_index`).
+    """
+    try:
+        return _layouts[cls]
+    except KeyError:
+        pass
+    frozen = cls.Props._options.get('frozen', False)
+    fields = []
+    attrs = {'__slots__': ()}
+    for record in cls.Props.All:
+        if _is_computed(record.conf):
+            continue
+        field = _Field(record, frozen)
+        if field.stored:
+            attrs[field.name] = _make_row_property(field, len(fields))
+            fields.append(field)
+        else:
+            attrs[field.name] = _make_row_property(field, None)
+    row_class = type('%sRow' % (cls.__name__,), (Row,), attrs)
+    _layouts[cls] = layout = (tuple(fields), row_class)
+    return layout
+
+
+class Row(object):
+    """View of a row of a `PropTable`. The properties of the row are
+    read from and written to the columns of the table.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __repr__(self):
+        return '<%s %d of %r>' % (type(self).__name__, self._index,
+                                  self._table,)
+
+    def as_dict(self):
+        """Return `{property_name: value}` for the stored properties."""
+        index = self._index
+        return dict((field.name, column[index]) for field, column
+                    in zip(self._table._fields, self._table._columns))
+
+
+class PropTable(object):
+    """Columnar container of records of the `PropMixin` class `cls`.
+
+    Args:
+        cls (PropMixin subclass): the class whose `Props.All` gives the
+            columns.
+        rows (iterable, optional): initial rows (see `extend`).
+        backend (str, optional): 'array' (default) for `array.array`
+            numeric columns or 'numpy' for NumPy arrays.
+
+    Raises:
+        ValueError: when the backend is unknown.
+        ImportError: when the 'numpy' backend is chosen but NumPy is
+            not installed.
+    """
+
+    def __init__(self, cls, rows=(), backend='array'):
+        if backend not in ('array', 'numpy'):
+            raise ValueError("Unknown backend: %r" % (backend,))
+        if backend == 'numpy':
+            import numpy
+            self._numpy = numpy
+        else:
+            self._numpy = None
+        self.cls = cls
+        self.backend = backend
+        self._fields, self._row_class = _layout(cls)
+        self._size = 0
+        self._columns = [self._new_column(field, ())
+                         for field in self._fields]
+        self.extend(rows)
+
+    def _new_column(self, field, values):
+        if field.typecode is None:
+            return list(values)
+        if self._numpy is not None:
+            return _numpy_column(self._numpy, field.typecode, values)
+        return array(field.typecode, values)
+
+    def _reserve(self, size):
+        """Make room for `size` rows in the NumPy columns (which have a
+        capacity, the other columns grow by appending).
+        """
+        for i, column in enumerate(self._columns):
+            if self._fields[i].typecode is not None and len(column) < size:
+                capacity = max(size, 2 * len(column), 8)
+                grown = self._numpy.empty(capacity, dtype=column.dtype)
+                grown[:self._size] = column[:self._size]
+                self._columns[i] = grown
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return '<%s of %s, %d rows>' % (type(self).__name__,
+                                        self.cls.__name__, self._size,)
+
+    def __getitem__(self, index):
+        size = self._size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("%s index out of range" % (type(self).__name__,))
+        return self._row_class(self, index)
+
+    def __iter__(self):
+        row_class = self._row_class
+        for index in range(self._size):
+            yield row_class(self, index)
+
+    @property
+    def names(self):
+        """The names of the columns."""
+        return [field.name for field in self._fields]
+
+    def append(self, obj=None, **values):
+        """Add a row with the property values of `obj` (an instance of
+        the class or a dict) and/or the keyword arguments. Missing
+        values take the default values of the properties.
+
+        Raises:
+            ValueError: when a value is missing and the property does
+                not have a default value, or when a name is not a
+                column.
+            TypeError: when a value does not fit a numeric column.
+        """
+        if obj is not None:
+            if isinstance(obj, dict):
+                values = dict(obj, **values)
+            else:
+                values = dict(((field.name, getattr(obj, field.name))
+                               for field in self._fields), **values)
+        row = []
+        for field in self._fields:
+            try:
+                row.append(values.pop(field.name))
+            except KeyError:
+                row.append(field.make_default())
+        if values:
+            raise ValueError("Not columns of %r: %s"
+                             % (self, ', '.join(sorted(values)),))
+        if self._numpy is not None:
+            self._reserve(self._size + 1)
+            size = self._size
+            columns = list(zip(self._fields, self._columns, row))
+            # the numeric values are converted (and may fail) first, in
+            # the free capacity of their columns, thus a failure leaves
+            # the columns even
+            for field, column, value in columns:
+                if field.typecode is not None:
+                    column[size] = _numeric(field.typecode, value)
+            for field, column, value in columns:
+                if field.typecode is None:
+                    column.append(value)
+        else:
+            done = 0
+            try:
+                for column, value in zip(self._columns, row):
+                    column.append(value)
+                    done += 1
+            except Exception:
+                # e.g a str for an array column, keep the columns even
+                for column in self._columns[:done]:
+                    column.pop()
+                raise
+        self._size += 1
+
+    def extend(self, rows):
+        """Add rows, each an instance of the class or a dict (see
+        `append`).
+        """
+        for row in rows:
+            self.append(row)
+
+    def _index_of(self, name):
+        for i, field in enumerate(self._fields):
+            if field.name == name:
+                return i
+        raise KeyError("'%s' is not a column of %r" % (name, self,))
+
+    def column(self, name):
+        """Return the column of the property `name`: an `array.array`,
+        a NumPy array (a view, with the 'numpy' backend) or a list.
+        Changing it inplace changes the table.
+
+        Raises:
+            KeyError: when `name` is not a column.
+        """
+        i = self._index_of(name)
+        column = self._columns[i]
+        if self._numpy is not None and self._fields[i].typecode is not None:
+            return column[:self._size]
+        return column
+
+    def set_column(self, name, values):
+        """Replace all the values of the column `name` by `values` (any
+        iterable with one value per row).
+
+        Raises:
+            KeyError: when `name` is not a column.
+            AttributeError: when the property is readonly.
+            ValueError: when the number of values is not the number of
+                rows.
+            TypeError: when a value does not fit a numeric column.
+        """
+        i = self._index_of(name)
+        field = self._fields[i]
+        if field.readonly:
+            raise AttributeError("'%s' is a readonly property for %r"
+                                 % (name, self,))
+        column = self._new_column(field, values)
+        if len(column) != self._size:
+            raise ValueError("%d values given for %d rows"
+                             % (len(column), self._size,))
+        self._columns[i] = column
+
+    def filter(self, selector):
+        """Return a new table (of the same class and backend) with the
+        rows selected by `selector`: either a function called with each
+        row view or an iterable of booleans, one per row (e.g a NumPy
+        boolean array).
+        """
+        if callable(selector):
+            selector = [selector(row) for row in self]
+        table = PropTable(self.cls, backend=self.backend)
+        if self._numpy is not None:
+            mask = self._numpy.asarray(selector, dtype=bool)
+            if len(mask) != self._size:
+                raise ValueError("%d selectors given for %d rows"
+                                 % (len(mask), self._size,))
+            columns = []
+            for field, column in zip(self._fields, self._columns):
+                if field.typecode is None:
+                    columns.append(list(compress(column, mask)))
+                else:
+                    columns.append(column[:self._size][mask])
+            size = int(mask.sum())
+        else:
+            selector = list(selector)
+            if len(selector) != self._size:
+                raise ValueError("%d selectors given for %d rows"
+                                 % (len(selector), self._size,))
+            columns = [self._new_column(field, compress(column, selector))
+                       for field, column in zip(self._fields, self._columns)]
+            size = sum(1 for keep in selector if keep)
+        table._columns = columns
+        table._size = size
+        return table
+
+
+def _numeric(typecode, value):
+    """Return `value` checked like an item of an `array` of
+    `typecode` (TypeError for a float in an int column).
+    """
+    return array(typecode, (value,))[0]
+
+
+def _numpy_column(numpy, typecode, values):
+    """Return the NumPy column of `typecode` for `values`. The values
+    are checked like those of an `array` column: NumPy alone would
+    truncate floats for an int column.
+    """
+    dtype = _DTYPES[typecode]
+    if isinstance(values, numpy.ndarray):
+        # TypeError for float to int
+        return values.astype(dtype, casting='same_kind')
+    return numpy.frombuffer(array(typecode, values), dtype=dtype)
+
+
+def _make_column(values, typecode, numpy):
+    if typecode is None:
+        return list(values)
+    if numpy is not None:
+        return _numpy_column(numpy, typecode, values)
+    return array(typecode, values)
+
+
+def _direct_attr(record):
+    """Return the internal variable to read the property of `record`
+    from (None to read the property itself).
+    """
+    if record.var_name is Void \
+            or getattr(record.conf, 'async_compute', None) is not None:
+        return None
+    return record.var_name
+
+
+def _direct_names(cls, objs, columns):
+    """Return the names of `columns` whose internal variables can be
+    read directly for all the objects `objs` of `cls`: objects of a
+    subclass that reads a property from another internal variable (e.g
+    it overrides the property) are read through the property.
+    """
+    names = set(name for name, record, typecode in columns
+                if _direct_attr(record) is not None)
+    for klass in set(map(type, objs)):
+        if klass is cls or not names:
+            continue
+        try:
+            index = klass.Props.All
+        except AttributeError:
+            return set()
+        for name, record, typecode in columns:
+            other = index.get(name)
+            if other is None or _direct_attr(other) != record.var_name:
+                names.discard(name)
+    return names
+
+
+def _export_column(objs, record, typecode, numpy, direct=True):
+    """Return the column of the property of `record` for `objs`, read
+    from the internal variables if `direct`.
+    """
+    if direct:
+        try:
+            return _make_column(map(attrgetter(record.var_name), objs),
+                                typecode, numpy)
+        except AttributeError:
+            # e.g an empty slot, the property knows better
+            pass
+    return _make_column(map(attrgetter(record.key), objs), typecode,
+                        numpy)
+
+
+def _export(cls, names, backend):
+    """Return `[(name, record, typecode)]` for `export_columns`."""
+    if backend not in ('array', 'numpy'):
+        raise ValueError("Unknown backend: %r" % (backend,))
+    typecodes = dict((field.name, field.typecode)
+                     for field in _layout(cls)[0])
+    if names is None:
+        names = list(typecodes)
+    return [(record.key, record, typecodes.get(record.key))
+            for record in _bulk_records(cls.Props.All, names)]
+
+
+def _export_all(cls, objs, columns, numpy):
+    direct = _direct_names(cls, objs, columns)
+    return dict((name, _export_column(objs, record, typecode, numpy,
+                                      name in direct))
+                for name, record, typecode in columns)
+
+
+def _export_chunks(cls, objs, columns, numpy, chunk_size):
+    objs = iter(objs)
+    while True:
+        chunk = list(islice(objs, chunk_size))
+        if not chunk:
+            return
+        yield _export_all(cls, chunk, columns, numpy)
+
+
+def export_columns(cls, objs, names=None, backend='array', chunk_size=None):
+    """Return `{property_name: column}` for the objects `objs` of the
+    `PropMixin` class `cls`, one column per property in `names` (the
+    columns of a `PropTable` of `cls` by default).
+
+    The columns are built like those of `PropTable`: `array.array`
+    objects (buffers, thus `memoryview(column)` does not copy) for the
+    `int` and `float` properties, NumPy arrays with `backend='numpy'`
+    and lists for the others. The values are read from the internal
+    variables directly, a column at a time; if an object does not have
+    one (e.g an empty slot) the column is read through the property
+    instead. Properties without internal variable are read through the
+    property, so are the properties of the objects of subclasses that
+    read them from other internal variables (e.g they override them).
+
+    Args:
+        cls (PropMixin subclass): the class of the objects.
+        objs (iterable): the objects (a sequence is read as it is,
+            other iterables are made a list first).
+        names (sequence, optional): property names.
+        backend (str, optional): 'array' (default) or 'numpy'.
+        chunk_size (int, optional): return a generator of such dicts for
+            consecutive chunks of `chunk_size` objects instead, thus
+            `objs` can be a stream that does not fit in memory.
+
+    Raises:
+        AttributeError: if a name is not a property of `cls`.
+        ValueError: when the backend is unknown or `chunk_size` is not
+            positive.
+        TypeError: when a value does not fit a numeric column.
+    """
+    columns = _export(cls, names, backend)
+    numpy = None
+    if backend == 'numpy':
+        import numpy
+    if chunk_size is not None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive, got %r"
+                             % (chunk_size,))
+        return _export_chunks(cls, objs, columns, numpy, chunk_size)
+    if not isinstance(objs, Sequence):
+        objs = list(objs)
+    return _export_all(cls, objs, columns, numpy)
@@ -12,7 +12,10 @@ Two types of classes are to be found here:
 __author__ = 'Md Jahidul Hamid <jahidulhamid@yahoo.com>'
 __copyright__ = 'Copyright © Md Jahidul Hamid <https://github.com/neurobin/>'
 __license__ = '[BSD](http://www.opensource.org/licenses/bsd-license.php)'
-__version__ = '0.0.4'
+__version__ = '0.0.5'
+
+
+from ocd import mode
 
 
 class _Object(object):
@@ -359,3 +362,23 @@ class ConstClassMap(ClassUnroMap):
 
 
 #######################################################################
+
+
+def _strip_checks():
+    """Remove the `__setattr__`/`__delattr__` overrides of the classes
+    and metaclasses above, leaving plain attribute storages (production
+    mode, see `ocd.mode`).
+    """
+    metaclasses = [_UndeadMeta, _UndeadMapMeta, _ReadonlyMeta,
+                   _ReadonlyMapMeta, _UnroMeta, _UnroMapMeta]
+    classes = [ReadonlyMap, Readonly, UndeadMap, Undead, Unro, UnroMap,
+               ConstClass, ConstClassMap]
+    # metaclasses first, their `__delattr__` guards the classes
+    for klass in metaclasses + classes:
+        for name in ('__setattr__', '__delattr__'):
+            if name in klass.__dict__:
+                type.__delattr__(klass, name)
+
+
+if mode.is_production():
+    _strip_checks()
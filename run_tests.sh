@@ -3,16 +3,25 @@
 tests=(
     'tests.test_package_init'
     'tests.test_prop'
+    'tests.test_descriptors'
+    'tests.test_codegen'
     'tests.test_abc'
     'tests.test_types'
     'tests.test_version'
     'tests.test_defaults'
     'tests.test_mixins_PropMixin'
     'tests.test_unro'
+    'tests.test_mode'
+    'tests.test_observe'
+    'tests.test_table'
     'tests.test_utils'
     'tests.test_deprecate'
 )
 
+if python -c 'import sys; sys.exit(sys.version_info < (3, 5))'; then
+    tests+=('tests.test_async')
+fi
+
 print_chars(){
     local how_many=$1
     local which_char=${2:-=}
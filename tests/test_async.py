@@ -0,0 +1,104 @@
+import asyncio
+import unittest
+
+from ocd.prop import Prop, invalidate
+from ocd.mixins import PropMixin
+from ocd._async import _async_flight
+
+
+# async def is a syntax error before Python 3.5, thus these tests have
+# their own module (see run_tests.sh).
+class Test_async(unittest.TestCase):
+    def setUp(self):
+        # init
+        pass
+
+    def tearDown(self):
+        # destruct
+        pass
+
+    @unittest.skipIf(not hasattr(asyncio, 'run'), "Python 3.7 or newer")
+    def test_Prop_async_compute(self):
+        async def coro(self):
+            return 1
+        with self.assertRaises(ValueError):
+            Prop(async_compute=3) # not callable
+        with self.assertRaises(ValueError):
+            Prop(1, async_compute=coro)
+        with self.assertRaises(ValueError):
+            Prop(async_compute=coro, compute=len)
+        with self.assertRaises(ValueError):
+            Prop(async_compute=coro, readonly=Prop.RO_STRONG)
+        assert Prop(async_compute=coro).is_readonly_weak
+        p = Prop(async_compute=coro, readonly=True)
+        assert p.is_readonly_weak and p.is_readonly_for_class
+
+        calls = []
+        async def connect(self):
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            if self.fail:
+                self._fail = False
+                raise ConnectionError('first call fails')
+            return 'session %d' % (len(calls),)
+
+        for options in ({}, {'slots': True}, {'codegen': True},
+                        {'slots': True, 'codegen': True}):
+            class B(PropMixin, **options):
+                fail = Prop(False)
+                session = Prop(async_compute=connect, undead=True)
+
+            async def main():
+                del calls[:]
+                b = B()
+                values = await asyncio.gather(*[b.session
+                                                for i in range(5)])
+                assert values == ['session 1'] * 5 # one shared task
+                assert len(calls) == 1 and b._session == 'session 1'
+                assert await b.session == 'session 1' # cached
+                assert len(calls) == 1
+                assert not _async_flight._tasks[asyncio.get_running_loop()]
+
+                with self.assertRaises(AttributeError):
+                    b.session = 'other' # can not be clobbered
+                with self.assertRaises(AttributeError):
+                    del b.session
+                invalidate(b, 'session')
+                assert await b.session == 'session 2'
+
+                b = B()
+                b.fail = True
+                with self.assertRaises(ConnectionError):
+                    await b.session
+                assert not _async_flight._tasks[asyncio.get_running_loop()]
+                assert await b.session == 'session 4' # retried
+
+                # cancelling a reader does not cancel the others
+                b = B()
+                first = asyncio.ensure_future(b.session)
+                second = asyncio.ensure_future(b.session)
+                await asyncio.sleep(0)
+                first.cancel()
+                assert await second == 'session 5'
+                assert first.cancelled() and b._session == 'session 5'
+            asyncio.run(main())
+
+        b = B()
+        with self.assertRaises(RuntimeError):
+            b.session # no running event loop
+
+
+    def test_PropMixin_frozen(self):
+        # async computed properties are left out of __eq__ and __hash__
+        async def fetch(self):
+            return self.a
+        class Async(PropMixin, frozen=True, init=True):
+            a = Prop(1)
+            s = Prop(async_compute=fetch)
+        x = Async(2)
+        assert x == x and x == Async(2) and x != Async(3)
+        assert hash(x) == hash(Async(2))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
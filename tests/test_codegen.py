@@ -0,0 +1,222 @@
+import unittest
+
+from ocd import codegen
+from ocd.prop import Prop
+from ocd.mixins import PropMixin
+from ocd.defaults import VarConfAll
+
+
+class Test_module_codegen(unittest.TestCase):
+    def setUp(self):
+        # init
+        pass
+
+    def tearDown(self):
+        # destruct
+        pass
+
+    def test_make_accessors(self):
+        fget, fset, fdel = codegen.make_accessors(codegen.MODE_RW,
+                                                  codegen.STORAGE_DICT,
+                                                  'a', '_a', 4)
+        assert fget is None # attrgetter is used for dict storage
+
+        class A():
+            pass
+        a = A()
+        fset(a, 5)
+        assert a._a == 5
+        fdel(a)
+        with self.assertRaises(AttributeError):
+            fdel(a)
+
+        fget, fset, fdel = codegen.make_accessors(codegen.MODE_CONST,
+                                                  codegen.STORAGE_DICT,
+                                                  'c', None, 'const',
+                                                  undead=True)
+        assert fget(a) == 'const'
+        with self.assertRaises(AttributeError):
+            fset(a, 3)
+        with self.assertRaises(AttributeError):
+            fdel(a)
+
+        fget, fset, fdel = codegen.make_accessors(codegen.MODE_WEAK,
+                                                  codegen.STORAGE_SLOT,
+                                                  'w', '_w')
+        with self.assertRaises(AttributeError):
+            fget(a) # no default
+        with self.assertRaises(AttributeError):
+            fset(a, 3)
+
+        with self.assertRaises(ValueError):
+            codegen.make_accessors(codegen.MODE_RW, codegen.STORAGE_DICT,
+                                   'a', '_a-x')
+
+    def test_make_setter(self):
+        class A():
+            pass
+        a = A()
+        fset = codegen.make_setter('_x')
+        fset(a, 3)
+        assert a._x == 3 and a.__dict__ == {'_x': 3}
+        assert codegen.make_setter('_x') is fset # shared
+        with self.assertRaises(ValueError):
+            codegen.make_setter('_a-x')
+
+    def test_cache(self):
+        g1 = codegen.make_accessors(codegen.MODE_RW, codegen.STORAGE_SLOT,
+                                    'cached', '_cached', 1)
+        g2 = codegen.make_accessors(codegen.MODE_RW, codegen.STORAGE_SLOT,
+                                    'cached', '_cached', 2)
+        # same compiled code, different default
+        assert g1[0].__code__ is g2[0].__code__
+        assert g1[0] is not g2[0]
+        # the setter and deleter do not use the default, they are shared
+        assert g1[1:] == g2[1:] and g1[1] is g2[1]
+        g3 = codegen.make_accessors(codegen.MODE_RW, codegen.STORAGE_SLOT,
+                                    'cached', '_cached')
+        g4 = codegen.make_accessors(codegen.MODE_RW, codegen.STORAGE_SLOT,
+                                    'cached', '_cached')
+        assert g3[0] is g4[0] # no default
+
+    def test_PropMixin_codegen(self):
+        class B(PropMixin, codegen=True):
+            VarConf = VarConfAll
+            a = 4
+            b = Prop('b', readonly=True)
+            c = Prop('c', readonly=Prop.RO_WEAK, undead=True)
+            d = Prop(var_name_suffix='-x')
+
+        class C(B, slots=True): # codegen is inherited
+            e = 'e'
+
+        assert B.__dict__['a'].fset.__code__.co_name == 'fset'
+        assert B.__dict__['a'].fset.__code__.co_filename == '<string>'
+        assert C.__dict__['e'].fget.__code__.co_filename == '<string>'
+
+        c = C()
+        assert c.a == 4
+        c.a = 5
+        assert c.a == 5
+        del c.a
+        assert c.a == 4
+        assert c.b == 'b'
+        with self.assertRaises(AttributeError):
+            c.b = 4
+        with self.assertRaises(AttributeError):
+            c.c = 4
+        c._c = 4
+        assert c.c == 4
+        with self.assertRaises(AttributeError):
+            del c.c
+        assert c.e == 'e'
+        c.e = 'E'
+        assert c._e == 'E'
+        with self.assertRaises(AttributeError):
+            c.d # not set, no default
+        c.d = 3 # not generated, but works
+        assert c.d == 3
+
+
+    def test_make_eq_hash(self):
+        class A(object):
+            def __init__(self, x, y):
+                self.x = x
+                setattr(self, 'a-b', y)
+        eq, hash_ = codegen.make_eq_hash(['x', 'a-b'], '_h', 'A')
+        A.__eq__, A.__hash__ = eq, hash_
+        assert eq.__qualname__ == 'A.__eq__'
+        assert A(1, 2) == A(1, 2) and A(1, 2) != A(1, 3)
+        a = A(1, 2)
+        assert hash(a) == hash((1, 2)) == a._h
+        assert codegen.make_eq_hash(['x', 'a-b'], '_h')[0].__code__ \
+            is eq.__code__ # cached
+        with self.assertRaises(ValueError):
+            codegen.make_eq_hash(['x'], 'not valid')
+
+    def test_make_bulk_getter_setter(self):
+        class A(object):
+            pass
+        a = A()
+        a._x, a.x, a.y = 1, 2, 3
+        setattr(a, 'a-b', 4)
+        get = codegen.make_bulk_getter(['_x', 'a-b'], ['x', 'y'], 'A.get')
+        assert get(a) == (1, 4) and get.__qualname__ == 'A.get'
+        del a._x
+        assert get(a) == (2, 3) # fallback
+        assert codegen.make_bulk_getter(['y'])(a) == 3
+        with self.assertRaises(ValueError):
+            codegen.make_bulk_getter(['x'], ['x', 'y'])
+        class C(A):
+            pass
+        c = C()
+        c._x, c.x = 1, 2
+        get = codegen.make_bulk_getter(['_x'], ['x'], cls=A,
+                                       check=lambda klass: False)
+        assert get(c) == 2 # other class, not checked
+        a._x = 1
+        assert get(a) == 1
+        checked = []
+        set_ = codegen.make_bulk_setter(['x', 'a-b'], A, checked.append)
+        set_(a, (5, 6))
+        assert (a.x, getattr(a, 'a-b')) == (5, 6) and checked == []
+        class B(A):
+            pass
+        b = B()
+        set_(b, [7, 8])
+        assert (b.x, getattr(b, 'a-b')) == (7, 8) and checked == [B]
+        codegen.make_bulk_setter(['x'], A, None)(a, 9)
+        assert a.x == 9
+
+    def test_make_row_builder(self):
+        class A(object):
+            pass
+        build = codegen.make_row_builder(A, ['x', None, 'a-b'],
+                                         qualname='A.build')
+        a = build((1, 2, 3))
+        assert type(a) is A and build.__qualname__ == 'A.build'
+        assert vars(a) == {'x': 1, 'a-b': 3}
+        with self.assertRaises(ValueError):
+            build((1, 2))
+        build = codegen.make_row_builder(A, ['x', 'a-b'], [0, 'k'])
+        assert vars(build({0: 1, 'k': 2, 'z': 3})) == {'x': 1, 'a-b': 2}
+        assert vars(build({})) == {}
+        with self.assertRaises(ValueError):
+            codegen.make_row_builder(A, ['x'], ['k', 'l'])
+
+    def test_make_state(self):
+        slow = []
+        def slow_get(obj):
+            slow.append(obj)
+            return [0, (), dict(obj.__dict__)]
+        def slow_set(obj, state):
+            obj.__dict__.update(state[2])
+        class A(object):
+            __slots__ = ('s', '__dict__')
+        A.__getstate__, A.__setstate__, A.__reduce_ex__ = codegen.make_state(
+            [('d-x', False), ('s', True)], True, slow_get, slow_set,
+            hash_var='_h', qualname='A')
+        assert A.__getstate__.__qualname__ == 'A.__getstate__'
+        a = A()
+        a.__dict__['d-x'] = 1
+        a.s = 2
+        a._h = 3 # not saved
+        assert a.__getstate__() == (1, 2)
+        assert a.__reduce_ex__(2)[1:] == ((A,), (1, 2))
+        b = A()
+        b.__setstate__((1, 2))
+        assert b.__dict__ == {'d-x': 1} and b.s == 2
+        del a.s
+        assert a.__getstate__() == [1, (1,)]
+        b = A()
+        b.__setstate__([2, (5,)])
+        assert b.__dict__ == {} and b.s == 5
+        a.other = 4
+        assert a.__getstate__() == [0, (), dict(a.__dict__)] and slow
+        with self.assertRaises(ValueError):
+            codegen.make_state([('not valid', True)], False, slow_get,
+                               slow_set)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -33,6 +33,80 @@ class Test_defaults(unittest.TestCase):
     def test_VarConfAll(self):
         self._common_varconf_test(defaults.VarConfAll)
 
+    def test_VarConfRules(self):
+        ro = Prop(readonly=True)
+        wro = Prop(readonly=Prop.RO_WEAK)
+        nd = Prop(undead=True)
+        p = Prop()
+        num = Prop(store_default=False)
+        class VarConf(defaults.VarConfRules):
+            rules = [
+                ('prefix', 'ro_', ro),
+                ('prefix', ('wro_', 'weak_'), wro),
+                ('suffix', '_nd', nd),
+                ('type', (int, float), num),
+                ('regex', r'p_\w+', p),
+                ('prefix', 'tmp_', None),
+            ]
+        self._common_varconf_test(VarConf)
+        conf = VarConf()
+        assert conf.get_conf('ro_name', 'x') is ro
+        assert conf.get_conf('ro_name_nd', 'x') is ro # first match wins
+        assert conf.get_conf('weak_name', 'x') is wro
+        assert conf.get_conf('name_nd', 'x') is nd
+        assert conf.get_conf('p_name', 'x') is p
+        assert conf.get_conf('p_name', 3) is num # type rule comes first
+        assert conf.get_conf('ro_count', 3) is ro
+        assert conf.get_conf('count', 3.5) is num
+        assert conf.get_conf('tmp_name', 'x') is None
+        assert conf.get_conf('name', 'x') is None # default
+        assert conf.get_conf('RO_name', 'x') is None # case sensitive
+
+        # compiled once per class, decisions are memoized
+        match, type_rules, cache = VarConf._compiled
+        assert cache[('p_name', str)] is p
+        assert VarConf()._compiled is VarConf._compiled
+
+        class VarConf(defaults.VarConfRules):
+            rules = [('prefix', 'ro_', ro), ('regex', r'[a-z]+', p)]
+            default = nd
+            ignore_case = True
+        conf = VarConf()
+        assert conf.get_conf('RO_name', 'x') is ro
+        assert conf.get_conf('Name', 'x') is p
+        assert conf.get_conf('name1', 'x') is nd
+        assert 'name1' in VarConf._compiled[2] # memoized by name
+
+        class Bad(defaults.VarConfRules):
+            rules = [('infix', 'x', p)]
+        with self.assertRaises(ValueError):
+            Bad().get_conf('x', 1)
+        class Bad(defaults.VarConfRules):
+            rules = [('prefix', 'x', True)]
+        with self.assertRaises(ValueError):
+            Bad().get_conf('x', 1)
+        class Bad(defaults.VarConfRules):
+            rules = [('prefix', 'x')]
+        with self.assertRaises(ValueError):
+            Bad().get_conf('x', 1)
+
+    def test_VarConfRules_PropMixin(self):
+        from ocd.mixins import PropMixin
+        class B(PropMixin):
+            class VarConf(defaults.VarConfRules):
+                rules = [('prefix', 'ro_', Prop(readonly=True)),
+                         ('prefix', 'p_', Prop())]
+            ro_name = 'John Doe'
+            p_age = 30
+            other = 'not a property'
+        b = B()
+        with self.assertRaises(AttributeError):
+            b.ro_name = 'x'
+        b.p_age = 31
+        assert b._p_age == 31
+        b.other = 'changed' # plain attribute
+        assert 'other' in b.__dict__
+
 
 
 if __name__ == '__main__':
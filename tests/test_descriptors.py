@@ -0,0 +1,142 @@
+import unittest
+from operator import attrgetter
+
+from ocd import Void
+from ocd.prop import Prop
+from ocd.mixins import PropMixin
+from ocd.descriptors import (_Default, _Lazy, PropDescriptor,
+                             ReadonlyWeakPropDescriptor,
+                             ReadonlyPropDescriptor, SlotPropDescriptor,
+                             ReadonlyWeakSlotPropDescriptor)
+
+
+class Test_module_descriptors(unittest.TestCase):
+    def setUp(self):
+        # init
+        pass
+
+    def tearDown(self):
+        # destruct
+        pass
+
+    def test_PropDescriptor(self):
+        class A():
+            a = PropDescriptor('a', '_a', 4)
+            b = PropDescriptor('b', '_b', undead=True)
+
+        assert isinstance(A.a, PropDescriptor) # class access
+        x = A()
+        assert x.a == 4
+        x.a = 5
+        assert x.a == 5
+        assert x.__dict__['_a'] == 5
+        del x.a
+        assert x.a == 4
+        with self.assertRaises(AttributeError):
+            del x.a # internal variable does not exist
+        with self.assertRaises(AttributeError):
+            x.b # Void default
+        x.b = 3
+        assert x.b == 3
+        with self.assertRaises(AttributeError):
+            del x.b # undead
+
+    def test_ReadonlyWeakPropDescriptor(self):
+        class A():
+            a = ReadonlyWeakPropDescriptor('a', '_a', 'default')
+        x = A()
+        with self.assertRaises(AttributeError):
+            x.a = 3
+        x._a = 'changed'
+        assert x.a == 'changed'
+
+    def test_ReadonlyPropDescriptor(self):
+        class A():
+            a = ReadonlyPropDescriptor('a', 'constant')
+            b = ReadonlyPropDescriptor('b', Void)
+        x = A()
+        assert x.a == 'constant'
+        with self.assertRaises(AttributeError):
+            x.a = 3
+        with self.assertRaises(AttributeError):
+            del x.a
+        with self.assertRaises(AttributeError):
+            x.b
+
+    def test_SlotPropDescriptor(self):
+        class A():
+            __slots__ = ('_a', '_b')
+        A.a = SlotPropDescriptor('a', '_a', A._a, 4)
+        A.b = ReadonlyWeakSlotPropDescriptor('b', '_b', A._b)
+        x = A()
+        assert x.a == 4
+        x.a = 5
+        assert x.a == 5 and x._a == 5
+        del x.a
+        assert x.a == 4
+        with self.assertRaises(AttributeError):
+            x.b # Void default
+        with self.assertRaises(AttributeError):
+            x.b = 3
+        x._b = 3
+        assert x.b == 3
+        # no Python level closure on the read path
+        assert type(A.b.fget) is attrgetter
+        assert A.a.fget.__code__.co_filename == '<string>'
+
+    def test_default_factory(self):
+        class A():
+            a = PropDescriptor('a', '_a', factory=list)
+            __slots__ = ('_b', '__dict__')
+        A.b = SlotPropDescriptor('b', '_b', A._b, factory=dict)
+        A.a.__set_name__(A, 'a')
+        assert isinstance(A._a, _Lazy)
+        x = A()
+        assert x.a == [] and x.a is x.a
+        assert '_a' in x.__dict__
+        assert x.b == {} and x.b is x.b
+        assert A().a is not x.a
+
+    def test_descriptor_defaults(self):
+        def func(x):
+            return x
+        inner = property(lambda self: 1 / 0)
+        for kw in ({}, {'slots': True}, {'codegen': True}):
+            class A(PropMixin, **kw):
+                f = Prop(func)
+                p = Prop(inner)
+                x = Prop(5)
+                _x = 'user' # defined by the class, not overwritten
+            x = A()
+            # returned as they are, not bound or called
+            assert x.f is func and x.p is inner
+            assert x.x == 'user' and A._x == 'user'
+            if not kw.get('slots'):
+                assert isinstance(A.__dict__['_f'], _Default)
+            A.f = Prop(len)
+            A.x = Prop(6)
+            assert A().f is len and A().x == 'user'
+            x.f = abs
+            assert x.f is abs
+            del A.x
+            assert A._x == 'user'
+
+    def test_PropMixin_uses_descriptors(self):
+        class B(PropMixin):
+            a = Prop(4)
+            b = Prop('b', readonly=True)
+            c = Prop('c', readonly=Prop.RO_WEAK)
+        assert type(B.__dict__['a']) is PropDescriptor
+        assert type(B.__dict__['b']) is ReadonlyPropDescriptor
+        assert type(B.__dict__['c']) is ReadonlyWeakPropDescriptor
+
+        class C(PropMixin, slots=True):
+            a = Prop(4)
+            c = Prop('c', readonly=Prop.RO_WEAK)
+        assert type(C.__dict__['a']) is SlotPropDescriptor
+        assert type(C.__dict__['c']) is ReadonlyWeakSlotPropDescriptor
+
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
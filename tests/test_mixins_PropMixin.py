@@ -1,7 +1,9 @@
 
 import unittest
 
-from ocd.prop import Prop
+from ocd import Void
+from ocd.prop import Prop, PropRecord
+from ocd.prop import changed, clear_changes, snapshot, diff_since
 from ocd.mixins import PropMixin
 from ocd.defaults import VarConfNone, VarConfAll
 
@@ -313,6 +315,652 @@ class Test_mixins_PropMixin(unittest.TestCase):
             D.Props.Defaults.current_status # Props for class C is  not accessible through class D
 
 
+    def test_PropMixin_slots(self):
+        import weakref
+
+        class B(PropMixin, slots=True, weakref=True):
+            class VarConf(VarConfNone):
+                def get_conf(self, n, v):
+                    if n.endswith('_ro'):
+                        return Prop(readonly=True)
+                    elif n.endswith('_wro'):
+                        return Prop(readonly=Prop.RO_WEAK)
+                    return Prop()
+            name = 'John Doe'
+            employer_wro = 'Google'
+            ssn_ro = '1234'
+            nothing = Prop(undead=True)
+
+        assert B.__slots__ == ('_name', '_employer_wro', '_nothing',
+                               '__weakref__')
+        b = B()
+        with self.assertRaises(AttributeError):
+            b.__dict__
+        weakref.ref(b)
+
+        assert b.name == 'John Doe'
+        b.name = 'Jane Doe'
+        assert b.name == 'Jane Doe' and b._name == 'Jane Doe'
+        del b.name
+        assert b.name == 'John Doe'
+        with self.assertRaises(AttributeError):
+            del b.name
+
+        with self.assertRaises(AttributeError):
+            b.employer_wro = 'Microsoft'
+        b._employer_wro = 'Microsoft'
+        assert b.employer_wro == 'Microsoft'
+
+        assert b.ssn_ro == '1234'
+        with self.assertRaises(AttributeError):
+            b.ssn_ro = '4321'
+
+        with self.assertRaises(AttributeError):
+            b.nothing # not set yet
+        b.nothing = 0
+        assert b.nothing == 0
+        with self.assertRaises(AttributeError):
+            del b.nothing # undead
+
+        with self.assertRaises(AttributeError):
+            b.some_attribute = 1 # no __dict__
+
+        class C(B, slots=True):
+            name = Prop('Overwritten') # _name slot comes from B
+            extra = Prop(1)
+        assert C.__slots__ == ('_extra',)
+        c = C()
+        assert c.name == 'Overwritten'
+        c.name = 'Changed'
+        assert c.name == 'Changed'
+        with self.assertRaises(AttributeError):
+            c.__dict__
+
+        with self.assertRaises(TypeError):
+            class D(PropMixin, weakref=True): pass
+
+    def test_PropMixin_single_pass(self):
+        created = []
+        class Conf(VarConfAll):
+            def __init__(self):
+                created.append(self)
+
+        class B(PropMixin):
+            VarConf = Conf
+            a = 1
+            b = 2
+            c = Prop(3, readonly=True)
+        assert len(created) == 1 # one VarConf object per class
+        assert B().a == 1 and B().c == 3
+
+        assert B.Props.Ivan.a == '_a' and B.Props.Defaults.c == 3
+        with self.assertRaises(AttributeError):
+            B.Props.Ivan.c # no internal variable
+
+        # runtime additions
+        B.d = 4
+        assert B.Props.Keys.d == 'd' and B().d == 4
+        class C(PropMixin):
+            VarConf = Conf
+        C.e = 5
+        assert C.Props.Defaults.e == 5
+
+    def test_PropMixin_Props_table(self):
+        class B(PropMixin):
+            VarConf = VarConfAll
+            a = 1
+            b = Prop(2, store_default=False)
+            c = Prop(3, readonly=True)
+
+        # one record per property, in definition order
+        assert len(B.Props) == 3 and 'a' in B.Props and 'x' not in B.Props
+        assert [r.key for r in B.Props] == ['a', 'b', 'c']
+        a, b, c = B.Props
+        assert isinstance(a, PropRecord)
+        assert a == ('a', 1, B.Props.Conf.a, '_a')
+        assert b.default is Void and c.var_name is Void
+        assert B.Props.get('c') is c and B.Props.get('x') is None
+
+        # views iterate over the properties that have the field
+        assert list(B.Props.Keys) == ['a', 'b', 'c']
+        assert list(B.Props.Defaults) == ['a', 'c']
+        assert list(B.Props.Ivan) == ['a', 'b'] and len(B.Props.Ivan) == 2
+        assert 'c' not in B.Props.I and 'a' in B.Props.I
+        assert B.Props.K is B.Props.Keys
+        with self.assertRaises(AttributeError):
+            B.Props.Defaults.b
+        with self.assertRaises(AttributeError):
+            B.Props.Keys.a = 'x'
+        with self.assertRaises(AttributeError):
+            del B.Props.Keys.a
+
+        # the table follows runtime changes
+        B.d = 4
+        assert B.Props.get('d').default == 4 and list(B.Props.Keys)[-1] == 'd'
+        del B.a
+        assert 'a' not in B.Props and 'a' not in B.Props.Keys
+        class C(B):
+            e = 5
+        assert list(C.Props.Keys) == ['e'] # per class
+
+    def test_PropMixin_Props_All(self):
+        class A(PropMixin):
+            a = Prop(1)
+            b = Prop(2)
+        class B(A):
+            b = Prop('b', readonly=True) # override
+            c = Prop(3)
+        class C(B):
+            a = 'plain' # not a property any more
+        class D(C):
+            d = Prop(4)
+
+        assert list(D.Props.Keys) == ['d'] # own properties only
+        assert list(D.Props.All.Keys) == ['b', 'c', 'd']
+        assert list(B.Props.All.Keys) == ['a', 'b', 'c']
+        assert D.Props.All.Conf.b is B.Props.Conf.b
+        assert D.Props.All.Defaults.c == 3 and D.Props.All.D.b == 'b'
+        assert D.Props.All.get('c') is B.Props.get('c')
+        with self.assertRaises(AttributeError):
+            D.Props.All.Ivan.b # readonly, no internal variable
+        assert A.Props.All.Ivan.b == '_b'
+        assert 'a' not in D.Props.All and len(D.Props.All) == 3
+        assert D.Props.All.All is D.Props.All
+        with self.assertRaises(AttributeError):
+            D.Props.All = None
+
+        # runtime changes are merged into the subclasses too
+        A.e = Prop(5)
+        assert 'e' in D.Props.All and D.Props.All.Defaults.e == 5
+        del C.a
+        assert D.Props.All.Conf.a is A.Props.Conf.a
+        del A.e
+        assert 'e' not in D.Props.All and 'e' not in B.Props.All
+
+    def test_PropMixin_init(self):
+        class B(PropMixin, init=True):
+            a = Prop(1)
+            b = Prop('b', readonly=Prop.RO_WEAK)
+            c = Prop('c', readonly=True)
+            d = Prop()
+
+        b = B(a=2, b='B')
+        assert b.a == 2 and b.b == 'B'
+        assert '_d' not in b.__dict__ # unset, not written
+        with self.assertRaises(AttributeError):
+            b.d
+        assert B().a == 1 # keeps the default
+        with self.assertRaises(TypeError):
+            B(c='C') # no internal variable for strong readonly
+        b = B(3, 'x')
+        assert b.a == 3 and b.b == 'x' # positional, in definition order
+        with self.assertRaises(TypeError):
+            B(1, 2, 3, 4) # too many
+
+        class C(B, slots=True): # init is inherited
+            e = Prop(5)
+            a = Prop(10, readonly=True) # overrides B.a
+        c = C(b='x', e=6)
+        assert c.b == 'x' and c.e == 6 and c.a == 10
+        with self.assertRaises(TypeError):
+            C(a=3)
+
+        class D(B):
+            def __init__(self, x):
+                self.a = x
+        assert D(3).a == 3 # user defined __init__ is kept
+
+        class E(D):
+            f = Prop(1)
+        assert E(4).a == 4 # init option is not inherited from D
+
+        # names that can not be parameters
+        F = type(PropMixin)('F', (PropMixin,), {
+            'self': Prop(1), 'a-b': Prop(2), 'class': Prop(3), 'x': Prop(4),
+        }, init=True)
+        f = F(5, 6, **{'a-b': 7, 'class': 8})
+        assert (f.self, f.x, getattr(f, 'a-b'), getattr(f, 'class')) \
+            == (5, 6, 7, 8)
+        assert getattr(F(self=0), 'a-b') == 2
+        with self.assertRaises(TypeError):
+            F(**{'other': 1})
+        with self.assertRaises(TypeError):
+            F(1, 2, 3)
+        assert [o.x for o in F.from_rows([(1, 2)], ('self', 'x'))] == [2]
+
+
+    def test_PropMixin_frozen(self):
+        class Key(PropMixin, frozen=True, init=True):
+            VarConf = VarConfAll
+            host = ''
+            port = 0
+            scheme = Prop('http', readonly=True) # constant, not compared
+
+        a = Key('localhost', 80)
+        b = Key(host='localhost', port=80)
+        c = Key('localhost', 8080)
+        assert a == b and a != c and hash(a) == hash(b)
+        assert a != ('localhost', 80) and a != object()
+        assert {a: 1}[b] == 1
+        assert a._Props_hash_ == hash(a) # cached
+        a._Props_hash_ = 3
+        assert hash(a) == 3
+
+        # properties are readonly and undead for instances
+        with self.assertRaises(AttributeError):
+            a.port = 81
+        with self.assertRaises(AttributeError):
+            del a.port
+        assert Key.Props.Conf.port.is_readonly_weak is False # conf as is
+
+        class Sub(Key): # inherited
+            path = '/'
+        s = Sub('localhost', 80, '/x')
+        assert s == Sub('localhost', 80, '/x') and s != Sub('localhost', 80)
+        assert s != a # different classes
+        with self.assertRaises(AttributeError):
+            s.path = '/y'
+
+        class Own(PropMixin, frozen=True):
+            VarConf = VarConfAll
+            x = 1
+            def __eq__(self, other):
+                return True
+        assert Own() == 3 and hash(Own()) == hash(Own())
+
+        class Slot(PropMixin, frozen=True, init=True, slots=True):
+            VarConf = VarConfAll
+            x = 1
+        assert '_Props_hash_' in Slot.__slots__
+        assert hash(Slot(2)) == hash(Slot(2)) and Slot(2) != Slot(3)
+        with self.assertRaises(AttributeError):
+            Slot().__dict__
+
+        # the cached hash is not saved (str hashes are per process)
+        import copy
+        import pickle
+        for kw in ({}, {'slots': True}):
+            H = type(PropMixin)('H', (PropMixin,), {
+                'VarConf': VarConfAll, 'host': '', 'port': 0,
+                '__module__': __name__,
+            }, frozen=True, init=True, **kw)
+            globals()['H'] = H # picklable
+            try:
+                h = H('localhost', 80)
+                h._Props_hash_ = 12345 # as if hashed by another process
+                for new in (pickle.loads(pickle.dumps(h)), copy.copy(h),
+                            copy.deepcopy(h)):
+                    assert new == h and new.port == 80
+                    assert hash(new) == hash(H('localhost', 80)) != 12345
+                if not kw:
+                    new = pickle.loads(pickle.dumps(h))
+                    assert vars(new) == {'_host': 'localhost', '_port': 80}
+            finally:
+                del globals()['H']
+
+        # properties added at runtime are compared too
+        class F(PropMixin, frozen=True, init=True):
+            a = Prop(1)
+        class G(F):
+            pass
+        F.b = Prop(2)
+        f = F(1)
+        f._b = 5
+        g = G(1)
+        g._b = 5
+        assert f != F(1) and g != G(1) and g == g
+        del F.b
+        assert f == F(1)
+        Own.y = Prop(2)
+        assert Own() == 3 # user defined __eq__ is kept
+
+        # the properties of a non frozen base would stay writable
+        class Base(PropMixin):
+            x = Prop(1)
+        with self.assertRaises(TypeError):
+            class Bad(Base, frozen=True):
+                y = Prop(2)
+        class Empty(PropMixin):
+            pass
+        class Sub(Empty, F): # no writable properties in Empty
+            pass
+        class Frozen(Empty, frozen=True, init=True):
+            y = Prop(2)
+        assert {Frozen(3): 1}[Frozen(3)] == 1
+        with self.assertRaises(TypeError):
+            Empty.x = Prop(1) # added to the base later
+        assert 'x' not in Frozen.Props.All
+        Empty.C = Prop(1, readonly=True) # constant, not writable
+        assert Frozen().C == 1
+
+    def test_PropMixin_track_changes(self):
+        for kw in ({}, {'slots': True}, {'codegen': True}):
+            class Rec(PropMixin, track_changes=True, init=True, **kw):
+                VarConf = VarConfAll
+                a = 0
+                b = ''
+                c = None
+
+            r = Rec(1, 'x') # __init__ is not a change
+            assert changed(r) == []
+            if kw.get('slots'):
+                assert '_Props_changes_' in Rec.__slots__
+            snap = snapshot(r)
+            assert snap == {'a': 1, 'b': 'x', 'c': None}
+
+            class Lazy(Rec):
+                items = Prop(default_factory=list)
+                total = Prop(compute=lambda self: self.a * 2)
+                copied = Prop([1], copy_default=True)
+            lazy = Lazy(1)
+            assert snapshot(lazy) == {'a': 1, 'b': '', 'c': None}
+            # not built by the snapshot
+            assert not any(hasattr(lazy, '__dict__') and name in vars(lazy)
+                           for name in ('_items', '_total', '_copied'))
+            assert lazy.total == 2 and snapshot(lazy)['total'] == 2
+            r.c = 5
+            r.a = 1 # same value
+            assert changed(r) == ['a', 'c'] # Props order
+            assert diff_since(r, snap) == {'c': 5}
+            clear_changes(r)
+            assert changed(r) == [] and diff_since(r, snap) == {}
+            clear_changes(r) # nothing recorded
+
+            class Sub(Rec): # inherited, bits continue
+                d = 3
+            assert Sub._Props_bits_ == {'a': 1, 'b': 2, 'c': 4, 'd': 8}
+            s = Sub()
+            s.d = 4
+            s.b = 'y'
+            assert changed(s) == ['b', 'd']
+
+            if not kw.get('slots'): # no slot for a property added later
+                Rec.e = Prop(0)
+                r.e = 1
+                assert changed(r) == ['e']
+                assert Sub._Props_bits_['e'] == 16
+
+        class Plain(PropMixin):
+            VarConf = VarConfAll
+            a = 0
+        p = Plain()
+        p.a = 1
+        assert changed(p) == [] and not hasattr(Plain, '_Props_bits_')
+
+    def test_PropMixin_Props_getter_setter(self):
+        from ocd import observe
+        for kw in ({}, {'slots': True}, {'track_changes': True}):
+            class A(PropMixin, init=True, **kw):
+                VarConf = VarConfAll
+                a = 1
+                b = 2
+                k = Prop('K', readonly=True)
+                w = Prop(0, readonly=Prop.RO_WEAK)
+            class B(A):
+                c = Prop(compute=lambda self: self.a * 10)
+            get = B.Props.getter('a', 'b', 'k', 'c')
+            assert get(B()) == (1, 2, 'K', 10) # defaults, computed
+            assert get(B(5, 6)) == (5, 6, 'K', 50)
+            assert B.Props.getter('b')(B(5, 6)) == 6 # single value
+            set_ab = B.Props.setter('a', 'b')
+            b = B()
+            set_ab(b, (3, 4))
+            assert (b.a, b.b) == (3, 4)
+            B.Props.setter('a')(b, 7)
+            assert b.a == 7
+            if kw.get('track_changes'):
+                assert changed(b) == ['a', 'b'] # through the setters
+            with self.assertRaises(ValueError):
+                set_ab(b, (1,))
+            with self.assertRaises(AttributeError):
+                B.Props.setter('a', 'k') # readonly
+            with self.assertRaises(AttributeError):
+                B.Props.setter('w') # weak readonly
+            with self.assertRaises(AttributeError):
+                B.Props.getter('nope')
+            with self.assertRaises(ValueError):
+                B.Props.getter()
+
+            class C(B): # same properties
+                pass
+            c = C()
+            set_ab(c, (8, 9))
+            set_ab(c, (8, 9))
+            assert (c.a, c.b) == (8, 9)
+            class D(B):
+                a = Prop(0, readonly=True)
+            with self.assertRaises(AttributeError):
+                set_ab(D(), (1, 2)) # readonly in D
+            class E(B):
+                a = Prop(0, var_name_prefix='_e_')
+            if kw.get('track_changes'):
+                set_ab(E(), (1, 2)) # through the setters anyway
+            else:
+                with self.assertRaises(TypeError):
+                    set_ab(E(), (1, 2)) # other internal variable
+            with self.assertRaises(TypeError):
+                set_ab(object(), (1, 2))
+            # subclasses that override the properties are read through
+            # the properties
+            get_ab = B.Props.getter('a', 'b')
+            assert get_ab(D()) == (0, 2) and get_ab(D()) == (0, 2)
+            e = E()
+            e._e_a = 5
+            assert get_ab(e) == (5, 2) and get_ab(C()) == (1, 2)
+            assert A.Props.getter('a')(D()) == 0
+
+        class O(PropMixin, observable=True):
+            VarConf = VarConfAll
+            a = 0
+        calls = []
+        observe.subscribe(lambda obj, changes: calls.append(changes), O)
+        try:
+            O.Props.setter('a')(O(), 1)
+        finally:
+            observe._hooks.clear()
+        assert calls == [{'a': 1}]
+
+    def test_PropMixin_compact_state(self):
+        import copy
+        import pickle
+        for kw in ({}, {'slots': True}, {'frozen': True}):
+            A = type(PropMixin)('A', (PropMixin,), {
+                'VarConf': VarConfAll, 'x': 0, 'y': [], 'z': None,
+                'b': Prop(type=int), '__module__': __name__,
+            }, compact_state=True, init=True, **kw)
+            globals()['A'] = A # picklable
+            try:
+                a = A(1, [2])
+                state = a.__getstate__()
+                assert state[0] == 3 and state[1][:2] == (1, [2]) # x, y
+                b = pickle.loads(pickle.dumps(a))
+                assert (b.x, b.y, b.z, b.b) == (1, [2], None, 0)
+                a = A(1, [2], 3, 4)
+                if kw.get('frozen'):
+                    a._Props_hash_ = 1 # the cached hash is not saved
+                assert a.__getstate__()[:3] == (1, [2], 3)
+                for c in (pickle.loads(pickle.dumps(a)), copy.copy(a),
+                          copy.deepcopy(a)):
+                    assert (c.x, c.y, c.z, c.b) == (1, [2], 3, 4)
+                    assert c.__getstate__() == a.__getstate__()
+                assert copy.copy(a).y is a.y
+                assert copy.deepcopy(a).y is not a.y
+                if not kw.get('frozen'):
+                    c = copy.copy(a)
+                    c.b = 5 # the buffer is not shared
+                    assert a.b == 4
+                if not kw.get('slots'):
+                    a.extra = 'e'
+                    c = pickle.loads(pickle.dumps(a))
+                    assert c.extra == 'e' and c.x == 1
+            finally:
+                del globals()['A']
+
+        class Own(PropMixin, compact_state=True):
+            VarConf = VarConfAll
+            x = 0
+            def __getstate__(self):
+                return 'own'
+        assert Own().__getstate__() == 'own'
+        assert Own.__setstate__.__qualname__.endswith('Own.__setstate__')
+
+        class Grow(PropMixin, compact_state=True):
+            VarConf = VarConfAll
+            x = 0
+        Grow.y = 1 # the state follows
+        g = Grow()
+        g.y = 2
+        assert g.__getstate__() == [2, (2,)]
+
+    def test_PropMixin_from_rows(self):
+        for kw in ({}, {'slots': True}, {'init': True}, {'track_changes': True}):
+            class R(PropMixin, **kw):
+                VarConf = VarConfAll
+                a = 0
+                b = ''
+                c = Prop(None, readonly=Prop.RO_WEAK)
+                d = Prop(type=int)
+                k = Prop('K', readonly=True)
+
+            objs = R.from_rows(iter([(1, 'x', 2, 3), (4, 'y', 5, 6)]))
+            assert not isinstance(objs, list) # lazy
+            objs = list(objs)
+            assert [(o.a, o.b, o.c, o.d) for o in objs] \
+                == [(1, 'x', 2, 3), (4, 'y', 5, 6)]
+            assert type(objs[0]) is R and objs[0].k == 'K'
+            if kw.get('track_changes'):
+                assert changed(objs[0]) == [] # not a change
+
+            o, = R.from_rows([{'b': 'z', 'd': 7, 'other': 0}])
+            assert (o.a, o.b, o.c, o.d) == (0, 'z', None, 7) # defaults
+            o, = R.from_rows([('p', 9, 'q')], ('b', None, 'c'))
+            assert (o.a, o.b, o.c) == (0, 'p', 'q')
+            o, = R.from_rows([{'B': 'r'}], {'B': 'b'})
+            assert o.b == 'r'
+            with self.assertRaises(ValueError):
+                list(R.from_rows([(1, 2)], ('a',)))
+
+        chunks = list(R.from_rows(((i,) for i in range(5)), ('a',),
+                                  chunk_size=2))
+        assert [[o.a for o in c] for c in chunks] == [[0, 1], [2, 3], [4]]
+        assert list(R.from_rows([])) == []
+        with self.assertRaises(ValueError):
+            R.from_rows([], chunk_size=0)
+        with self.assertRaises(AttributeError):
+            R.from_rows([], ('nope',))
+        with self.assertRaises(AttributeError):
+            R.from_rows([], ('k',)) # constant
+
+        class Own(PropMixin):
+            VarConf = VarConfAll
+            a = 0
+            def __init__(self, a):
+                raise AssertionError('not called')
+        o, = Own.from_rows([(1,)])
+        assert o.a == 1
+
+    def test_PropMixin_constants(self):
+        class C(PropMixin, constants=True):
+            VarConf = VarConfAll
+            STRONG = Prop(1, readonly=True, undead=True)
+            ALIVE = Prop('a', readonly=True)
+            NOVALUE = Prop(readonly=True)
+            x = 0
+        assert C.STRONG == 1 and C.__dict__['STRONG'] == 1
+        assert C().STRONG == 1 and C.Props.Defaults.STRONG == 1
+        assert C.Props.Conf.STRONG.is_readonly
+        assert isinstance(C.__dict__['NOVALUE'], property) # no value
+        assert isinstance(C.__dict__['x'], property)
+        with self.assertRaises(AttributeError):
+            C.STRONG = 2
+        with self.assertRaises(AttributeError):
+            del C.STRONG
+        assert C.STRONG == 1
+        del C.ALIVE # not undead
+        assert 'ALIVE' not in C.Props
+        C.LATE = Prop(3, readonly=True)
+        assert C.__dict__['LATE'] == 3
+
+        class S(PropMixin, constants=True, slots=True):
+            VarConf = VarConfAll
+            K = Prop('k', readonly=True, undead=True)
+        class T(S, slots=True): # inherited
+            L = Prop('l', readonly=True)
+        assert T.K == 'k' and T.L == 'l' and T.Props._options['constants']
+        t = T()
+        with self.assertRaises(AttributeError):
+            t.L = 'm' # no __dict__
+        with self.assertRaises(AttributeError):
+            del t.K
+
+    def test_PropMixin_setattr_fast_path(self):
+        class A(PropMixin):
+            VarConf = VarConfAll
+            a = 1
+            b = Prop([1], copy_default=True)
+        class B(A):
+            c = 3
+        class D(B):
+            a = 5 # overridden
+        record = A.Props.get('a')
+        descriptor = A.__dict__['a']
+        A.a = 2 # same configuration, the default changes in place
+        assert A.__dict__['a'] is descriptor
+        assert A().a == 2 and B().a == 2 and D().a == 5
+        assert A.Props.Defaults.a == 2 and B.Props.All.Defaults.a == 2
+        assert A.Props.get('a') is not record
+        assert B.Props.All.get('a') is A.Props.get('a')
+        assert D.Props.All.get('a') is D.Props.get('a')
+        A.b = Prop([2], copy_default=True)
+        assert A().b == [2] and A().b is not A().b
+        A.a = Prop(3, readonly=True) # new configuration
+        assert A().a == 3 and B.Props.All.Conf.a.is_readonly
+        with self.assertRaises(AttributeError):
+            A().a = 4
+        A.e = 4 # new property
+        assert B().e == 4 and 'e' in D.Props.All
+        with self.assertRaises(AttributeError):
+            A.VarConf = VarConfNone
+        A._internal = Prop() # no conversion
+        assert A._internal is Prop()
+
+        class R(PropMixin):
+            STRONG = Prop(1, readonly=True)
+        with self.assertRaises(AttributeError):
+            R.STRONG = 2
+
+        class N(PropMixin):
+            VarConf = VarConfNone
+            x = 0
+            y = Prop(0)
+        class M(N):
+            pass
+        N.x = 1
+        assert N.x == 1 and 'x' not in N.Props.All
+        M.y = 2 # plain attribute in front of an inherited property
+        assert M.y == 2 and 'y' not in M.Props.All and 'y' in N.Props.All
+        N.y = 3
+        assert N().y == 3 and M().y == 2
+        class Q(PropMixin):
+            z = Prop(1)
+        class NQ(N, Q):
+            pass
+        assert 'z' in NQ.Props.All and 'z' in N.Props._sub_names
+        N.z = 2 # plain attribute in front of a property of a subclass
+        assert 'z' not in NQ.Props.All and NQ().z == 2
+
+        seen = []
+        class ByValue(VarConfAll): # not name_only anymore
+            def get_conf(self, name, value):
+                seen.append(value)
+                return Prop() if isinstance(value, int) else None
+        class V(PropMixin):
+            VarConf = ByValue
+            n = 1
+        V.n = 'plain'
+        assert V.n == 'plain'
+        V.n = 2
+        assert V().n == 2 and seen == [1, 'plain', 2]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,105 @@
+
+import os
+import subprocess
+import sys
+import unittest
+
+from ocd import mode
+
+
+# Runs in a new interpreter, the mode is chosen at import time.
+PRODUCTION_CHECKS = '''
+from ocd import mode
+assert mode.is_production()
+from ocd import unro
+from ocd.prop import Prop
+from ocd.mixins import PropMixin
+
+class C(unro.ClassUnro):
+    pass
+C.x = 1
+C.x = 2
+del C.x
+u = unro.Unro()
+u.a = 1
+u.a = 2
+del u.a
+m = unro.ReadonlyMap(a=1)
+m['a'] = 2
+assert m.a == 2
+
+class B(PropMixin):
+    r = Prop(1, readonly=True, undead=True)
+    n = Prop(2, undead=True)
+assert B.__dict__['r'] == 1 # plain class attribute
+assert B.Props.Conf.r.is_readonly
+b = B()
+assert b.r == 1 and b.n == 2
+b.n = 3
+del b.n
+assert b.n == 2
+B.r = 5
+del B.n
+assert 'n' not in B.Props
+
+p = Prop(readonly=True) # interned, shared: still immutable
+for change in ('p.is_undead_for_instance = False', 'p.note = 1',
+               'del p.readonly'):
+    try:
+        exec(change)
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError(change)
+'''
+
+
+class Test_mode(unittest.TestCase):
+    def setUp(self):
+        # init
+        pass
+
+    def tearDown(self):
+        # destruct
+        pass
+
+    def _run(self, code, env_value):
+        env = dict(os.environ)
+        env[mode.ENV_VAR] = env_value
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env['PYTHONPATH'] = os.pathsep.join([root,
+                                             env.get('PYTHONPATH', '')])
+        return subprocess.run([sys.executable, '-c', code], env=env,
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT,
+                              universal_newlines=True)
+
+    def test_development(self):
+        # the test suite runs in development mode
+        assert not mode.is_production()
+        # the mode is in use, it can not be changed anymore
+        with self.assertRaises(RuntimeError):
+            mode.set_production()
+        mode.set_production(False) # no change
+
+    def test_production(self):
+        result = self._run(PRODUCTION_CHECKS, 'true')
+        self.assertEqual(result.returncode, 0, result.stdout)
+
+    def test_set_production(self):
+        code = ('from ocd import mode\n'
+                'mode.set_production()\n'
+                + PRODUCTION_CHECKS)
+        result = self._run(code, '0')
+        self.assertEqual(result.returncode, 0, result.stdout)
+        code = ('from ocd import mode\n'
+                'assert not mode.is_production()\n'
+                'mode.set_production()\n')
+        result = self._run(code, '')
+        self.assertNotEqual(result.returncode, 0)
+        assert 'RuntimeError' in result.stdout
+
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
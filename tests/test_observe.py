@@ -0,0 +1,105 @@
+
+import queue
+import unittest
+
+from ocd import observe
+from ocd.prop import Prop
+from ocd.mixins import PropMixin
+
+
+class Test_observe(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def tearDown(self):
+        observe._hooks.clear()
+        observe.set_queue(None)
+
+    def hook(self, obj, changes):
+        self.calls.append((obj, dict(changes)))
+
+    def test_hooks(self):
+        class Point(PropMixin, observable=True):
+            x = Prop(0)
+            y = Prop(0)
+            c = Prop('c', readonly=True)
+        class Point3(Point): # inherited
+            z = Prop(0)
+        class Plain(PropMixin):
+            x = Prop(0)
+
+        p = Point()
+        p.x = 1 # no hooks, nothing happens
+        observe.subscribe(self.hook, Point, 'x')
+        p.x = 2
+        p.y = 3
+        assert self.calls == [(p, {'x': 2})]
+
+        del self.calls[:]
+        observe.subscribe(self.hook, Point) # same hook, called once
+        other = []
+        observe.subscribe(lambda obj, changes: other.append(changes))
+        p.y = 4
+        q = Point3()
+        q.z = 5
+        Plain().x = 6 # not observable
+        assert self.calls == [(p, {'y': 4}), (q, {'z': 5})]
+        assert other == [{'y': 4}, {'z': 5}]
+
+        del self.calls[:]
+        observe.unsubscribe(self.hook, Point)
+        observe.unsubscribe(self.hook, Point, 'x')
+        p.x = 7
+        assert self.calls == []
+        with self.assertRaises(ValueError):
+            observe.unsubscribe(self.hook, Point)
+        with self.assertRaises(ValueError):
+            observe.subscribe(self.hook, name='x')
+
+    def test_setter_unchanged(self):
+        class Plain(PropMixin):
+            x = Prop(0)
+        class Observed(PropMixin, observable=True):
+            x = Prop(0)
+        assert Plain.__dict__['x'].fset.__name__ != 'observed_fset'
+        assert Observed.__dict__['x'].fset.__name__ == 'observed_fset'
+
+    def test_batch(self):
+        class Point(PropMixin, observable=True, slots=True, codegen=True):
+            x = Prop(0)
+            y = Prop(0)
+        observe.subscribe(self.hook, Point)
+        p, q = Point(), Point()
+        with observe.batch():
+            p.x = 1
+            p.y = 2
+            with observe.batch(): # nested
+                p.x = 3
+                q.y = 4
+            assert self.calls == []
+        assert self.calls == [(p, {'x': 3, 'y': 2}), (q, {'y': 4})]
+
+        del self.calls[:]
+        with self.assertRaises(RuntimeError):
+            with observe.batch():
+                p.x = 5
+                raise RuntimeError()
+        assert self.calls == [(p, {'x': 5})] # sent anyway
+
+    def test_queue(self):
+        class Point(PropMixin, observable=True):
+            x = Prop(0)
+        observe.subscribe(self.hook, Point)
+        q = queue.Queue()
+        observe.set_queue(q)
+        p = Point()
+        p.x = 1
+        p.x = 2
+        assert self.calls == [] and q.qsize() == 2
+        assert observe.drain(q) == 2
+        assert self.calls == [(p, {'x': 1}), (p, {'x': 2})]
+
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,7 +1,7 @@
 
 import unittest
 
-from ocd.prop import Prop
+from ocd.prop import Prop, invalidate
 from ocd.mixins import PropMixin
 from ocd import Void
 
@@ -129,6 +129,57 @@ class Test_module_prop(unittest.TestCase):
         with self.assertRaises(AttributeError):
             b.mark # Void is non-existent value
     
+    def test_Prop_default_factory(self):
+        with self.assertRaises(ValueError):
+            Prop(default_factory=3) # not callable
+        with self.assertRaises(ValueError):
+            Prop([], default_factory=list) # with a default value
+        with self.assertRaises(ValueError):
+            Prop(default_factory=list, copy_default=True)
+        with self.assertRaises(ValueError):
+            Prop(default_factory=list, readonly=True) # no internal var
+        with self.assertRaises(ValueError):
+            Prop([], copy_default=True, readonly=True)
+        Prop(default_factory=list, readonly=Prop.RO_WEAK) # OK
+
+        calls = []
+        def factory():
+            calls.append(1)
+            return []
+
+        class B(PropMixin):
+            items = Prop(default_factory=factory)
+            tags = Prop(['x'], copy_default=True)
+            shared = Prop([])
+
+        assert not calls # nothing is built at class creation
+        b1, b2 = B(), B()
+        b1.items.append(1)
+        assert b1.items == [1] and b2.items == []
+        assert len(calls) == 2 # once per instance
+        assert b1.__dict__['_items'] == [1] # stored in the internal var
+        b1.tags.append('y')
+        assert b1.tags == ['x', 'y'] and b2.tags == ['x']
+        assert B.Props.Defaults.tags == ['x']
+        b1.shared.append(1)
+        assert b2.shared == [1] # default value is shared without options
+
+        b3 = B()
+        b3.items = [3] # set first, the factory is never called
+        assert b3.items == [3] and len(calls) == 2
+        del b3.items
+        assert b3.items == [] and len(calls) == 3 # rebuilt after del
+
+        class C(PropMixin, slots=True, codegen=True):
+            items = Prop(default_factory=list)
+            w = Prop(default_factory=dict, readonly=Prop.RO_WEAK)
+
+        c = C()
+        c.items.append(1)
+        assert c._items == [1] and C().items == []
+        c.w['a'] = 1
+        assert c.w == {'a': 1} and c._w == {'a': 1}
+
     def test_Prop_Constness(self):
         p = Prop()
         with self.assertRaises(AttributeError):
@@ -164,12 +215,16 @@ class Test_module_prop(unittest.TestCase):
         with self.assertRaises(AttributeError):
             del p.var_name_suffix
         
-        # some random new attribute
-        p.some_random___something = 4
+        # some random new attribute, not on a shared (interned) Prop
         with self.assertRaises(AttributeError):
             p.some_random___something = 4
+        assert not hasattr(Prop(), 'some_random___something')
+        v = Prop(1)
+        v.some_random___something = 4
+        with self.assertRaises(AttributeError):
+            v.some_random___something = 4
         with self.assertRaises(AttributeError):
-            del p.some_random___something
+            del v.some_random___something
 
         # constants
 
@@ -185,6 +240,233 @@ class Test_module_prop(unittest.TestCase):
             Prop.UD_INSTANCE = 2
 
 
+    def test_Prop_compute(self):
+        with self.assertRaises(ValueError):
+            Prop(compute=3) # not callable
+        with self.assertRaises(ValueError):
+            Prop(1, compute=len) # with a default value
+        with self.assertRaises(ValueError):
+            Prop(compute=len, default_factory=list)
+        with self.assertRaises(ValueError):
+            Prop(compute=len, readonly=Prop.RO_STRONG)
+        p = Prop(compute=len, readonly=True)
+        assert p.is_readonly_weak and p.is_readonly_for_class
+
+        calls = []
+        def area(self):
+            calls.append(1)
+            return self.w * self.h
+
+        for options in ({}, {'slots': True}, {'codegen': True},
+                        {'slots': True, 'codegen': True}):
+            del calls[:]
+            class B(PropMixin, **options):
+                w = Prop(2)
+                h = Prop(3)
+                a = Prop(compute=area)
+                r = Prop(compute=area, readonly=True, undead=True)
+
+            b = B()
+            assert not calls # computed on first read
+            assert b.a == 6 and b.a == 6 and b._a == 6
+            assert len(calls) == 1
+            b.w = 4
+            assert b.a == 6 # cached until invalidated
+            invalidate(b, 'a')
+            assert b.a == 12 and len(calls) == 2
+            b.a = 1 # writable
+            assert b.a == 1
+            del b.a
+            assert b.a == 12
+
+            assert b.r == 12
+            with self.assertRaises(AttributeError):
+                b.r = 1
+            with self.assertRaises(AttributeError):
+                del b.r
+            b.h = 1
+            invalidate(b) # all computed properties
+            assert b.r == 4 and b.a == 4
+            invalidate(b, 'r')
+            invalidate(b, 'r') # not computed yet, nothing to do
+            with self.assertRaises(ValueError):
+                invalidate(b, 'w')
+            assert b.r == 4
+
+    def test_Prop_single_flight(self):
+        import threading
+        import time
+        from ocd.descriptors import _single_flight
+
+        with self.assertRaises(ValueError):
+            Prop(1, single_flight=True) # nothing to build
+        Prop(default_factory=list, single_flight=True) # OK
+
+        calls = []
+        def slow(self):
+            calls.append(1)
+            time.sleep(0.05)
+            if len(calls) == 1 and self.fail:
+                raise RuntimeError('first call fails')
+            return len(calls)
+
+        for options in ({}, {'slots': True}, {'codegen': True},
+                        {'slots': True, 'codegen': True}):
+            class B(PropMixin, **options):
+                fail = Prop(False)
+                v = Prop(compute=slow, single_flight=True, readonly=True)
+                items = Prop(default_factory=list, single_flight=True)
+
+            del calls[:]
+            b = B()
+            barrier = threading.Barrier(8)
+            results = []
+            def read():
+                barrier.wait()
+                results.append((b.v, id(b.items)))
+            threads = [threading.Thread(target=read) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert len(calls) == 1, options # built once
+            assert len(set(results)) == 1 and results[0][0] == 1
+            assert not _single_flight._calls # no lock left behind
+
+            # a failure is not cached, the next read builds again
+            del calls[:]
+            b = B()
+            b.fail = True
+            with self.assertRaises(RuntimeError):
+                b.v
+            assert b.v == 2 and b.v == 2 and len(calls) == 2
+            assert not _single_flight._calls
+
+    def test_Prop_interned(self):
+        import copy
+        import pickle
+        from ocd import defaults
+        p = Prop(readonly=True, undead=True)
+        assert p is Prop(undead=True, readonly=True)
+        assert p is defaults.VarConfAllUnro().get_conf('x', 1)
+        assert Prop() is Prop() is defaults._PROP_ALL
+        assert Prop(readonly=True) is not Prop(readonly=Prop.RO_WEAK)
+        assert Prop(readonly=1) is not Prop(readonly=True)
+        assert Prop(var_name_prefix='_p_') is Prop(var_name_prefix='_p_')
+        assert Prop(5) is not Prop(5) # has a value
+        v = Prop(value=5, readonly=1)
+        assert v.value == 5 and v.is_readonly_weak and list(v)[0] == 'value'
+        assert dict(vars(v), value=Void) == vars(Prop(readonly=1))
+        with self.assertRaises(ValueError):
+            Prop(5, var_name_prefix='p')
+        assert Prop(default_factory=list) is not Prop(default_factory=list)
+        with self.assertRaises(ValueError):
+            Prop(var_name_prefix='p') # not interned
+        with self.assertRaises(ValueError):
+            Prop(var_name_prefix='p')
+
+        # copies are not written to the interned objects
+        c = copy.deepcopy(Prop(5))
+        assert c.value == 5 and Prop().value is Void
+        c = pickle.loads(pickle.dumps(p))
+        assert c is not p and c.is_readonly and c.is_undead_for_class
+
+        # and the accessors that do not depend on the value are shared
+        class A(PropMixin):
+            x = Prop(1)
+            y = Prop(2, readonly=True)
+        class B(PropMixin):
+            x = Prop(3)
+            y = Prop(4, readonly=True)
+        assert A.__dict__['x'].fset is B.__dict__['x'].fset
+        assert A.__dict__['x'].fget is B.__dict__['x'].fget
+        assert A.__dict__['y'].fset is B.__dict__['y'].fset
+        assert A.__dict__['y'].fget is not B.__dict__['y'].fget
+
+    def test_Prop_type(self):
+        import struct
+        with self.assertRaises(ValueError):
+            Prop(type=str)
+        with self.assertRaises(ValueError):
+            Prop(type=bytes) # size from the default value
+        with self.assertRaises(ValueError):
+            Prop('x', type=int)
+        with self.assertRaises(ValueError):
+            Prop(1 << 64, type=int)
+        with self.assertRaises(ValueError):
+            Prop(1, type=int, readonly=True)
+        with self.assertRaises(ValueError):
+            Prop(type=int, default_factory=int)
+        assert Prop(type=int).value == 0 and Prop(type=float).value == 0.0
+        assert Prop(type=bool).struct_format == '?'
+        assert Prop(b'abcd', type=bytes).struct_format == '4s'
+
+        for kw in ({}, {'slots': True}):
+            class A(PropMixin, init=True, **kw):
+                i = Prop(type=int)
+                f = Prop(1.5, type=float, readonly=Prop.RO_WEAK)
+                b = Prop(True, type=bool, undead=True)
+                s = Prop(b'\0\0\0', type=bytes)
+                o = Prop(None) # not typed
+            a = A()
+            assert (a.i, a.f, a.b, a.s) == (0, 1.5, True, b'\0\0\0')
+            a = A(2, 2.5, False, b'ab', 'x')
+            assert (a.i, a.f, a.b, a.s, a.o) == (2, 2.5, False, b'ab\0', 'x')
+            assert len(a._Props_buf_) == len(A._Props_buf_init_) == 20
+            assert A.Props.Defaults.i == 0 and A.Props.Ivan.f == '_f'
+            a.i = -7
+            assert a.i == -7 and a._i == -7
+            del a.i # back to the default
+            assert a.i == 0
+            with self.assertRaises(struct.error):
+                a.i = 'x'
+            with self.assertRaises(ValueError):
+                a.s = b'abcd'
+            with self.assertRaises(AttributeError):
+                a.f = 1.0 # weak readonly
+            a._f = 1.0
+            assert a.f == 1.0
+            with self.assertRaises(AttributeError):
+                del a.b
+            assert A().i == 0 # not shared
+
+            class B(A): # appended to the buffer of A
+                j = Prop(3, type=int)
+            b = B(1, j=5)
+            assert (b.i, b.j) == (1, 5) and len(B._Props_buf_init_) == 28
+            with self.assertRaises(TypeError):
+                A.k = Prop(type=int) # buffers exist already
+            with self.assertRaises(TypeError):
+                A.i = Prop(5) # the packed value would not follow
+            class H(A): # a subclass uses its own storage
+                i = Prop(5)
+            h = H()
+            h.i = 'h'
+            assert (h.i, H().i, H.Props.Conf.i.type) == ('h', 5, None)
+            assert A().i == 0 and A.Props.Conf.i.type is int
+            with self.assertRaises(TypeError):
+                A.i = Prop(type=int) # same, the buffers exist already
+
+        from ocd.defaults import VarConfAll
+        class T(PropMixin):
+            VarConf = VarConfAll
+            t = Prop(0, type=int)
+        with self.assertRaises(TypeError):
+            T.t = 5 # VarConfAll makes it an untyped property
+        assert T.Props.Defaults.t == 0 and T.Props.Conf.t.type is int
+
+        class C(PropMixin):
+            x = Prop(type=int)
+        class D(PropMixin):
+            y = Prop(type=int)
+        with self.assertRaises(TypeError):
+            class E(C, D):
+                pass
+        class F(C): # same buffer through one base
+            pass
+        class G(F, C):
+            pass
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,217 @@
+import unittest
+from array import array
+
+from ocd.prop import Prop
+from ocd.mixins import PropMixin
+from ocd.defaults import VarConfAll
+from ocd.table import PropTable, export_columns
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Trade(PropMixin):
+    VarConf = VarConfAll
+    symbol = ''
+    price = 0.0
+    qty = 0
+    tags = Prop(default_factory=list)
+    venue = Prop('X', readonly=True) # constant, not stored
+    id = Prop(0, readonly=Prop.RO_WEAK, undead=True)
+    notional = Prop(compute=lambda self: self.price * self.qty,
+                    readonly=True) # not stored
+
+
+class Test_table(unittest.TestCase):
+    def setUp(self):
+        # init
+        pass
+
+    def tearDown(self):
+        # destruct
+        pass
+
+    def test_PropTable(self):
+        t = PropTable(Trade)
+        assert t.names == ['symbol', 'price', 'qty', 'tags', 'id']
+        t.append(symbol='A', price=1.5, qty=10, id=1)
+        t.append({'symbol': 'B', 'qty': 3})
+        obj = Trade()
+        obj.symbol = 'C'
+        obj._id = 3
+        t.extend([obj])
+        assert len(t) == 3
+        assert t.column('qty') == array('q', [10, 3, 0])
+        assert t.column('price') == array('d', [1.5, 0.0, 0.0])
+        assert t.column('symbol') == ['A', 'B', 'C']
+        assert t.column('tags') == [[], [], []]
+        assert t.column('tags')[0] is not t.column('tags')[1]
+
+        with self.assertRaises(ValueError):
+            t.append(nope=1)
+        with self.assertRaises(TypeError):
+            t.append(qty='many')
+        assert len(t) == 3 and len(t.column('symbol')) == 3 # unchanged
+        with self.assertRaises(KeyError):
+            t.column('venue')
+
+        # row views
+        row = t[0]
+        assert (row.symbol, row.price, row.venue, row.id) == ('A', 1.5,
+                                                             'X', 1)
+        assert t[-1].symbol == 'C'
+        with self.assertRaises(IndexError):
+            t[3]
+        row.qty = 11
+        assert t.column('qty')[0] == 11
+        del row.qty # back to the default
+        assert row.qty == 0
+        with self.assertRaises(AttributeError):
+            row.venue = 'Y'
+        with self.assertRaises(AttributeError):
+            row.id = 2 # weak readonly
+        with self.assertRaises(AttributeError):
+            del row.id # undead
+        with self.assertRaises(AttributeError):
+            row.other = 1
+        class NoDefault(PropMixin):
+            a = Prop()
+        n = PropTable(NoDefault, [{'a': 1}])
+        with self.assertRaises(AttributeError):
+            del n[0].a # nothing to reset it to
+        assert n[0].a == 1
+        assert t[1].as_dict() == {'symbol': 'B', 'price': 0.0, 'qty': 3,
+                                  'tags': [], 'id': 0}
+        assert [r.symbol for r in t] == ['A', 'B', 'C']
+
+        # vectorized columns
+        t.set_column('qty', [5, 6, 7])
+        assert t.column('qty') == array('q', [5, 6, 7])
+        with self.assertRaises(ValueError):
+            t.set_column('qty', [1])
+        with self.assertRaises(AttributeError):
+            t.set_column('id', [1, 2, 3])
+
+        # filtering
+        f = t.filter(lambda r: r.qty > 5)
+        assert len(f) == 2 and f.column('symbol') == ['B', 'C']
+        assert f.column('qty') == array('q', [6, 7])
+        f = t.filter([True, False, False])
+        assert f[0].symbol == 'A' and len(f) == 1
+        with self.assertRaises(ValueError):
+            t.filter([True])
+
+        with self.assertRaises(ValueError):
+            PropTable(Trade, backend='nope')
+
+        # the layout follows runtime changes of the properties
+        class Grow(PropMixin):
+            a = Prop(1)
+        assert PropTable(Grow).names == ['a']
+        Grow.b = Prop(2)
+        assert PropTable(Grow, [{}]).names == ['a', 'b']
+        assert PropTable(Grow, [{}])[0].b == 2
+        del Grow.a
+        assert PropTable(Grow).names == ['b']
+
+    def test_PropTable_frozen(self):
+        class Key(PropMixin, frozen=True):
+            VarConf = VarConfAll
+            host = ''
+        t = PropTable(Key, [{'host': 'a'}])
+        with self.assertRaises(AttributeError):
+            t[0].host = 'b'
+        with self.assertRaises(AttributeError):
+            del t[0].host
+
+    def test_export_columns(self):
+        trades = []
+        for i in range(3):
+            t = Trade()
+            t.symbol, t.price, t.qty = str(i), i / 2, i
+            trades.append(t)
+        c = export_columns(Trade, trades)
+        assert list(c) == ['symbol', 'price', 'qty', 'tags', 'id']
+        assert c['qty'] == array('q', [0, 1, 2])
+        assert memoryview(c['price']).format == 'd'
+        assert c['symbol'] == ['0', '1', '2'] and c['id'] == array('q', [0] * 3)
+        c = export_columns(Trade, iter(trades), ['notional', 'venue', 'qty'])
+        assert c['notional'] == [0.0, 0.5, 2.0] and c['venue'] == ['X'] * 3
+        chunks = list(export_columns(Trade, iter(trades), ['qty'],
+                                     chunk_size=2))
+        assert chunks == [{'qty': array('q', [0, 1])},
+                          {'qty': array('q', [2])}]
+        assert export_columns(Trade, [], ['qty']) == {'qty': array('q')}
+
+        class Slot(PropMixin, slots=True):
+            n = Prop(0)
+            b = Prop(type=int)
+        s = Slot()
+        s.n, s.b = 5, 6
+        c = export_columns(Slot, [s, Slot()]) # an empty slot
+        assert c == {'n': array('q', [5, 0]), 'b': array('q', [6, 0])}
+
+        class Fixed(Trade): # overrides the properties
+            qty = Prop(7, readonly=True)
+            price = Prop(0.0, var_name_suffix='_p')
+        f = Fixed()
+        f.price = 9.5
+        c = export_columns(Trade, trades[1:] + [f], ['qty', 'price', 'symbol'])
+        assert c['qty'] == array('q', [1, 2, 7])
+        assert c['price'] == array('d', [0.5, 1.0, 9.5])
+        chunks = list(export_columns(Trade, trades[1:] + [f], ['qty'],
+                                     chunk_size=2))
+        assert chunks == [{'qty': array('q', [1, 2])},
+                          {'qty': array('q', [7])}]
+
+        with self.assertRaises(AttributeError):
+            export_columns(Trade, trades, ['nope'])
+        with self.assertRaises(ValueError):
+            export_columns(Trade, trades, backend='nope')
+        with self.assertRaises(ValueError):
+            export_columns(Trade, trades, chunk_size=0)
+        trades[0].qty = 'many'
+        with self.assertRaises(TypeError):
+            export_columns(Trade, trades, ['qty'])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_PropTable_numpy(self):
+        t = PropTable(Trade, backend='numpy')
+        for i in range(20):
+            t.append(symbol=str(i), price=i / 2, qty=i)
+        qty = t.column('qty')
+        assert isinstance(qty, numpy.ndarray) and len(qty) == 20
+        assert t[19].qty == 19
+        t.set_column('price', t.column('price') * 2)
+        assert t[3].price == 3.0
+        f = t.filter(t.column('qty') % 2 == 0)
+        assert len(f) == 10 and f.column('symbol')[1] == '2'
+        assert list(f.column('qty')[:3]) == [0, 2, 4]
+        objs = [Trade() for i in range(3)]
+        objs[1].qty = 7
+        c = export_columns(Trade, objs, ['qty', 'symbol'], backend='numpy')
+        assert isinstance(c['qty'], numpy.ndarray)
+        assert list(c['qty']) == [0, 7, 0] and c['symbol'] == [''] * 3
+        objs[2].qty = 2.5
+        with self.assertRaises(TypeError):
+            export_columns(Trade, objs, ['qty'], backend='numpy')
+        c = export_columns(Trade, objs, ['price'], backend='numpy')
+        assert c['price'].dtype == numpy.float64
+        with self.assertRaises(TypeError):
+            t.append(symbol='bad', qty='many')
+        with self.assertRaises(TypeError):
+            t.append(symbol='bad', qty=1.5) # not truncated
+        assert len(t) == 20 and len(t.column('symbol')) == 20
+        with self.assertRaises(TypeError):
+            t[0].qty = 2.5
+        with self.assertRaises(TypeError):
+            t.set_column('qty', t.column('price'))
+        assert t[0].qty == 0 and t.column('qty')[1] == 1
+        t.append(symbol='ok', qty=1)
+        assert t[20].symbol == 'ok' and t[20].qty == 1
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)